@@ -9,8 +9,16 @@ case "$MODE" in
     echo "Running SELLER..."
     python /app/spl_seller/main_seller.py
     ;;
+  "ASYNC_SELLER")
+    echo "Running ASYNC_SELLER..."
+    python /app/spl_seller/main_async_seller.py
+    ;;
+  "SUPERVISOR")
+    echo "Running SUPERVISOR..."
+    python /app/spl_seller/main_supervisor.py
+    ;;
   *)
-    echo "Error: MODE environment variable must be 'BUYER' or 'SELLER', got '$MODE'"
+    echo "Error: MODE environment variable must be 'SELLER', 'ASYNC_SELLER' or 'SUPERVISOR', got '$MODE'"
     exit 1
     ;;
 esac
\ No newline at end of file
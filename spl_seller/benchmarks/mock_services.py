@@ -0,0 +1,233 @@
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from solders.hash import Hash
+from solders.message import Message
+from solders.null_signer import NullSigner
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+from spl_seller.types.benchmark_data import FaultProfile
+
+
+class MockService:
+    """Local HTTP stand-in for a remote API with injected latency, failures and 429s"""
+
+    def __init__(self, fault: Optional[FaultProfile] = None, seed: int = 0):
+        self.fault = fault or FaultProfile()
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _inject_fault(self) -> Optional[int]:
+        """Sleep for the configured latency and return an error status to reply with, if any"""
+        with self.lock:
+            self.request_count += 1
+            delay = self.fault.latency_ms + self.random.uniform(0, self.fault.jitter_ms)
+            roll = self.random.random()
+        time.sleep(delay / 1000.0)
+        if roll < self.fault.rate_limit_rate:
+            return 429
+        if roll < self.fault.rate_limit_rate + self.fault.failure_rate:
+            return 500
+        return None
+
+    def handle_get(self, path: str, query: dict) -> Tuple[int, object]:
+        return 404, {"error": "not found"}
+
+    def handle_post(self, path: str, body: object) -> Tuple[int, object]:
+        return 404, {"error": "not found"}
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                self._respond(lambda: service.handle_get(parsed.path, query))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"null")
+                parsed = urlparse(self.path)
+                self._respond(lambda: service.handle_post(parsed.path, body))
+
+            def _respond(self, handle):
+                status = service._inject_fault()
+                if status is not None:
+                    payload = {"error": "Too Many Requests" if status == 429 else "Internal Server Error"}
+                else:
+                    status, payload = handle()
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class MockJupiter(MockService):
+    """Serves /quote and /swap like the Jupiter v6 API
+
+    outAmount is amount * sol_per_raw_token lamports, and /swap returns an unsigned
+    transaction with the requesting wallet as fee payer so Swapper can sign it.
+    """
+
+    def __init__(self, sol_per_raw_token: float, fault: Optional[FaultProfile] = None, seed: int = 0):
+        super().__init__(fault=fault, seed=seed)
+        self.sol_per_raw_token = sol_per_raw_token
+
+    def handle_get(self, path: str, query: dict) -> Tuple[int, object]:
+        if not path.endswith("/quote"):
+            return 404, {"error": "not found"}
+        amount = int(query["amount"])
+        return 200, {
+            "inputMint": query["inputMint"],
+            "outputMint": query["outputMint"],
+            "inAmount": str(amount),
+            "outAmount": str(int(amount * self.sol_per_raw_token * 1e9)),
+            "slippageBps": int(query.get("slippageBps", 0)),
+            "contextSlot": 1,
+            "timeTaken": 0.001,
+        }
+
+    def handle_post(self, path: str, body: object) -> Tuple[int, object]:
+        if not path.endswith("/swap"):
+            return 404, {"error": "not found"}
+        payer = Pubkey.from_string(body["userPublicKey"])
+        with self.lock:
+            blockhash = Hash(bytes(self.random.getrandbits(8) for _ in range(32)))
+        message = Message.new_with_blockhash([], payer, blockhash)
+        transaction = VersionedTransaction(message, [NullSigner(payer)])
+        return 200, {
+            "swapTransaction": base64.b64encode(bytes(transaction)).decode(),
+            "lastValidBlockHeight": 1000,
+            "prioritizationFeeLamports": 0,
+        }
+
+
+class MockSolanaRPC(MockService):
+    """Minimal JSON-RPC node: accepts sendTransaction and confirms each signature after confirm_delay_ms
+
+    simulateTransaction fails with a slippage error for simulate_failure_rate of calls.
+    """
+
+    def __init__(
+        self,
+        confirm_delay_ms: float = 0.0,
+        fault: Optional[FaultProfile] = None,
+        seed: int = 0,
+        simulate_failure_rate: float = 0.0,
+    ):
+        super().__init__(fault=fault, seed=seed)
+        self.confirm_delay_ms = confirm_delay_ms
+        self.simulate_failure_rate = simulate_failure_rate
+        self.sent = dict()
+        self.slot = 1
+
+    def handle_post(self, path: str, body: object) -> Tuple[int, object]:
+        if isinstance(body, list):
+            return 200, [self._dispatch(each) for each in body]
+        return 200, self._dispatch(body)
+
+    def _dispatch(self, request: dict) -> dict:
+        method = request.get("method")
+        params = request.get("params") or []
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get("id"),
+                "error": {"code": -32601, "message": "Method not found"},
+            }
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": handler(params)}
+
+    def _context(self) -> dict:
+        return {"slot": self.slot}
+
+    def rpc_sendTransaction(self, params: list):
+        transaction = VersionedTransaction.from_bytes(base64.b64decode(params[0]))
+        signature = str(transaction.signatures[0])
+        with self.lock:
+            self.sent.setdefault(signature, time.perf_counter())
+        return signature
+
+    def rpc_getSignatureStatuses(self, params: list):
+        now = time.perf_counter()
+        statuses = list()
+        for signature in params[0]:
+            sent_time = self.sent.get(signature)
+            if sent_time is None or (now - sent_time) * 1000.0 < self.confirm_delay_ms:
+                statuses.append(None)
+                continue
+            statuses.append(
+                {
+                    "slot": self.slot,
+                    "confirmations": None,
+                    "err": None,
+                    "status": {"Ok": None},
+                    "confirmationStatus": "confirmed",
+                }
+            )
+        return {"context": self._context(), "value": statuses}
+
+    def rpc_simulateTransaction(self, params: list):
+        with self.lock:
+            failed = self.random.random() < self.simulate_failure_rate
+        value = {"err": None, "logs": ["Program log: ok"], "accounts": None, "unitsConsumed": 50_000}
+        if failed:
+            value["err"] = {"InstructionError": [3, {"Custom": 6001}]}
+            value["logs"] = ["Program log: Error: SlippageToleranceExceeded"]
+        return {"context": self._context(), "value": value}
+
+    def rpc_getBalance(self, params: list):
+        return {"context": self._context(), "value": 10 * 10**9}
+
+    def rpc_getBlockHeight(self, params: list):
+        return self.slot
+
+    def rpc_getRecentPrioritizationFees(self, params: list):
+        with self.lock:
+            return [{"slot": self.slot - i, "prioritizationFee": self.random.randint(0, 200_000)} for i in range(150)]
+
+    def rpc_getLatestBlockhash(self, params: list):
+        return {
+            "context": self._context(),
+            "value": {"blockhash": str(Hash.default()), "lastValidBlockHeight": self.slot + 150},
+        }
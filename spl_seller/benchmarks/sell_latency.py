@@ -0,0 +1,287 @@
+"""Sell-path latency benchmark
+
+Drives SplSeller.sell_tokens -> Swapper.place_sell_order -> Swapper.execute_swap against a local
+mock Solana RPC and mock Jupiter API, and reports p50/p95/p99 latency from trigger to the first
+successful send and from trigger to the last confirmed chunk.
+
+Usage:
+    python -m spl_seller.benchmarks.sell_latency --iterations 50 --latency-ms 80 --jitter-ms 120 \
+        --failure-rate 0.05 --rate-limit-rate 0.05 --confirm-delay-ms 400
+"""
+
+import argparse
+import json
+import logging
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from solana.rpc.api import Client
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+from spl_seller.benchmarks.mock_services import MockJupiter, MockSolanaRPC
+from spl_seller.main_seller import SplSeller
+from spl_seller.modules.broadcaster import TransactionBroadcaster
+from spl_seller.modules.fee_estimator import PriorityFeeEstimator
+from spl_seller.modules.order_registry import OrderRegistry
+from spl_seller.modules.swap import Swapper
+from spl_seller.modules.wallet_info import Wallet
+from spl_seller.types.benchmark_data import FaultProfile, SellLatencySample
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.types.wallet_data import WalletInfo
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class SellLatencyBenchmark:
+    def __init__(
+        self,
+        rpc_fault: FaultProfile,
+        jupiter_fault: FaultProfile,
+        confirm_delay_ms: float = 400.0,
+        sol_per_raw_token: float = 1e-6,
+        retry_sleep_scale: float = 1.0,
+        seed: int = 0,
+        broadcast_nodes: int = 0,
+        simulate: bool = False,
+        simulate_failure_rate: float = 0.0,
+    ):
+        self.sol_per_raw_token = sol_per_raw_token
+        self.retry_sleep_scale = retry_sleep_scale
+        self.simulate = simulate
+        self.rpc = MockSolanaRPC(
+            confirm_delay_ms=confirm_delay_ms, fault=rpc_fault, seed=seed, simulate_failure_rate=simulate_failure_rate
+        )
+        self.jupiter = MockJupiter(sol_per_raw_token=sol_per_raw_token, fault=jupiter_fault, seed=seed + 1)
+        # Extra nodes every swap is broadcast to alongside self.rpc
+        self.broadcast_rpcs = [
+            MockSolanaRPC(confirm_delay_ms=confirm_delay_ms, fault=rpc_fault, seed=seed + 2 + i)
+            for i in range(broadcast_nodes)
+        ]
+
+        key_pair = Keypair()
+        self.wallet = WalletInfo(public_key=str(key_pair.pubkey()), key_pair=key_pair)
+        self.mint = str(Keypair().pubkey())
+
+        self.send_times = list()
+        self.confirm_times = list()
+        self.send_attempts = 0
+        self.swap_attempts = 0
+
+    def __enter__(self):
+        self.rpc.start()
+        self.jupiter.start()
+        for each in self.broadcast_rpcs:
+            each.start()
+        self.seller = self._build_seller()
+        return self
+
+    def __exit__(self, *exc):
+        self.rpc.stop()
+        self.jupiter.stop()
+        for each in self.broadcast_rpcs:
+            each.stop()
+
+    def _build_seller(self) -> SplSeller:
+        """Build a SplSeller wired to the mock services without touching settings or live APIs"""
+        swapper = Swapper(HELIUS_API_KEY="benchmark", SIMULATE_SWAPS=self.simulate)
+        swapper.RPC_ENDPOINT = self.rpc.url
+        swapper.JUPITER_API_URL = self.jupiter.url
+        swapper.client = Client(self.rpc.url, commitment=swapper.COMMITMENT)
+        swapper.FeeEstimator = PriorityFeeEstimator(RPC_ENDPOINT=self.rpc.url)
+
+        # Shadow the bound methods on the instances so every call is timed
+        swapper.client.send_transaction = self._timed(swapper.client.send_transaction, "send")
+        swapper.create_swap = self._timed(swapper.create_swap, "swap")
+        if self.broadcast_rpcs:
+            swapper.Broadcaster = TransactionBroadcaster(
+                endpoints=[self.rpc.url] + [x.url for x in self.broadcast_rpcs], commitment=swapper.COMMITMENT
+            )
+            swapper.Broadcaster.send_and_confirm = self._timed(swapper.Broadcaster.send_and_confirm, "broadcast")
+
+        seller = SplSeller.__new__(SplSeller)
+        seller.wallets = [self.wallet]
+        seller.SwapInterface = swapper
+        seller.Orders = OrderRegistry()
+        # A chunk counts as confirmed when its fill is recorded, whichever path confirmed it
+        seller._record_fill = self._timed(seller._record_fill, "confirm")
+        seller.WalletInterface = Wallet(
+            wallets=[self.wallet], HELIUS_API_KEY="benchmark", BIRDEYE_API_TOKEN="benchmark", RPC_BATCH_WINDOW_MS=0
+        )
+        return seller
+
+    def _timed(self, func: Callable, kind: str) -> Callable:
+        def wrapper(*args, **kwargs):
+            if kind in ["send", "broadcast"]:
+                self.send_attempts += 1
+            elif kind == "swap":
+                self.swap_attempts += 1
+            result = func(*args, **kwargs)
+            if kind == "send":
+                self.send_times.append(time.perf_counter())
+            elif kind == "confirm":
+                self.confirm_times.append(time.perf_counter())
+            elif kind == "broadcast":
+                # Sending and confirming are one call, the send is timed at its return
+                self.send_times.append(time.perf_counter())
+            return result
+
+        return wrapper
+
+    def _expected_chunks(self, amount: int) -> int:
+        swapper = self.seller.SwapInterface
+        output_sol = amount * self.sol_per_raw_token
+        full_chunk = int((swapper.MAX_SOL_CHUNK / output_sol) * amount)
+        return len(swapper.get_chunk_amounts(total_amount=amount, chunk_amount=full_chunk))
+
+    def sell_once(self, scenario: str, amount: int) -> SellLatencySample:
+        self.send_times = list()
+        self.confirm_times = list()
+        self.send_attempts = 0
+        self.swap_attempts = 0
+        chunks = self._expected_chunks(amount=amount)
+
+        token = HoldingData(
+            public_key=self.wallet.public_key,
+            name="Benchmark",
+            symbol="BENCH",
+            mint=self.mint,
+            address=str(Pubkey.new_unique()),
+            current_amount_raw=amount,
+            current_amount=float(amount),
+            decimals=0,
+            current_price_per_token_sol=self.sol_per_raw_token,
+        )
+
+        trigger_time = time.perf_counter()
+        self.seller.sell_tokens(token_to_sell=token, amount=amount)
+
+        sample = SellLatencySample(
+            scenario=scenario,
+            chunks=chunks,
+            success=len(self.confirm_times) == chunks,
+            swap_attempts=self.swap_attempts,
+            send_attempts=self.send_attempts,
+        )
+        if self.send_times:
+            sample.trigger_to_send_ms = (self.send_times[0] - trigger_time) * 1000.0
+        if sample.success:
+            sample.trigger_to_confirm_ms = (self.confirm_times[-1] - trigger_time) * 1000.0
+        return sample
+
+    def run(self, iterations: int, single_sol: float, multi_sol: float) -> List[SellLatencySample]:
+        self.seller.SwapInterface.RETRY_BACKOFF_SECONDS *= self.retry_sleep_scale
+        scenarios = {
+            "single-chunk": int(single_sol / self.sol_per_raw_token),
+            "multi-chunk": int(multi_sol / self.sol_per_raw_token),
+        }
+        samples = list()
+        for scenario, amount in scenarios.items():
+            for i in range(iterations):
+                samples.append(self.sell_once(scenario=scenario, amount=amount))
+        return samples
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(np.asarray(values, dtype=float), [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+def summarize(samples: List[SellLatencySample]) -> Dict[str, dict]:
+    summary = dict()
+    for scenario in sorted(set(x.scenario for x in samples)):
+        rows = [x for x in samples if x.scenario == scenario]
+        summary[scenario] = {
+            "count": len(rows),
+            "chunks": rows[0].chunks,
+            "success_rate": sum(1 for x in rows if x.success) / len(rows),
+            "mean_swap_attempts": float(np.mean([x.swap_attempts for x in rows])),
+            "mean_send_attempts": float(np.mean([x.send_attempts for x in rows])),
+            "trigger_to_send_ms": percentiles(
+                [x.trigger_to_send_ms for x in rows if x.trigger_to_send_ms is not None]
+            ),
+            "trigger_to_confirm_ms": percentiles(
+                [x.trigger_to_confirm_ms for x in rows if x.trigger_to_confirm_ms is not None]
+            ),
+        }
+    return summary
+
+
+def print_summary(summary: Dict[str, dict]):
+    def fmt(value):
+        return "-" if value is None else f"{value:.0f}"
+
+    print(
+        f"{'scenario':<14}{'chunks':>7}{'ok':>7}{'swaps':>7}{'sends':>7}"
+        f"{'send p50':>10}{'p95':>8}{'p99':>8}{'confirm p50':>13}{'p95':>8}{'p99':>8}"
+    )
+    for scenario, row in summary.items():
+        send = row["trigger_to_send_ms"]
+        confirm = row["trigger_to_confirm_ms"]
+        print(
+            f"{scenario:<14}{row['chunks']:>7}{row['success_rate']*100:>6.0f}%"
+            f"{row['mean_swap_attempts']:>7.2f}{row['mean_send_attempts']:>7.2f}"
+            f"{fmt(send['p50']):>10}{fmt(send['p95']):>8}{fmt(send['p99']):>8}"
+            f"{fmt(confirm['p50']):>13}{fmt(confirm['p95']):>8}{fmt(confirm['p99']):>8}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark sell latency against local mock RPC and Jupiter")
+    parser.add_argument("--iterations", type=int, default=20, help="Sells per scenario")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Base latency for every mock response")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="Uniform jitter added to the base latency")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of responses that return 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of responses that return 429")
+    parser.add_argument("--confirm-delay-ms", type=float, default=400.0, help="Time until a sent tx is confirmed")
+    parser.add_argument("--single-sol", type=float, default=2.0, help="SOL value of the single-chunk sell")
+    parser.add_argument("--multi-sol", type=float, default=25.0, help="SOL value of the multi-chunk sell")
+    parser.add_argument("--retry-sleep-scale", type=float, default=1.0, help="Scale sell retry backoff sleeps")
+    parser.add_argument(
+        "--broadcast-nodes", type=int, default=0, help="Extra mock RPC nodes to broadcast every swap to"
+    )
+    parser.add_argument("--simulate", action="store_true", help="Simulate every swap before sending it")
+    parser.add_argument(
+        "--simulate-failure-rate", type=float, default=0.0, help="Fraction of simulations that report a failure"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Write summary and samples to this file")
+    parser.add_argument("--verbose", action="store_true", help="Keep spl-seller INFO logging")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not args.verbose:
+        logger.setLevel(logging.CRITICAL)
+
+    fault = FaultProfile(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    print(f"Mock fault profile: {fault}")
+
+    with SellLatencyBenchmark(
+        rpc_fault=fault,
+        jupiter_fault=fault,
+        confirm_delay_ms=args.confirm_delay_ms,
+        retry_sleep_scale=args.retry_sleep_scale,
+        seed=args.seed,
+        broadcast_nodes=args.broadcast_nodes,
+        simulate=args.simulate,
+        simulate_failure_rate=args.simulate_failure_rate,
+    ) as bench:
+        samples = bench.run(iterations=args.iterations, single_sol=args.single_sol, multi_sol=args.multi_sol)
+
+    summary = summarize(samples)
+    print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"summary": summary, "samples": [asdict(x) for x in samples]}, f, indent=2)
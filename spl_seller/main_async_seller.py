@@ -0,0 +1,171 @@
+import asyncio
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from spl_seller.main_seller import SplSeller, run_server
+from spl_seller.modules.fee_estimator import URGENCY_DURATION, URGENCY_PROFIT, URGENCY_STOP
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.settings import settings_key_values
+from spl_seller.utils.transport_archive import install_transport
+
+logger = get_logger()
+
+
+class AsyncSeller:
+    """Runs a SplSeller as independent asyncio tasks instead of one run() loop
+
+    - accounts: update_holdings without prices, every ACCOUNT_REFRESH_SECONDS
+    - prices: update_prices every PRICE_REFRESH_SECONDS, queueing triggers as each quote batch returns
+    - triggers: get_triggers on every price update, or every TRIGGER_INTERVAL_SECONDS
+    - orders: sells from a priority queue, stop-losses first, limited to SELL_WORKERS in total and
+      SELLS_PER_WALLET per wallet. The most urgent order whose wallet has a free slot goes next, so
+      a busy wallet never holds a worker slot while another wallet's order waits
+
+    Blocking module calls run in worker threads, so a slow history fetch in the accounts task never
+    holds up trigger evaluation or a sell. SplSeller.run remains the synchronous mode.
+    """
+
+    def __init__(self, seller: SplSeller):
+        self.seller = seller
+        self.ACCOUNT_REFRESH_SECONDS = settings_key_values["ACCOUNT_REFRESH_SECONDS"]
+        self.PRICE_REFRESH_SECONDS = settings_key_values["PRICE_REFRESH_SECONDS"]
+        self.TRIGGER_INTERVAL_SECONDS = settings_key_values["TRIGGER_INTERVAL_SECONDS"]
+        self.SELL_WORKERS = settings_key_values["SELL_WORKERS"]
+        self.SELLS_PER_WALLET = settings_key_values["SELLS_PER_WALLET"]
+        self.URGENCY_RANK = {URGENCY_STOP: 0, URGENCY_DURATION: 1, URGENCY_PROFIT: 2}
+
+        self.price_events: Optional[asyncio.Queue] = None
+        # (urgency rank, sequence, trigger) heap, and an event set whenever an order or a slot is added
+        self.orders: List[Tuple[int, int, Tuple[HoldingData, int, str]]] = list()
+        self.orders_changed: Optional[asyncio.Event] = None
+        self.sell_slots: Optional[asyncio.Semaphore] = None
+        # public_key -> sells running
+        self.wallet_sells: Dict[str, int] = defaultdict(int)
+        # Token accounts queued or selling, so a trigger that fires again is not queued twice
+        self.queued: Set[str] = set()
+        self.sequence = itertools.count()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sell_tasks: Set[asyncio.Task] = set()
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        # One thread per concurrent sell plus the two refresh tasks
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=self.SELL_WORKERS + 2))
+        self.price_events = asyncio.Queue(maxsize=1)
+        self.orders_changed = asyncio.Event()
+        self.sell_slots = asyncio.Semaphore(self.SELL_WORKERS)
+
+        # Load holdings once so the price and trigger tasks start with something to work on
+        await asyncio.to_thread(self.refresh_accounts)
+        await asyncio.gather(
+            self._every(self.ACCOUNT_REFRESH_SECONDS, self.refresh_accounts),
+            self._every(self.PRICE_REFRESH_SECONDS, self.refresh_prices),
+            self.evaluate_triggers(),
+            self.execute_orders(),
+        )
+
+    async def _every(self, seconds: float, func):
+        while True:
+            await asyncio.sleep(seconds)
+            try:
+                await asyncio.to_thread(func)
+            except Exception as e:
+                logger.error("Error in {f}: {e}".format(f=func.__name__, e=e))
+
+    def refresh_accounts(self):
+        self.seller.WalletInterface.update_holdings(update_prices=False)
+        self.seller.WalletInterface._print_holdings()
+
+    def refresh_prices(self):
+        # Each quote batch queues its triggers right away instead of waiting for the whole update
+        self.seller.WalletInterface.update_prices(
+            on_quoted=lambda tokens: self.loop.call_soon_threadsafe(self._queue_triggers, tokens)
+        )
+        self.loop.call_soon_threadsafe(self._notify_prices)
+
+    def _notify_prices(self):
+        try:
+            self.price_events.put_nowait(True)
+        except asyncio.QueueFull:
+            pass
+
+    async def evaluate_triggers(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.price_events.get(), timeout=self.TRIGGER_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+            self._queue_triggers(holdings=list(self.seller.WalletInterface.holdings))
+
+    def _queue_triggers(self, holdings: List[HoldingData]):
+        self.seller.Orders.settle(holdings=list(self.seller.WalletInterface.holdings))
+        try:
+            triggers = self.seller.get_triggers(holdings=holdings)
+        except Exception as e:
+            logger.error("Error evaluating triggers: {e}".format(e=e))
+            return
+        for token, amount, reason in triggers:
+            if token.address in self.queued:
+                continue
+            self.queued.add(token.address)
+            heapq.heappush(self.orders, (self.URGENCY_RANK[reason], next(self.sequence), (token, amount, reason)))
+        self.orders_changed.set()
+
+    def _next_order(self) -> Optional[Tuple[HoldingData, int, str]]:
+        """Pop the most urgent order whose wallet is below SELLS_PER_WALLET"""
+        for entry in sorted(self.orders):
+            if self.wallet_sells[entry[2][0].public_key] < self.SELLS_PER_WALLET:
+                self.orders.remove(entry)
+                heapq.heapify(self.orders)
+                return entry[2]
+        return None
+
+    async def execute_orders(self):
+        while True:
+            # Take a slot first so the most urgent order runnable when it frees up goes next
+            await self.sell_slots.acquire()
+            trigger = self._next_order()
+            while trigger is None:
+                self.orders_changed.clear()
+                await self.orders_changed.wait()
+                trigger = self._next_order()
+            self.wallet_sells[trigger[0].public_key] += 1
+            task = asyncio.create_task(self._sell(trigger=trigger))
+            self.sell_tasks.add(task)
+            task.add_done_callback(self.sell_tasks.discard)
+
+    async def _sell(self, trigger: Tuple[HoldingData, int, str]):
+        token, amount, reason = trigger
+        try:
+            await asyncio.to_thread(self.seller.sell_tokens, token_to_sell=token, amount=amount, reason=reason)
+        except Exception as e:
+            logger.error("Error Selling {e}".format(e=e))
+        finally:
+            self.queued.discard(token.address)
+            self.wallet_sells[token.public_key] -= 1
+            self.sell_slots.release()
+            self.orders_changed.set()
+
+
+if __name__ == "__main__":
+    # Start HTTP server in a separate thread
+    server_thread = threading.Thread(target=run_server, daemon=True)
+    server_thread.start()
+
+    install_transport(
+        record_path=settings_key_values["TRANSPORT_RECORD_PATH"],
+        replay_path=settings_key_values["TRANSPORT_REPLAY_PATH"],
+        latency_scale=settings_key_values["TRANSPORT_REPLAY_LATENCY_SCALE"],
+        secret_endpoints=settings_key_values["RPC_ENDPOINTS"] + settings_key_values["BROADCAST_ENDPOINTS"],
+    )
+
+    try:
+        asyncio.run(AsyncSeller(seller=SplSeller()).run())
+    except KeyboardInterrupt:
+        logger.info("\nStopped by user")
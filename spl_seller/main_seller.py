@@ -3,23 +3,32 @@ import os
 import socketserver
 import threading
 import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, List, Optional, Set, Tuple
 
 from solders.keypair import Keypair
 
+from spl_seller.modules.fee_estimator import URGENCY_DURATION, URGENCY_PROFIT, URGENCY_STOP
+from spl_seller.modules.order_registry import OrderRegistry
+from spl_seller.modules.price_cache import SharedPriceCache
 from spl_seller.modules.swap import Swapper
 from spl_seller.modules.wallet_info import Wallet
 from spl_seller.types.holdings_data import HoldingData
-from spl_seller.utils.log import get_logger
+from spl_seller.types.order_data import SellOrder
+from spl_seller.types.wallet_data import WalletInfo
+from spl_seller.utils.log import LOG_HOLDING, get_logger
 from spl_seller.utils.settings import settings_key_values
+from spl_seller.utils.transport_archive import install_transport
 
 logger = get_logger()  # Get the logger instance
 
 
 class SplSeller:
-    def __init__(self):
+    def __init__(self, wallets: Optional[List[WalletInfo]] = None, price_cache: Optional[SharedPriceCache] = None):
         try:
             self.BIRDEYE_API_TOKEN = settings_key_values["BIRDEYE_API_TOKEN"]
-            self.wallets = settings_key_values["wallets"]
+            self.wallets = wallets if wallets is not None else settings_key_values["wallets"]
             self.HELIUS_API_KEY = settings_key_values["HELIUS_API_KEY"]
 
         except KeyError:
@@ -29,45 +38,165 @@ class SplSeller:
             wallets=self.wallets,
             HELIUS_API_KEY=self.HELIUS_API_KEY,
             BIRDEYE_API_TOKEN=self.BIRDEYE_API_TOKEN,
+            price_cache=price_cache,
+            LEDGER_DIR=settings_key_values["LEDGER_DIR"],
+            TRANSACTION_BACKEND=settings_key_values["TRANSACTION_BACKEND"],
+            RPC_BATCH_WINDOW_MS=settings_key_values["RPC_BATCH_WINDOW_MS"],
+            HOLDINGS_BACKEND=settings_key_values["HOLDINGS_BACKEND"],
+            METADATA_CACHE_DIR=settings_key_values["METADATA_CACHE_DIR"],
+            FILL_JOURNAL_PATH=settings_key_values["FILL_JOURNAL_PATH"],
+            RPC_ENDPOINTS=settings_key_values["RPC_ENDPOINTS"],
         )
 
-        self.SwapInterface = Swapper(HELIUS_API_KEY=self.HELIUS_API_KEY)
+        self.SwapInterface = Swapper(
+            HELIUS_API_KEY=self.HELIUS_API_KEY,
+            RPC_BATCH_WINDOW_MS=settings_key_values["RPC_BATCH_WINDOW_MS"],
+            QUOTE_CACHE_SECONDS=settings_key_values["QUOTE_CACHE_SECONDS"],
+            BROADCAST_ENDPOINTS=settings_key_values["BROADCAST_ENDPOINTS"],
+            RPC_ENDPOINTS=settings_key_values["RPC_ENDPOINTS"],
+            SIMULATE_SWAPS=settings_key_values["SIMULATE_SWAPS"],
+        )
+        self.Orders = OrderRegistry()
+        # Sells run in parallel across tokens, with at most SELLS_PER_WALLET at a time per wallet
+        self.SELLS_PER_WALLET = settings_key_values["SELLS_PER_WALLET"]
+        # Started by the first submit_sells, AsyncSeller runs sells on its own executor
+        self.SellExecutor: Optional[ThreadPoolExecutor] = None
+        # public_key -> queued sells and running lanes
+        self.sell_queues: Dict[str, Deque[Tuple[HoldingData, int, str]]] = defaultdict(deque)
+        self.sell_lanes: Dict[str, int] = defaultdict(int)
+        self.sell_lock = threading.Lock()
         self.prices_list = list()
-        for each in self.wallets:
-            balance = self.SwapInterface.get_balance_with_retry(pubkey=each.key_pair.pubkey()) / 1e9
-            logger.info(f"Wallet {each.public_key} balance: {balance} SOL")
+        # Request every balance at once so they go out as a single RPC batch
+        with ThreadPoolExecutor(max_workers=max(1, len(self.wallets))) as executor:
+            balances = executor.map(
+                lambda x: self.SwapInterface.get_balance_with_retry(pubkey=x.key_pair.pubkey()), self.wallets
+            )
+            for each, balance in zip(self.wallets, balances):
+                logger.info(f"Wallet {each.public_key} balance: {balance / 1e9} SOL")
 
     def run(self):
         logger.info("----------------------------Starting Run----------------------------")
-        self.WalletInterface.update_holdings()
+        # Sells start as soon as each quote batch is priced, before the portfolio is printed
+        futures = list()
+        dispatched = set()
+        self.WalletInterface.update_holdings(
+            on_quoted=lambda tokens: futures.extend(self._dispatch_triggers(holdings=tokens, dispatched=dispatched))
+        )
         self.WalletInterface._print_holdings()
-        holdings = self.WalletInterface.holdings
 
+        # Holdings that were not quoted this run can still trigger on their previous price
+        futures.extend(self._dispatch_triggers(holdings=self.WalletInterface.holdings, dispatched=dispatched))
+        wait(futures)
+        logger.info("----------------------------Run End----------------------------")
+
+    def _dispatch_triggers(self, holdings: List[HoldingData], dispatched: Set[str]) -> List[Future]:
+        """Submit sells for triggers in holdings whose account has not been dispatched this run"""
+        self.Orders.settle(holdings=self.WalletInterface.holdings)
+        holdings = [x for x in holdings if x.address not in dispatched]
+        triggers = self.get_triggers(holdings=holdings)
+        dispatched.update(x[0].address for x in triggers)
+        return self.submit_sells(triggers=triggers)
+
+    def get_triggers(self, holdings: List[HoldingData]) -> List[Tuple[HoldingData, int, str]]:
+        """(token, amount, urgency) for every holding whose price hit its stop, duration or profit trigger"""
+        triggers = list()
         for token in holdings:
+            if token.current_price_per_token_usd is None or token.stop_price_usd is None:
+                continue
             if token.current_price_per_token_usd <= token.stop_price_usd:
                 logger.info("***Below stop price, sell all***")
-                self.sell_tokens(token_to_sell=token, amount=token.current_amount_raw)
+                triggers.append((token, token.current_amount_raw, URGENCY_STOP))
             elif token.buy_duration_hours >= 240 and abs(token.current_amount - token.buy_amount) < 0.01:
                 logger.info("***Duration Elapsed, Sell all***")
-                self.sell_tokens(token_to_sell=token, amount=token.current_amount_raw)
+                triggers.append((token, token.current_amount_raw, URGENCY_DURATION))
             elif token.current_price_per_token_usd >= token.profit_price_per_token:
                 logger.info("***Profit Price reached***")
-                self.sell_tokens(token_to_sell=token, amount=token.profit_sell_amount)
-        logger.info("----------------------------Run End----------------------------")
+                triggers.append((token, token.profit_sell_amount, URGENCY_PROFIT))
+        return triggers
+
+    def execute_sells(self, triggers: List[Tuple[HoldingData, int, str]]):
+        """Run triggered sells on SellExecutor and wait for all of them"""
+        wait(self.submit_sells(triggers=triggers))
+
+    def submit_sells(self, triggers: List[Tuple[HoldingData, int, str]]) -> List[Future]:
+        """Queue triggered sells on SellExecutor, returning the futures of any lanes started
 
-    def sell_tokens(self, token_to_sell: HoldingData, amount: int):
-        """Sell token
+        Each wallet's sells are queued most urgent first (stop, duration, profit) and drained by up to
+        SELLS_PER_WALLET lanes, shared across calls. Lanes are submitted round-robin across wallets so
+        every wallet's most urgent sell starts before any wallet's second.
+        """
+        urgency_order = [URGENCY_STOP, URGENCY_DURATION, URGENCY_PROFIT]
+        with self.sell_lock:
+            if self.SellExecutor is None:
+                self.SellExecutor = ThreadPoolExecutor(
+                    max_workers=settings_key_values["SELL_WORKERS"], thread_name_prefix="sell"
+                )
+            public_keys = list(dict.fromkeys(x[0].public_key for x in triggers))
+            for public_key in public_keys:
+                queued = list(self.sell_queues[public_key]) + [x for x in triggers if x[0].public_key == public_key]
+                self.sell_queues[public_key] = deque(sorted(queued, key=lambda x: urgency_order.index(x[2])))
+
+            lanes = list()
+            for i in range(self.SELLS_PER_WALLET):
+                for public_key in public_keys:
+                    if i < len(self.sell_queues[public_key]) and self.sell_lanes[public_key] < self.SELLS_PER_WALLET:
+                        self.sell_lanes[public_key] += 1
+                        lanes.append(public_key)
+        return [self.SellExecutor.submit(self._sell_lane, public_key) for public_key in lanes]
+
+    def _sell_lane(self, public_key: str):
+        while True:
+            with self.sell_lock:
+                if not self.sell_queues[public_key]:
+                    self.sell_lanes[public_key] -= 1
+                    return
+                token, amount, reason = self.sell_queues[public_key].popleft()
+            try:
+                self.sell_tokens(token_to_sell=token, amount=amount, reason=reason)
+            except Exception as e:
+                logger.error("Error Selling {e}".format(e=e))
+
+    def sell_tokens(self, token_to_sell: HoldingData, amount: int, reason: Optional[str] = None):
+        """Sell token unless it already has an unsettled order
 
         Args:
             tokens_to_buy (List[]): _description_
         """
+        order = self.Orders.begin(token=token_to_sell, amount=amount, reason=reason)
+        if order is None:
+            return
+
         logger.info("Selling token {s}: {t}".format(s=token_to_sell.symbol, t=token_to_sell.name))
-        logger.info(token_to_sell)
+        logger.info(token_to_sell, extra={"category": LOG_HOLDING})
         key_pair = self._get_key_pair(public_key=token_to_sell.public_key)
+        self.Orders.mark_sent(order=order)
         try:
-            self.SwapInterface.place_sell_order(INPUT_MINT=token_to_sell.mint, AMOUNT=amount, KEY_PAIR=key_pair)
+            success = self.SwapInterface.place_sell_order(
+                INPUT_MINT=token_to_sell.mint,
+                AMOUNT=amount,
+                KEY_PAIR=key_pair,
+                urgency=reason or URGENCY_PROFIT,
+                price_per_token_sol=token_to_sell.current_price_per_token_sol,
+                decimals=token_to_sell.decimals,
+                on_unsettled=lambda signature: self.Orders.record_unsettled(order=order, signature=signature),
+                on_fill=lambda signature, sold, lamports: self._record_fill(
+                    order=order, token=token_to_sell, signature=signature, amount=sold, lamports=lamports
+                ),
+            )
         except Exception as e:
             logger.error("Error Selling {e}".format(e=e))
+            success = False
+
+        if success:
+            self.Orders.mark_confirmed(order=order)
+        else:
+            self.Orders.mark_failed(order=order, error="place_sell_order failed")
+
+    def _record_fill(self, order: SellOrder, token: HoldingData, signature: str, amount: int, lamports: int):
+        self.Orders.record_fill(order=order, signature=signature, amount=amount)
+        self.WalletInterface.record_fill(
+            token=token, signature=signature, amount_raw=amount, lamports=lamports, reason=order.reason
+        )
 
     def _get_key_pair(self, public_key: str) -> Keypair:
         """_summary_
@@ -109,6 +238,13 @@ if __name__ == "__main__":
     server_thread = threading.Thread(target=run_server, daemon=True)
     server_thread.start()
 
+    install_transport(
+        record_path=settings_key_values["TRANSPORT_RECORD_PATH"],
+        replay_path=settings_key_values["TRANSPORT_REPLAY_PATH"],
+        latency_scale=settings_key_values["TRANSPORT_REPLAY_LATENCY_SCALE"],
+        secret_endpoints=settings_key_values["RPC_ENDPOINTS"] + settings_key_values["BROADCAST_ENDPOINTS"],
+    )
+
     Seller = SplSeller()
     while True:
         try:
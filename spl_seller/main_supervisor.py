@@ -0,0 +1,160 @@
+import http.server
+import json
+import multiprocessing
+import os
+import socketserver
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from spl_seller.main_seller import SplSeller
+from spl_seller.modules.price_cache import SharedPriceCache
+from spl_seller.types.worker_data import WorkerHealth
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.settings import settings_key_values
+
+logger = get_logger()
+
+
+def run_worker(worker_id: int, public_keys: List[str], price_cache: SharedPriceCache, health: dict):
+    """Seller loop for one shard of wallets, reporting a heartbeat after every run"""
+    wallets = [x for x in settings_key_values["wallets"] if x.public_key in public_keys]
+    report = health.get(worker_id) or WorkerHealth(worker_id=worker_id)
+    report.pid = os.getpid()
+    report.wallets = public_keys
+    report.started_time = datetime.now(timezone.utc)
+    report.heartbeat_time = report.started_time
+    health[worker_id] = report
+
+    Seller = SplSeller(wallets=wallets, price_cache=price_cache)
+    while True:
+        start = time.time()
+        try:
+            Seller.run()
+        except Exception as e:
+            report.last_error = str(e)
+            health[worker_id] = report
+            raise
+        report.runs += 1
+        report.last_run_seconds = time.time() - start
+        report.heartbeat_time = datetime.now(timezone.utc)
+        report.holdings = len(Seller.WalletInterface.holdings)
+        health[worker_id] = report
+        time.sleep(Seller.get_sleep_time())
+
+
+class Supervisor:
+    def __init__(self):
+        self.wallets = settings_key_values["wallets"]
+        self.WALLETS_PER_WORKER = max(1, settings_key_values["WALLETS_PER_WORKER"])
+        self.WORKER_HANG_SECONDS = settings_key_values["WORKER_HANG_SECONDS"]
+        self.RESTART_DELAY_SECONDS = 5
+
+        self.context = multiprocessing.get_context("spawn")
+        self.manager = self.context.Manager()
+        self.price_cache = SharedPriceCache(
+            manager=self.manager, max_age_seconds=settings_key_values["PRICE_CACHE_SECONDS"]
+        )
+        self.health = self.manager.dict()
+        self.shards = self.get_shards()
+        self.workers: Dict[int, multiprocessing.Process] = dict()
+        self.last_start_time: Dict[int, float] = dict()
+
+    def get_shards(self) -> List[List[str]]:
+        """Split wallet public keys into groups of WALLETS_PER_WORKER"""
+        public_keys = [x.public_key for x in self.wallets]
+        return [
+            public_keys[i : i + self.WALLETS_PER_WORKER] for i in range(0, len(public_keys), self.WALLETS_PER_WORKER)
+        ]
+
+    def start_worker(self, worker_id: int):
+        process = self.context.Process(
+            target=run_worker,
+            args=(worker_id, self.shards[worker_id], self.price_cache, self.health),
+            name=f"spl-seller-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self.workers[worker_id] = process
+        self.last_start_time[worker_id] = time.time()
+        logger.info(f"Started worker {worker_id} pid {process.pid} for {len(self.shards[worker_id])} wallets")
+
+    def restart_worker(self, worker_id: int, reason: str):
+        logger.error(f"Restarting worker {worker_id}: {reason}")
+        process = self.workers[worker_id]
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout=10)
+
+        report = self.health.get(worker_id) or WorkerHealth(worker_id=worker_id)
+        report.restarts += 1
+        report.last_error = reason
+        self.health[worker_id] = report
+
+        # Avoid a hot restart loop for a worker that dies on startup
+        wait = self.RESTART_DELAY_SECONDS - (time.time() - self.last_start_time[worker_id])
+        if wait > 0:
+            time.sleep(wait)
+        self.start_worker(worker_id=worker_id)
+
+    def check_workers(self):
+        now = datetime.now(timezone.utc)
+        for worker_id, process in list(self.workers.items()):
+            if not process.is_alive():
+                self.restart_worker(worker_id=worker_id, reason=f"exited with code {process.exitcode}")
+                continue
+            report = self.health.get(worker_id)
+            if report is None or report.heartbeat_time is None:
+                continue
+            silent_seconds = (now - report.heartbeat_time).total_seconds()
+            if silent_seconds > self.WORKER_HANG_SECONDS:
+                self.restart_worker(worker_id=worker_id, reason=f"no heartbeat for {silent_seconds:.0f}s")
+
+    def get_health(self) -> List[WorkerHealth]:
+        return [self.health.get(worker_id) or WorkerHealth(worker_id=worker_id) for worker_id in self.workers]
+
+    def run(self):
+        logger.info(f"Supervising {len(self.wallets)} wallets across {len(self.shards)} workers")
+        for worker_id in range(len(self.shards)):
+            self.start_worker(worker_id=worker_id)
+
+        while True:
+            self.check_workers()
+            time.sleep(5)
+
+
+def run_server(supervisor: Supervisor):
+    port = int(os.getenv("PORT", 8080))
+
+    class HealthHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            workers = supervisor.get_health()
+            alive = all(x.is_alive() for x in supervisor.workers.values())
+            body = json.dumps([asdict(x) for x in workers], default=str).encode()
+            self.send_response(200 if alive else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with socketserver.TCPServer(("", port), HealthHandler) as httpd:
+        logger.info(f"Serving worker health on port {port}")
+        httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    S = Supervisor()
+
+    # Start HTTP server in a separate thread
+    server_thread = threading.Thread(target=run_server, args=(S,), daemon=True)
+    server_thread.start()
+
+    try:
+        S.run()
+    except KeyboardInterrupt:
+        logger.info("\nStopped by user")
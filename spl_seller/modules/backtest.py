@@ -0,0 +1,280 @@
+import copy
+import itertools
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from spl_seller.types.backtest_data import BacktestEntry
+from spl_seller.types.exit_strategy import ExitStrategy
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+STRATEGY_FIELDS = [
+    "amount_remaining_percent_gt",
+    "amount_remaining_percent_lte",
+    "stop_price_per_token_percent_change",
+    "profit_price_per_token_percent_change",
+    "profit_sell_amount_percent",
+]
+
+
+def load_candles(path: str) -> Dict[str, List[dict]]:
+    """Load stored candles: {mint: [Birdeye OHLCV items]}"""
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_candles(path: str, candles: Dict[str, List[dict]]):
+    with open(path, "w") as f:
+        json.dump(candles, f)
+
+
+def load_entries(path: str) -> List[BacktestEntry]:
+    """Load entry points: [{"mint", "entry_time" (unix seconds), "entry_price", "sol_spent"}]"""
+    with open(path) as f:
+        rows = json.load(f)
+    return [
+        BacktestEntry(
+            mint=x["mint"],
+            entry_time=datetime.fromtimestamp(x["entry_time"], tz=timezone.utc),
+            entry_price=x.get("entry_price"),
+            sol_spent=x.get("sol_spent", 1.0),
+        )
+        for x in rows
+    ]
+
+
+def build_strategy_grid(
+    base: List[ExitStrategy], grid: Dict[Tuple[int, str], List[float]]
+) -> List[List[ExitStrategy]]:
+    """Expand a base tier list into every combination of the grid values
+
+    Args:
+        base (List[ExitStrategy]): tiers to start from, e.g. get_exit_strategy(index=1)
+        grid (Dict[Tuple[int, str], List[float]]): (tier index, ExitStrategy field) -> values to try
+
+    Returns:
+        List[List[ExitStrategy]]: one tier list per combination
+    """
+    keys = list(grid.keys())
+    strategy_sets = list()
+    for values in itertools.product(*[grid[k] for k in keys]):
+        strategy_set = copy.deepcopy(base)
+        for (tier, field_name), value in zip(keys, values):
+            setattr(strategy_set[tier], field_name, value)
+        strategy_sets.append(strategy_set)
+    return strategy_sets
+
+
+class Backtester:
+    """Replays candle series through ExitStrategy tiers, vectorized across strategy sets and tokens
+
+    Mirrors the live exit rules: the tier is picked from the fraction of the original buy still held
+    (Wallet._get_exit_strategy), stop and profit prices are relative to the entry price
+    (Wallet.populate_holding_token), and each candle is checked in SplSeller.run order:
+    stop price, max hold duration with nothing sold, then profit price.
+    """
+
+    def __init__(
+        self,
+        candles: Dict[str, List[dict]],
+        entries: List[BacktestEntry],
+        max_hold_hours: float = 240,
+        use_intrabar_extremes: bool = False,
+    ):
+        self.entries = entries
+        self.max_hold_hours = max_hold_hours
+        self.use_intrabar_extremes = use_intrabar_extremes
+        self._build_price_matrix(candles=candles)
+
+    def _build_price_matrix(self, candles: Dict[str, List[dict]]):
+        """Align every entry's candles from its entry time into [token, step] arrays padded with NaN"""
+        series = list()
+        for entry in self.entries:
+            entry_ts = entry.entry_time.timestamp()
+            items = sorted(
+                [x for x in candles.get(entry.mint, []) if x["unixTime"] >= entry_ts], key=lambda x: x["unixTime"]
+            )
+            if not items:
+                logger.info("No candles after entry for {m}".format(m=entry.mint))
+            series.append((entry_ts, items))
+
+        steps = max([len(items) for _, items in series], default=0)
+        shape = (len(series), steps)
+        self.close = np.full(shape, np.nan)
+        self.low = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.hours = np.full(shape, np.nan)
+        for i, (entry_ts, items) in enumerate(series):
+            n = len(items)
+            if n == 0:
+                continue
+            self.close[i, :n] = [x["c"] for x in items]
+            self.low[i, :n] = [x["l"] for x in items]
+            self.high[i, :n] = [x["h"] for x in items]
+            self.hours[i, :n] = [(x["unixTime"] - entry_ts) / 3600.0 for x in items]
+
+        entry_prices = [x.entry_price for x in self.entries]
+        first_close = self.close[:, 0] if steps else np.full(len(series), np.nan)
+        self.entry_price = np.array([p if p else c for p, c in zip(entry_prices, first_close)], dtype=float)
+        self.sol_spent = np.array([x.sol_spent or 0.0 for x in self.entries], dtype=float)
+
+    @staticmethod
+    def _strategy_arrays(strategy_sets: List[List[ExitStrategy]]) -> Dict[str, np.ndarray]:
+        """[config, tier] arrays per ExitStrategy field, padded with NaN so padding never matches a tier"""
+        tiers = max([len(x) for x in strategy_sets], default=0)
+        arrays = {name: np.full((len(strategy_sets), tiers), np.nan) for name in STRATEGY_FIELDS}
+        for c, strategy_set in enumerate(strategy_sets):
+            for k, strat in enumerate(strategy_set):
+                for name in STRATEGY_FIELDS:
+                    arrays[name][c, k] = getattr(strat, name)
+        return arrays
+
+    @staticmethod
+    def _lookup_tiers(
+        arrays: Dict[str, np.ndarray], remaining: np.ndarray, config_index: np.ndarray, entry_price: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stop price, profit price and profit sell percent of the tier each position is in (NaN if none)
+
+        Tier match is amount_remaining_percent_lte >= remaining > amount_remaining_percent_gt, first wins.
+        """
+        stop_change = np.full(remaining.shape, np.nan)
+        profit_change = np.full(remaining.shape, np.nan)
+        sell_percent = np.full(remaining.shape, np.nan)
+        for k in range(arrays["stop_price_per_token_percent_change"].shape[1]):
+            in_tier = (arrays["amount_remaining_percent_lte"][config_index, k] >= remaining) & (
+                remaining > arrays["amount_remaining_percent_gt"][config_index, k]
+            )
+            in_tier &= np.isnan(stop_change)
+            stop_change = np.where(
+                in_tier, arrays["stop_price_per_token_percent_change"][config_index, k], stop_change
+            )
+            profit_change = np.where(
+                in_tier, arrays["profit_price_per_token_percent_change"][config_index, k], profit_change
+            )
+            sell_percent = np.where(in_tier, arrays["profit_sell_amount_percent"][config_index, k], sell_percent)
+        return (1 + stop_change) * entry_price, (1 + profit_change) * entry_price, sell_percent
+
+    def run(self, strategy_sets: List[List[ExitStrategy]]) -> pd.DataFrame:
+        """Simulate every strategy set on every entry
+
+        Args:
+            strategy_sets (List[List[ExitStrategy]]): tier lists, e.g. from build_strategy_grid
+
+        Returns:
+            pd.DataFrame: one row per strategy set with realized, unrealized and total PnL in SOL
+        """
+        arrays = self._strategy_arrays(strategy_sets=strategy_sets)
+        configs, tiers = arrays["stop_price_per_token_percent_change"].shape
+        tokens, steps = self.close.shape
+        state_shape = (configs, tokens)
+
+        remaining = np.ones(state_shape)
+        realized_return = np.zeros(state_shape)
+        sold_any = np.zeros(state_shape, dtype=bool)
+        exits_stop = np.zeros(state_shape, dtype=int)
+        exits_duration = np.zeros(state_shape, dtype=int)
+        exits_profit = np.zeros(state_shape, dtype=int)
+        last_price = np.broadcast_to(self.entry_price, state_shape).copy()
+        entry_price = self.entry_price[None, :]
+        config_index = np.broadcast_to(np.arange(configs)[:, None], state_shape)
+        stop_price, profit_price, tier_sell = self._lookup_tiers(
+            arrays=arrays, remaining=remaining, config_index=config_index, entry_price=entry_price
+        )
+
+        for t in range(steps):
+            close = self.close[:, t][None, :]
+            valid = ~np.isnan(close)
+            if not valid.any():
+                break
+            active = valid & (remaining > 1e-9) & ~np.isnan(stop_price)
+            if not active.any():
+                break
+            last_price = np.where(valid, close, last_price)
+
+            if self.use_intrabar_extremes:
+                stop_hit = active & (self.low[:, t][None, :] <= stop_price)
+                profit_hit = active & (self.high[:, t][None, :] >= profit_price)
+                stop_fill = np.minimum(stop_price, close)
+                profit_fill = np.maximum(profit_price, close)
+            else:
+                stop_hit = active & (close <= stop_price)
+                profit_hit = active & (close >= profit_price)
+                stop_fill = close
+                profit_fill = close
+
+            duration_hit = active & ~stop_hit & (self.hours[:, t][None, :] >= self.max_hold_hours) & ~sold_any
+            profit_hit &= ~stop_hit & ~duration_hit
+
+            sell_fraction = np.where(stop_hit | duration_hit, remaining, 0.0)
+            sell_fraction = np.where(profit_hit, np.minimum(tier_sell, remaining), sell_fraction)
+            fill_price = np.where(stop_hit, stop_fill, np.where(profit_hit, profit_fill, close))
+
+            realized_return += np.where(sell_fraction > 0, sell_fraction * (fill_price / entry_price - 1.0), 0.0)
+            remaining -= sell_fraction
+            sold_any |= sell_fraction > 0
+            exits_stop += stop_hit
+            exits_duration += duration_hit
+            exits_profit += profit_hit
+
+            # The tier only moves when a position sells, so re-derive prices for those positions only
+            changed = sell_fraction > 0
+            if changed.any():
+                stop_price[changed], profit_price[changed], tier_sell[changed] = self._lookup_tiers(
+                    arrays=arrays,
+                    remaining=remaining[changed],
+                    config_index=config_index[changed],
+                    entry_price=np.broadcast_to(entry_price, state_shape)[changed],
+                )
+
+        unrealized_return = remaining * (last_price / entry_price - 1.0)
+        realized_pnl = realized_return * self.sol_spent[None, :]
+        unrealized_pnl = unrealized_return * self.sol_spent[None, :]
+        total_return = realized_return + unrealized_return
+
+        results = pd.DataFrame({"config": np.arange(configs)})
+        for name in STRATEGY_FIELDS[2:]:
+            for k in range(tiers):
+                results[f"tier{k}_{name}"] = arrays[name][:, k]
+        results["realized_pnl_sol"] = np.nansum(realized_pnl, axis=1)
+        results["unrealized_pnl_sol"] = np.nansum(unrealized_pnl, axis=1)
+        results["total_pnl_sol"] = results["realized_pnl_sol"] + results["unrealized_pnl_sol"]
+        results["mean_return"] = np.nanmean(total_return, axis=1) if tokens else np.nan
+        results["win_rate"] = (total_return > 0).mean(axis=1) if tokens else np.nan
+        results["stop_exits"] = exits_stop.sum(axis=1)
+        results["duration_exits"] = exits_duration.sum(axis=1)
+        results["profit_exits"] = exits_profit.sum(axis=1)
+        results["open_positions"] = (remaining > 1e-9).sum(axis=1)
+        return results.sort_values("total_pnl_sol", ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from spl_seller.utils.settings import get_exit_strategy
+
+    candles = load_candles(sys.argv[1])
+    entries = load_entries(sys.argv[2])
+
+    strategy_sets = build_strategy_grid(
+        base=get_exit_strategy(index=1),
+        grid={
+            (0, "stop_price_per_token_percent_change"): [-0.2, -0.3, -0.4, -0.5],
+            (0, "profit_price_per_token_percent_change"): [0.3, 0.5, 0.75, 1.0],
+            (0, "profit_sell_amount_percent"): [0.25, 0.5, 0.75],
+            (1, "profit_price_per_token_percent_change"): [0.75, 1.0, 1.5],
+            (2, "profit_price_per_token_percent_change"): [1.5, 2.0, 3.0],
+        },
+    )
+
+    start = time.perf_counter()
+    B = Backtester(candles=candles, entries=entries)
+    results = B.run(strategy_sets=strategy_sets)
+    elapsed = time.perf_counter() - start
+    logger.info("{c} strategy sets x {t} entries in {s:.2f}s".format(c=len(strategy_sets), t=len(entries), s=elapsed))
+    logger.info(results.head(20).to_string())
@@ -0,0 +1,178 @@
+import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from solders.transaction import VersionedTransaction
+
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+COMMITMENT_LEVELS = ["processed", "confirmed", "finalized"]
+
+
+class BlockhashExpired(Exception):
+    """An endpoint's block height passed the transaction's last valid block height before it landed"""
+
+
+class TransactionBroadcaster:
+    """Sends one signed transaction to several RPC endpoints at once, first confirmation wins
+
+    Every endpoint gets the same serialized transaction, resent every rebroadcast_seconds, and is
+    polled with getSignatureStatuses until one of them reports the signature at the wanted
+    commitment, or reports it failed. The other endpoints stop polling as soon as that happens.
+    Given the transaction's last valid block height, an endpoint whose block height has passed it
+    without the signature landing raises BlockhashExpired, since it never will. Raises if every
+    endpoint rejects the send or none confirms within timeout_seconds.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        commitment: str = "confirmed",
+        timeout_seconds: float = 60.0,
+        poll_seconds: float = 0.5,
+        rebroadcast_seconds: float = 2.0,
+        max_concurrent_sends: int = 4,
+    ):
+        if not endpoints:
+            raise ValueError("TransactionBroadcaster needs at least one endpoint")
+        self.endpoints = list(dict.fromkeys(endpoints))
+        self.commitment = commitment
+        self.timeout_seconds = timeout_seconds
+        self.poll_seconds = poll_seconds
+        self.rebroadcast_seconds = rebroadcast_seconds
+        self.sessions: Dict[str, requests.Session] = {x: requests.Session() for x in self.endpoints}
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(self.endpoints) * max_concurrent_sends, thread_name_prefix="broadcast"
+        )
+
+    @staticmethod
+    def _label(endpoint: str) -> str:
+        """Host of endpoint, so API keys in the query string stay out of the logs"""
+        return urlparse(endpoint).netloc or endpoint
+
+    def _post(self, endpoint: str, payload) -> dict:
+        try:
+            response = self.sessions[endpoint].post(endpoint, json=payload, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error from {self._label(endpoint)}: {e}")
+
+    def _is_committed(self, status: dict) -> bool:
+        level = status.get("confirmationStatus")
+        if level not in COMMITMENT_LEVELS:
+            return False
+        return COMMITMENT_LEVELS.index(level) >= COMMITMENT_LEVELS.index(self.commitment)
+
+    def send_and_confirm(
+        self,
+        transaction: VersionedTransaction,
+        timeout_seconds: Optional[float] = None,
+        last_valid_block_height: Optional[int] = None,
+    ) -> str:
+        """Broadcast transaction and wait for the first endpoint to confirm it
+
+        Args:
+            transaction (VersionedTransaction): signed transaction
+            timeout_seconds (Optional[float]): overrides self.timeout_seconds for this transaction
+            last_valid_block_height (Optional[int]): lastValidBlockHeight of the transaction's blockhash
+
+        Raises:
+            BlockhashExpired: an endpoint passed last_valid_block_height without the transaction landing
+
+        Returns:
+            str: transaction signature
+        """
+        signature = str(transaction.signatures[0])
+        encoded = base64.b64encode(bytes(transaction)).decode("utf-8")
+        deadline = time.monotonic() + (self.timeout_seconds if timeout_seconds is None else timeout_seconds)
+        done = threading.Event()
+        futures = {
+            self.executor.submit(
+                self._send_and_poll, endpoint, encoded, signature, done, deadline, last_valid_block_height
+            ): endpoint
+            for endpoint in self.endpoints
+        }
+
+        errors = list()
+        try:
+            for future in as_completed(futures):
+                endpoint = self._label(futures[future])
+                try:
+                    status = future.result()
+                except BlockhashExpired:
+                    raise
+                except Exception as e:
+                    errors.append(str(e))
+                    continue
+                if status is None:
+                    continue
+                if status.get("err") is not None:
+                    raise Exception(f"Transaction {signature} failed: {status['err']}")
+                logger.info(f"Transaction {signature} {status['confirmationStatus']} via {endpoint}")
+                return signature
+        finally:
+            # Stop the endpoints still polling
+            done.set()
+        raise Exception(f"Transaction {signature} not confirmed by {len(self.endpoints)} endpoints: {errors}")
+
+    def _send(self, endpoint: str, encoded: str, skip_preflight: bool) -> dict:
+        options = {"encoding": "base64", "preflightCommitment": self.commitment, "skipPreflight": skip_preflight}
+        if skip_preflight:
+            # Resent by us every rebroadcast_seconds, not by the node
+            options["maxRetries"] = 0
+        return self._post(
+            endpoint, {"jsonrpc": "2.0", "id": 1, "method": "sendTransaction", "params": [encoded, options]}
+        )
+
+    def _send_and_poll(
+        self,
+        endpoint: str,
+        encoded: str,
+        signature: str,
+        done: threading.Event,
+        deadline: float,
+        last_valid_block_height: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Status of signature once endpoint reports it committed or failed, None if stopped first"""
+        response = self._send(endpoint, encoded, skip_preflight=False)
+        if "error" in response:
+            raise Exception(f"sendTransaction failed on {self._label(endpoint)}: {response['error']}")
+
+        last_send = time.monotonic()
+        while not done.is_set() and time.monotonic() < deadline:
+            if time.monotonic() - last_send >= self.rebroadcast_seconds:
+                last_send = time.monotonic()
+                try:
+                    self._send(endpoint, encoded, skip_preflight=True)
+                except Exception as e:
+                    logger.info("Error resending {s}: {e}".format(s=signature, e=e))
+
+            # Block height is read before the status, so a transaction landing in between is not taken as expired
+            expired = False
+            try:
+                if last_valid_block_height is not None:
+                    response = self._post(
+                        endpoint, {"jsonrpc": "2.0", "id": 1, "method": "getBlockHeight", "params": []}
+                    )
+                    expired = response["result"] > last_valid_block_height
+                response = self._post(
+                    endpoint,
+                    {"jsonrpc": "2.0", "id": 1, "method": "getSignatureStatuses", "params": [[signature]]},
+                )
+                status = response["result"]["value"][0]
+            except Exception as e:
+                logger.info("Error polling {s}: {e}".format(s=signature, e=e))
+                status, expired = None, False
+            if status is not None and (status.get("err") is not None or self._is_committed(status)):
+                return status
+            if status is None and expired:
+                raise BlockhashExpired(f"Transaction {signature} expired on {self._label(endpoint)}")
+            done.wait(self.poll_seconds)
+        return None
@@ -1,8 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from typing import List
 
-from heliuspy import HeliusAPI
-from solana.rpc.api import Client
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 from solders.keypair import Keypair
 from solders.message import Message
 from solders.pubkey import Pubkey
@@ -11,9 +11,12 @@ from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import BurnParams, CloseAccountParams, burn, close_account
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from spl_seller.modules.broadcaster import TransactionBroadcaster
+from spl_seller.modules.fee_estimator import URGENCY_CLEANUP, PriorityFeeEstimator
 from spl_seller.types.holdings_data import HoldingData
 from spl_seller.types.wallet_data import WalletInfo
 from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import get_rpc_pool
 from spl_seller.utils.settings import settings_key_values
 
 logger = get_logger()
@@ -26,14 +29,26 @@ class Closer:
         # Configuration
         self.COMMITMENT = "confirmed"
         self.RPC_ENDPOINT = f"https://mainnet.helius-rpc.com/?api-key={self.HELIUS_API_KEY}"
-        # Initialize Solana client
+        # Initialize Solana client, routed across Helius and RPC_ENDPOINTS by endpoint health
         try:
-            self.client = Client(self.RPC_ENDPOINT, commitment=self.COMMITMENT)
+            self.RpcPool = get_rpc_pool(
+                endpoints=[self.RPC_ENDPOINT] + settings_key_values["RPC_ENDPOINTS"],
+                batch_window_ms=settings_key_values["RPC_BATCH_WINDOW_MS"],
+            )
+            self.client = self.RpcPool.get_client(commitment=self.COMMITMENT)
             # version = self.client.get_version()
             # logger.info(f"Connected to Helius RPC, version: {version}")
         except Exception as e:
             raise Exception(f"Failed to connect to Helius RPC: {e}")
-        self.Helius = HeliusAPI(api_key=self.HELIUS_API_KEY)
+        self.HELIUS_TIMEOUT_SECONDS = 30.0
+        self.FeeEstimator = PriorityFeeEstimator(RPC_ENDPOINT=self.RPC_ENDPOINT, RPC_POOL=self.RpcPool)
+        self.Broadcaster = None
+        if settings_key_values["BROADCAST_ENDPOINTS"]:
+            self.Broadcaster = TransactionBroadcaster(
+                endpoints=[self.RPC_ENDPOINT] + settings_key_values["BROADCAST_ENDPOINTS"], commitment=self.COMMITMENT
+            )
+        # Burn and close use about 8k compute units
+        self.COMPUTE_UNIT_LIMIT = 20_000
         self.tokens_to_close = [
             "BfSbstVpvUPaqEm57ZiPBN7fmkQ41NxdGCmARBNFpump",
             "7hBvn2dnqBoHYCh2vp7js3zaPSf6px2s4HMiPzw1pump",
@@ -91,11 +106,20 @@ class Closer:
             list: _description_
         """
         try:
-            token_accounts = self.Helius.get_token_accounts(
-                owner=pub_key,
-                displayOptions={"showZeroBalance": False},
-                page=1,
-                limit=100,  # Adjust limit as needed
+            # DAS getTokenAccounts, which the pool sends to the Helius endpoint
+            token_accounts = self.RpcPool.post(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getTokenAccounts",
+                    "params": {
+                        "owner": pub_key,
+                        "displayOptions": {"showZeroBalance": False},
+                        "page": 1,
+                        "limit": 100,  # Adjust limit as needed
+                    },
+                },
+                timeout=self.HELIUS_TIMEOUT_SECONDS,
             )
         except Exception as e:
             logger.info("Error getting token accounts: {e}".format(e=e))
@@ -140,6 +164,11 @@ class Closer:
         except Exception as e:
             raise Exception(f"RPC error during balance check: {e}")
 
+    def get_balances(self) -> List[int]:
+        """Balances of every wallet in lamports, requested together so they share one RPC batch"""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.wallets))) as executor:
+            return list(executor.map(lambda x: self.get_balance_with_retry(pubkey=x.key_pair.pubkey()), self.wallets))
+
     def close_account(self, key_pair: Keypair, token_to_close: HoldingData):
         logger.info(f"Processing token account for wallet: {key_pair.pubkey()} and token: {token_to_close.mint}")
 
@@ -150,7 +179,12 @@ class Closer:
             return
 
         # Step 2: Create instructions
-        instructions = []
+        instructions = [set_compute_unit_limit(self.COMPUTE_UNIT_LIMIT)]
+        compute_unit_price = self.FeeEstimator.get_compute_unit_price(
+            urgency=URGENCY_CLEANUP, accounts=[token_to_close.address]
+        )
+        if compute_unit_price is not None:
+            instructions.append(set_compute_unit_price(compute_unit_price))
 
         if token_to_close.current_amount_raw > 0:
             # Convert mint address to Pubkey
@@ -215,6 +249,9 @@ class Closer:
     def execute_burn_and_close(self, transaction: VersionedTransaction) -> str:
         """Sign and send the transaction"""
         try:
+            if self.Broadcaster is not None:
+                return self.Broadcaster.send_and_confirm(transaction=transaction)
+
             # Send the transaction
             txid = self.client.send_transaction(transaction).value
             logger.info(f"Transaction sent: https://solscan.io/tx/{txid}")
@@ -237,18 +274,16 @@ class Closer:
                 filtered_accounts.append(each)
                 logger.info(each.__str_short__())
 
-        for wallet in self.wallets:
-            current_balance = self.get_balance_with_retry(pubkey=wallet.key_pair.pubkey()) / 1e9
-            logger.info(f"Beginning Wallet {wallet.public_key[-6:]} balance: {current_balance} SOL")
+        for wallet, balance in zip(self.wallets, self.get_balances()):
+            logger.info(f"Beginning Wallet {wallet.public_key[-6:]} balance: {balance / 1e9} SOL")
 
         for each in filtered_accounts:
             wallet_to_use = self._get_wallet_key_pair(public_key=each.public_key)
             self.close_account(key_pair=wallet_to_use, token_to_close=each)
 
         sleep(10)
-        for wallet in self.wallets:
-            current_balance = self.get_balance_with_retry(pubkey=wallet.key_pair.pubkey()) / 1e9
-            logger.info(f"End Wallet {wallet.public_key[-6:]} balance: {current_balance} SOL")
+        for wallet, balance in zip(self.wallets, self.get_balances()):
+            logger.info(f"End Wallet {wallet.public_key[-6:]} balance: {balance / 1e9} SOL")
 
     def _get_wallet_key_pair(self, public_key: str) -> Keypair:
         """_summary_
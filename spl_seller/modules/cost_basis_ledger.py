@@ -0,0 +1,173 @@
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from spl_seller.modules.swap_parser import parse_buy_swap, parse_sell_swap
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.types.ledger_data import LedgerEntry
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class CostBasisLedger:
+    """Running cost basis per token account, persisted as one JSON file per account
+
+    Each update only fetches transactions newer than the last processed signature and folds them
+    into running totals, so refreshing a holding costs O(new events) instead of O(history).
+    """
+
+    def __init__(
+        self,
+        ledger_dir: str,
+        get_parsed_transactions: Callable[..., list],
+        get_sol_price: Callable[[datetime], float],
+        page_limit: int = 100,
+        max_pages: int = 50,
+    ):
+        self.ledger_dir = ledger_dir
+        self.get_parsed_transactions = get_parsed_transactions
+        self.get_sol_price = get_sol_price
+        self.page_limit = page_limit
+        self.max_pages = max_pages
+        # A buy into a position that is down to this fraction of what was bought starts a new position
+        self.CLOSED_POSITION_PERCENT = 0.01
+        self.entries: Dict[str, LedgerEntry] = dict()
+        os.makedirs(self.ledger_dir, exist_ok=True)
+
+    def _path(self, address: str) -> str:
+        return os.path.join(self.ledger_dir, f"{address}.json")
+
+    def get_entry(self, token: HoldingData) -> LedgerEntry:
+        entry = self.entries.get(token.address)
+        if entry is not None:
+            return entry
+
+        path = self._path(token.address)
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    entry = LedgerEntry.from_dict(json.load(f))
+            except (ValueError, TypeError, KeyError) as e:
+                logger.error("Discarding unreadable ledger {p}: {e}".format(p=path, e=e))
+                entry = None
+
+        if entry is None:
+            entry = LedgerEntry(address=token.address, mint=token.mint, public_key=token.public_key)
+        self.entries[token.address] = entry
+        return entry
+
+    def save(self, entry: LedgerEntry):
+        path = self._path(entry.address)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def get_new_transactions(self, address: str, last_signature: Optional[str]) -> Optional[List[dict]]:
+        """Parsed transactions after last_signature, oldest first
+
+        Pages are fetched until one comes back empty, since a short page can have skipped transactions
+        the API could not parse. Returns None if a page failed or history is longer than max_pages, so
+        the ledger is not advanced past transactions it never saw.
+        """
+        transactions = list()
+        before = None
+        for _ in range(self.max_pages):
+            params = {"limit": self.page_limit}
+            if last_signature:
+                params["until"] = last_signature
+            if before:
+                params["before"] = before
+            try:
+                page = self.get_parsed_transactions(address=address, **params)
+            except Exception as e:
+                page = e
+            if not isinstance(page, list):
+                logger.error("Error getting transactions for {a}: {e}".format(a=address, e=page))
+                return None
+            if not page:
+                break
+            transactions += page
+            before = page[-1]["signature"]
+        else:
+            logger.error(
+                "Transaction history for {a} longer than {n}, not updating the ledger".format(
+                    a=address, n=len(transactions)
+                )
+            )
+            return None
+
+        return list(reversed(transactions))
+
+    def apply_transaction(self, entry: LedgerEntry, swap: dict, token: HoldingData):
+        buy_data = parse_buy_swap(swap=swap, token=token)
+        if buy_data is not None:
+            if entry.buy_amount > 0 and entry.amount <= entry.buy_amount * self.CLOSED_POSITION_PERCENT:
+                logger.info("New position for {a}, resetting ledger".format(a=entry.address))
+                entry = self._reset(entry)
+            buy_data.sol_price = self.get_sol_price(buy_data.buy_time)
+            entry.buy_time = entry.buy_time or buy_data.buy_time
+            entry.buy_count += 1
+            entry.buy_amount += buy_data.buy_amount
+            entry.sol_spent += buy_data.sol_spent
+            if buy_data.sol_price and buy_data.sol_spent:
+                entry.usd_spent += buy_data.sol_price * buy_data.sol_spent
+            return
+
+        sell_data = parse_sell_swap(swap=swap, token=token)
+        if sell_data is None or entry.buy_time is None or sell_data.sell_time < entry.buy_time:
+            return
+        entry.sell_count += 1
+        entry.sell_amount += sell_data.sell_amount
+        entry.sol_received += sell_data.sol_received
+
+    @staticmethod
+    def _reset(entry: LedgerEntry) -> LedgerEntry:
+        entry.buy_time = None
+        entry.buy_count = 0
+        entry.buy_amount = 0
+        entry.sol_spent = 0
+        entry.usd_spent = 0
+        entry.sell_count = 0
+        entry.sell_amount = 0
+        entry.sol_received = 0
+        return entry
+
+    def update(self, token: HoldingData) -> HoldingData:
+        """Apply transactions since the last processed signature and populate the buy and sell fields
+
+        Populates the same fields as Wallet.get_buy_swaps and Wallet.get_sell_swaps.
+        """
+        entry = self.get_entry(token=token)
+        transactions = self.get_new_transactions(address=token.address, last_signature=entry.last_signature)
+        if transactions:
+            for swap in transactions:
+                self.apply_transaction(entry=entry, swap=swap, token=token)
+            entry.last_signature = transactions[-1]["signature"]
+            self.save(entry=entry)
+            logger.info(
+                "{p} - {n} new transactions for {s} {a}".format(
+                    p=token.public_key, n=len(transactions), s=token.symbol, a=token.mint[-6:]
+                )
+            )
+
+        return self.apply_to_holding(entry=entry, token=token)
+
+    @staticmethod
+    def apply_to_holding(entry: LedgerEntry, token: HoldingData) -> HoldingData:
+        token.buy_time = entry.buy_time
+        token.buy_amount = entry.buy_amount
+        token.buy_price_sol_total = entry.sol_spent
+        token.buy_price_usd_total = entry.usd_spent
+        if entry.buy_amount != 0:
+            token.buy_price_per_token_sol = entry.sol_spent / entry.buy_amount
+            token.buy_price_per_token_usd = entry.usd_spent / entry.buy_amount
+            token.sell_percent = (entry.buy_amount - token.current_amount) / entry.buy_amount
+            token.sell_percent_remaining = 1.0 - token.sell_percent
+
+        token.sell_count = entry.sell_count
+        token.sell_amount_mint = entry.sell_amount
+        token.sell_amount_sol = entry.sol_received
+        return token
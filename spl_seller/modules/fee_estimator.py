@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import RpcEndpointPool
+
+logger = get_logger()
+
+URGENCY_STOP = "stop"
+URGENCY_DURATION = "duration"
+URGENCY_PROFIT = "profit"
+URGENCY_CLEANUP = "cleanup"
+
+
+class PriorityFeeEstimator:
+    """Compute unit prices from getRecentPrioritizationFees, sampled in the background
+
+    Fees are sampled per set of writable accounts (pools for a swap, none for a global estimate) by
+    a background thread, every refresh_seconds until the set goes unused for idle_seconds. A request
+    never waits on the RPC: an account set without a fresh sample gets its last one, or the global
+    estimate, while the thread is woken to sample it. The price for a transaction is the percentile
+    for its urgency, clamped to the urgency's bounds.
+    """
+
+    def __init__(
+        self,
+        RPC_ENDPOINT: str,
+        refresh_seconds: float = 10.0,
+        idle_seconds: float = 300.0,
+        RPC_POOL: Optional[RpcEndpointPool] = None,
+    ):
+        self.RPC_ENDPOINT = RPC_ENDPOINT
+        self.RPC_POOL = RPC_POOL
+        self.refresh_seconds = refresh_seconds
+        self.idle_seconds = idle_seconds
+        # urgency -> (percentile, min micro-lamports per CU, max micro-lamports per CU)
+        self.URGENCY_LEVELS = {
+            URGENCY_STOP: (90, 10_000, 5_000_000),
+            URGENCY_DURATION: (75, 5_000, 2_000_000),
+            URGENCY_PROFIT: (60, 5_000, 2_000_000),
+            URGENCY_CLEANUP: (25, 1_000, 100_000),
+        }
+        self.PERCENTILES = sorted(set(x[0] for x in self.URGENCY_LEVELS.values()))
+        # account set -> (sample time, percentile -> micro-lamports per CU)
+        self.samples: Dict[Tuple[str, ...], Tuple[float, Dict[int, float]]] = dict()
+        self.last_used: Dict[Tuple[str, ...], float] = dict()
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.session = requests.Session()
+        self.thread = None
+
+    def _post(self, payload) -> dict:
+        if self.RPC_POOL is not None:
+            return self.RPC_POOL.post(payload, timeout=10)
+        try:
+            response = self.session.post(self.RPC_ENDPOINT, json=payload, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error: {e}")
+
+    def sample(self, accounts: Tuple[str, ...]) -> Optional[Dict[int, float]]:
+        """Fee percentiles over the recent slots returned for accounts"""
+        params = [list(accounts)] if accounts else []
+        try:
+            response = self._post(
+                {"jsonrpc": "2.0", "id": 1, "method": "getRecentPrioritizationFees", "params": params}
+            )
+            if "result" not in response:
+                raise Exception(f"getRecentPrioritizationFees failed: {response.get('error')}")
+        except Exception as e:
+            logger.info("Error sampling priority fees: {e}".format(e=e))
+            return None
+
+        fees = np.array([x["prioritizationFee"] for x in response["result"]], dtype=float)
+        if len(fees) == 0:
+            return None
+        percentiles = dict(zip(self.PERCENTILES, np.percentile(fees, self.PERCENTILES)))
+        with self.lock:
+            self.samples[accounts] = (time.monotonic(), percentiles)
+        return percentiles
+
+    def get_compute_unit_price(self, urgency: str, accounts: Optional[List[str]] = None) -> Optional[int]:
+        """Micro-lamports per compute unit for a transaction writing to accounts, or None with no fee data
+
+        Args:
+            urgency (str): one of the URGENCY_ levels, unknown values are treated as profit
+            accounts (Optional[List[str]]): writable accounts of the transaction, at most 128 are used
+
+        Returns:
+            Optional[int]: compute unit price
+        """
+        key = tuple(sorted(set(accounts or [])))[:128]
+        percentile, min_price, max_price = self.URGENCY_LEVELS.get(urgency, self.URGENCY_LEVELS[URGENCY_PROFIT])
+        now = time.monotonic()
+        with self.lock:
+            self.last_used[key] = now
+            cached = self.samples.get(key)
+
+            if cached is None or now - cached[0] > self.refresh_seconds * 3:
+                # Sampled by the refresh thread, priced meanwhile from the last or the global sample
+                self.last_used[tuple()] = now
+                self.wake.set()
+                if cached is None:
+                    cached = self.samples.get(tuple())
+        self._ensure_thread()
+
+        percentiles = cached[1] if cached is not None else None
+
+        if percentiles is None:
+            return None
+        return int(min(max(percentiles[percentile], min_price), max_price))
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self.thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            self.wake.wait(timeout=self.refresh_seconds)
+            self.wake.clear()
+            now = time.monotonic()
+            with self.lock:
+                for key in [x for x, used in self.last_used.items() if now - used > self.idle_seconds]:
+                    del self.last_used[key]
+                    self.samples.pop(key, None)
+                # Only account sets without a sample this period, so a wake-up samples just the new ones
+                keys = [x for x in self.last_used if now - self.samples.get(x, (0.0, None))[0] >= self.refresh_seconds]
+            for key in keys:
+                self.sample(accounts=key)
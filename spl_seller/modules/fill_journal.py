@@ -0,0 +1,46 @@
+import json
+import os
+import threading
+from collections import deque
+from typing import List, Optional
+
+from spl_seller.types.fill_data import FillData
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class FillJournal:
+    """Record of our own confirmed sells, appended as JSON lines to journal_path when set
+
+    The most recent max_fills are also kept in memory.
+    """
+
+    def __init__(self, journal_path: Optional[str] = None, max_fills: int = 1000):
+        self.journal_path = journal_path
+        self.fills = deque(maxlen=max_fills)
+        self.lock = threading.Lock()
+        if self.journal_path and os.path.dirname(self.journal_path):
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+
+    def append(self, fill: FillData):
+        with self.lock:
+            self.fills.append(fill)
+            if not self.journal_path:
+                return
+            try:
+                with open(self.journal_path, "a") as f:
+                    f.write(json.dumps(fill.to_dict()) + "\n")
+            except OSError as e:
+                logger.error("Error writing fill journal {p}: {e}".format(p=self.journal_path, e=e))
+
+    def read(self) -> List[FillData]:
+        """Every fill in the journal file, oldest first"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return list()
+        fills = list()
+        with open(self.journal_path) as f:
+            for line in f:
+                if line.strip():
+                    fills.append(FillData.from_dict(json.loads(line)))
+        return fills
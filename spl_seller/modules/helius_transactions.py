@@ -0,0 +1,44 @@
+import requests
+
+from spl_seller.utils.hedging import get_hedged_requester
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class HeliusTransactionSource:
+    """Parsed transaction history from the Helius enhanced API
+
+    The same request HeliusAPI.get_parsed_transactions makes, but with a socket timeout: heliuspy
+    posts with no timeout, so a stalled call would hold its thread forever. Requests are hedged like
+    the other idempotent reads.
+    """
+
+    def __init__(self, HELIUS_API_KEY: str, timeout_seconds: float = 30.0, base_url: str = "https://api.helius.xyz"):
+        self.HELIUS_API_KEY = HELIUS_API_KEY
+        self.timeout_seconds = timeout_seconds
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.Hedge = get_hedged_requester(name="helius")
+
+    def _get(self, address: str, params: dict) -> list:
+        url = f"{self.base_url}/v0/addresses/{address}/transactions"
+        try:
+            response = self.session.get(
+                url, params=dict(params, **{"api-key": self.HELIUS_API_KEY}), timeout=self.timeout_seconds
+            )
+            response.raise_for_status()
+            result = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise Exception(f"Helius transactions error: {e}")
+        if not isinstance(result, list):
+            raise Exception(f"Helius transactions error: {result}")
+        return result
+
+    def get_parsed_transactions(self, address: str, **params) -> list:
+        """Same arguments and result as HeliusAPI.get_parsed_transactions (before, until, limit)
+
+        Raises:
+            Exception: the request failed or did not answer within timeout_seconds
+        """
+        return self.Hedge.request(lambda: self._get(address=address, params=params), timeout=self.timeout_seconds)
@@ -0,0 +1,172 @@
+import base64
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import requests
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from spl_seller.types.metadata_data import TokenMetadata
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import RpcEndpointPool
+
+logger = get_logger()
+
+# Byte offset of decimals in the 82-byte SPL mint layout
+MINT_DECIMALS_OFFSET = 44
+
+
+class TokenMetadataCache:
+    """Symbol, name and decimals per mint, which never change once a mint exists
+
+    Lookups go through a bounded in-memory LRU, then one JSON file per mint in cache_dir when set.
+    Everything still missing is fetched with a single getAssetBatch request per batch_size mints.
+    Mints the DAS API returns without decimals are filled from getMultipleAccounts.
+    """
+
+    def __init__(
+        self,
+        RPC_ENDPOINT: str,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 1000,
+        batch_size: int = 1000,
+        RPC_POOL: Optional[RpcEndpointPool] = None,
+    ):
+        self.RPC_ENDPOINT = RPC_ENDPOINT
+        self.RPC_POOL = RPC_POOL
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.entries: "OrderedDict[str, TokenMetadata]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
+    def _post(self, payload):
+        if self.RPC_POOL is not None:
+            return self.RPC_POOL.post(payload, timeout=30)
+        try:
+            response = self.session.post(self.RPC_ENDPOINT, json=payload, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error: {e}")
+
+    def _path(self, mint: str) -> str:
+        return os.path.join(self.cache_dir, f"{mint}.json")
+
+    def _remember(self, metadata: TokenMetadata):
+        with self.lock:
+            self.entries[metadata.mint] = metadata
+            self.entries.move_to_end(metadata.mint)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def _load(self, mint: str) -> Optional[TokenMetadata]:
+        with self.lock:
+            metadata = self.entries.get(mint)
+            if metadata is not None:
+                self.entries.move_to_end(mint)
+                return metadata
+
+        if not self.cache_dir or not os.path.exists(self._path(mint)):
+            return None
+        try:
+            with open(self._path(mint)) as f:
+                metadata = TokenMetadata.from_dict(json.load(f))
+        except (ValueError, TypeError, KeyError) as e:
+            logger.error("Discarding unreadable metadata for {m}: {e}".format(m=mint, e=e))
+            return None
+        self._remember(metadata)
+        return metadata
+
+    def _save(self, metadata: TokenMetadata):
+        self._remember(metadata)
+        if not self.cache_dir:
+            return
+        path = self._path(metadata.mint)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(metadata.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    def get(self, mint: str) -> Optional[TokenMetadata]:
+        return self.get_many(mints=[mint]).get(mint)
+
+    def get_many(self, mints: List[str]) -> Dict[str, TokenMetadata]:
+        """Metadata for every mint that could be found, fetching all cache misses together
+
+        Args:
+            mints (List[str]): mint addresses
+
+        Returns:
+            Dict[str, TokenMetadata]: mint -> metadata, mints that could not be resolved are left out
+        """
+        results = dict()
+        missing = list()
+        for mint in dict.fromkeys(mints):
+            metadata = self._load(mint)
+            if metadata is None:
+                missing.append(mint)
+            else:
+                results[mint] = metadata
+
+        for start in range(0, len(missing), self.batch_size):
+            try:
+                fetched = self.fetch(mints=missing[start : start + self.batch_size])
+            except Exception as e:
+                logger.info("Error getting token metadata: {e}".format(e=e))
+                continue
+            for metadata in fetched:
+                self._save(metadata)
+                results[metadata.mint] = metadata
+        return results
+
+    def fetch(self, mints: List[str]) -> List[TokenMetadata]:
+        response = self._post({"jsonrpc": "2.0", "id": 1, "method": "getAssetBatch", "params": {"ids": mints}})
+        if "result" not in response:
+            raise Exception(f"getAssetBatch failed: {response.get('error')}")
+
+        assets = dict()
+        for asset in response["result"]:
+            if not asset or "id" not in asset:
+                continue
+            metadata = (asset.get("content") or {}).get("metadata") or {}
+            assets[asset["id"]] = {
+                "symbol": metadata.get("symbol"),
+                "name": metadata.get("name"),
+                "decimals": (asset.get("token_info") or {}).get("decimals"),
+            }
+
+        no_decimals = [x for x in mints if assets.get(x, {}).get("decimals") is None]
+        if no_decimals:
+            for mint, decimals in self.fetch_decimals(mints=no_decimals).items():
+                assets.setdefault(mint, {"symbol": None, "name": None})["decimals"] = decimals
+
+        return [
+            TokenMetadata(mint=mint, **values) for mint, values in assets.items() if values.get("decimals") is not None
+        ]
+
+    def fetch_decimals(self, mints: List[str]) -> Dict[str, int]:
+        """Decimals read straight from the mint accounts' data"""
+        config = {"encoding": "base64", "dataSlice": {"offset": MINT_DECIMALS_OFFSET, "length": 1}}
+        decimals = dict()
+        # getMultipleAccounts accepts at most 100 accounts
+        for start in range(0, len(mints), 100):
+            chunk = mints[start : start + 100]
+            response = self._post(
+                {"jsonrpc": "2.0", "id": 1, "method": "getMultipleAccounts", "params": [chunk, config]}
+            )
+            if "result" not in response:
+                raise Exception(f"getMultipleAccounts failed: {response.get('error')}")
+            for mint, account in zip(chunk, response["result"]["value"]):
+                if account is None:
+                    continue
+                data = base64.b64decode(account["data"][0])
+                if data:
+                    decimals[mint] = data[0]
+        return decimals
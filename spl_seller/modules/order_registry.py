@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.types.order_data import ORDER_CONFIRMED, ORDER_FAILED, ORDER_SENT, SellOrder
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class OrderRegistry:
+    """Sell orders per token account, used to suppress duplicate triggers while a sell is in flight
+
+    An account gets a new order only once its previous one has settled: not pending or sent, and
+    either the refreshed holding shows every confirmed fill, the account is gone, or settle_seconds
+    have passed. Failed orders with no fills block the account for failed_cooldown_seconds. An order
+    with an unsettled swap, one given up on while it could still land, blocks the account for
+    unsettled_seconds whatever else, which outlasts the swap's blockhash (60-90s).
+    """
+
+    def __init__(
+        self, settle_seconds: float = 600, failed_cooldown_seconds: float = 30, unsettled_seconds: float = 150
+    ):
+        self.settle_time = timedelta(seconds=settle_seconds)
+        self.failed_cooldown = timedelta(seconds=failed_cooldown_seconds)
+        self.unsettled_time = timedelta(seconds=unsettled_seconds)
+        self.orders: Dict[str, SellOrder] = dict()
+        self.lock = threading.Lock()
+
+    def _is_settled(self, order: SellOrder, token: Optional[HoldingData], now: datetime) -> bool:
+        if order.is_active:
+            return False
+        if order.unsettled_signature is not None and now - order.updated_time < self.unsettled_time:
+            return False
+        if order.status == ORDER_FAILED and order.filled_amount == 0:
+            return now - order.updated_time >= self.failed_cooldown
+        if token is None or now - order.updated_time >= self.settle_time:
+            return True
+        return token.current_amount_raw <= order.expected_amount_raw
+
+    def begin(self, token: HoldingData, amount: int, reason: Optional[str] = None) -> Optional[SellOrder]:
+        """Register a pending sell of amount for token, or None if the account already has an unsettled order"""
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            existing = self.orders.get(token.address)
+            if existing is not None and not self._is_settled(order=existing, token=token, now=now):
+                logger.info(
+                    "Skipping {r} sell of {s}, order is {st}: {o}".format(
+                        r=reason, s=token.symbol, st=existing.status, o=existing
+                    )
+                )
+                return None
+
+            order = SellOrder(
+                address=token.address,
+                mint=token.mint,
+                public_key=token.public_key,
+                amount=amount,
+                start_amount_raw=token.current_amount_raw,
+                reason=reason,
+                created_time=now,
+                updated_time=now,
+            )
+            self.orders[token.address] = order
+            return order
+
+    def _set_status(self, order: SellOrder, status: str, error: Optional[str] = None):
+        with self.lock:
+            order.status = status
+            order.error = error
+            order.updated_time = datetime.now(timezone.utc)
+
+    def mark_sent(self, order: SellOrder):
+        self._set_status(order=order, status=ORDER_SENT)
+
+    def mark_confirmed(self, order: SellOrder):
+        self._set_status(order=order, status=ORDER_CONFIRMED)
+
+    def mark_failed(self, order: SellOrder, error: str):
+        self._set_status(order=order, status=ORDER_FAILED, error=error)
+
+    def record_unsettled(self, order: SellOrder, signature: str):
+        """Record a swap of order that was given up on while it could still land"""
+        with self.lock:
+            order.unsettled_signature = signature
+            order.updated_time = datetime.now(timezone.utc)
+
+    def record_fill(self, order: SellOrder, signature: str, amount: int):
+        """Record a confirmed chunk of order"""
+        with self.lock:
+            order.signatures.append(signature)
+            order.filled_amount += amount
+            order.updated_time = datetime.now(timezone.utc)
+
+    def settle(self, holdings: List[HoldingData]):
+        """Drop orders whose fills are reflected in the refreshed holdings"""
+        now = datetime.now(timezone.utc)
+        by_address = {x.address: x for x in holdings}
+        with self.lock:
+            for address in list(self.orders):
+                if self._is_settled(order=self.orders[address], token=by_address.get(address), now=now):
+                    del self.orders[address]
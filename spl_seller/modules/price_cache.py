@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from multiprocessing.managers import SyncManager
+from time import sleep
+from typing import Callable, Dict, List
+
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+
+class SharedPriceCache:
+    """Price table shared by seller worker processes through a multiprocessing manager
+
+    A mint missing from the table is claimed by the first worker that asks for it; other workers
+    wait for that quote instead of requesting the same mint themselves.
+    """
+
+    def __init__(self, manager: SyncManager, max_age_seconds: float = 5.0, claim_timeout_seconds: float = 10.0):
+        self.prices = manager.dict()
+        self.claims = manager.dict()
+        self.lock = manager.Lock()
+        self.max_age = timedelta(seconds=max_age_seconds)
+        self.claim_timeout = timedelta(seconds=claim_timeout_seconds)
+
+    def get_quotes(self, mints: List[str], fetch: Callable[[List[str]], Dict[str, dict]]) -> Dict[str, dict]:
+        """Return quotes for mints, fetching only the ones no other worker has fresh or in flight
+
+        Args:
+            mints (List[str]): mints to quote
+            fetch (Callable[[List[str]], Dict[str, dict]]): quotes a list of mints, e.g. TokenCharts.get_quotes
+
+        Returns:
+            Dict[str, dict]: mint -> quote values plus quote_time
+        """
+        results = dict()
+        to_fetch = list()
+        to_wait = list()
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            for mint in mints:
+                cached = self.prices.get(mint)
+                if cached and now - cached["quote_time"] <= self.max_age:
+                    results[mint] = cached
+                    continue
+                claimed_at = self.claims.get(mint)
+                if claimed_at and now - claimed_at <= self.claim_timeout:
+                    to_wait.append(mint)
+                    continue
+                self.claims[mint] = now
+                to_fetch.append(mint)
+
+        if to_fetch:
+            try:
+                quotes = fetch(to_fetch)
+            except Exception as e:
+                logger.error("Error fetching quotes: {e}".format(e=e))
+                quotes = dict()
+            quote_time = datetime.now(timezone.utc)
+            with self.lock:
+                for mint in to_fetch:
+                    self.claims.pop(mint, None)
+                    if mint in quotes:
+                        values = dict(quotes[mint], quote_time=quote_time)
+                        self.prices[mint] = values
+                        results[mint] = values
+
+        deadline = now + self.claim_timeout
+        while to_wait and datetime.now(timezone.utc) < deadline:
+            sleep(0.1)
+            for mint in list(to_wait):
+                cached = self.prices.get(mint)
+                if cached and cached["quote_time"] >= now - self.max_age:
+                    results[mint] = cached
+                    to_wait.remove(mint)
+                elif mint not in self.claims:
+                    # The other worker finished without a quote for this mint
+                    to_wait.remove(mint)
+
+        return results
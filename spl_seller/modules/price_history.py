@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+
+from spl_seller.types.price_history_data import PriceStats
+
+
+class PriceHistory:
+    """Fixed-size ring buffer of (timestamp, USD, SOL) price ticks for one holding
+
+    Appends are O(1) writes into preallocated arrays, so memory is capacity ticks however long the
+    process runs. Statistics are computed with NumPy over the ticks in a time window.
+    """
+
+    def __init__(self, capacity: int = 720):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.usd = np.zeros(capacity, dtype=np.float64)
+        self.sol = np.zeros(capacity, dtype=np.float64)
+        self.head = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def last_time(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        return self.times[(self.head - 1) % self.capacity]
+
+    def append(self, price_time: datetime, usd: float, sol: float):
+        """Add a tick, ticks no newer than the last one are ignored"""
+        timestamp = price_time.timestamp()
+        if self.count and timestamp <= self.last_time:
+            return
+        self.times[self.head] = timestamp
+        self.usd[self.head] = usd
+        self.sol[self.head] = sol
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def get_ticks(self, window_seconds: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(times, usd, sol) oldest first, limited to the last window_seconds when given"""
+        if self.count < self.capacity:
+            index = np.arange(self.count)
+        else:
+            index = np.arange(self.head, self.head + self.capacity) % self.capacity
+        times, usd, sol = self.times[index], self.usd[index], self.sol[index]
+        if window_seconds is not None and self.count:
+            start = np.searchsorted(times, times[-1] - window_seconds, side="left")
+            times, usd, sol = times[start:], usd[start:], sol[start:]
+        return times, usd, sol
+
+    def get_stats(self, window_seconds: Optional[float] = None) -> PriceStats:
+        """High-water mark, drawdown from it, realized volatility and change over the window
+
+        volatility is the square root of the summed squared log returns between ticks, not annualized.
+        """
+        _, usd, _ = self.get_ticks(window_seconds=window_seconds)
+        usd = usd[usd > 0]
+        stats = PriceStats(ticks=len(usd))
+        if len(usd) == 0:
+            return stats
+
+        stats.last_usd = float(usd[-1])
+        stats.high_usd = float(usd.max())
+        stats.low_usd = float(usd.min())
+        stats.drawdown = 1.0 - stats.last_usd / stats.high_usd
+        stats.change = stats.last_usd / float(usd[0]) - 1.0
+        returns = np.diff(np.log(usd))
+        stats.volatility = float(np.sqrt(np.sum(returns**2)))
+        return stats
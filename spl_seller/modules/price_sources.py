@@ -0,0 +1,208 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from spl_seller.utils.hedging import get_hedged_requester
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, RpcEndpointPool
+
+logger = get_logger()
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+
+class SourceBreaker:
+    """Circuit breaker for one price source
+
+    failure_threshold consecutive failures open it for cooldown_seconds, after which a single trial
+    request decides whether it closes again or stays open for another cooldown.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go to the source now, claiming the trial request when half open"""
+        with self.lock:
+            if self.state == CIRCUIT_OPEN and time.monotonic() >= self.open_until:
+                self.state = CIRCUIT_HALF_OPEN
+                self.trial_in_flight = False
+            if self.state == CIRCUIT_OPEN:
+                return False
+            if self.state == CIRCUIT_HALF_OPEN:
+                if self.trial_in_flight:
+                    return False
+                self.trial_in_flight = True
+            return True
+
+    def record(self, ok: bool):
+        with self.lock:
+            self.trial_in_flight = False
+            if ok:
+                if self.state != CIRCUIT_CLOSED:
+                    logger.info("Price source recovered: {n}".format(n=self.name))
+                self.state = CIRCUIT_CLOSED
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = CIRCUIT_OPEN
+                self.open_until = time.monotonic() + self.cooldown_seconds
+                logger.info("Price source skipped for {s}s: {n}".format(s=self.cooldown_seconds, n=self.name))
+
+    def __str__(self):
+        return f"{self.name}: {self.state} - consecutive_failures: {self.consecutive_failures}"
+
+
+class PriceSourceChain:
+    """Quotes mints from each source in turn, later sources only quoting what earlier ones missed
+
+    sources are (name, fetch) pairs, fetch taking a list of mints and returning mint -> quote values
+    with current_price_per_token_usd and current_price_per_token_sol. A fetch that raises counts
+    against its name's SourceBreaker; entries sharing a name share the breaker. Sources with an open
+    breaker are skipped without a request.
+
+    Every quote gets source, the name it came from, and price_time, when the source last updated the
+    price if it says so, otherwise when it answered.
+    """
+
+    def __init__(
+        self,
+        sources: List[Tuple[str, Callable[[List[str]], Dict[str, dict]]]],
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 60.0,
+    ):
+        self.sources = sources
+        self.breakers: Dict[str, SourceBreaker] = {
+            name: SourceBreaker(name=name, failure_threshold=failure_threshold, cooldown_seconds=cooldown_seconds)
+            for name, _ in sources
+        }
+
+    def iter_quotes(self, mints: List[str]) -> Iterator[Dict[str, dict]]:
+        """Quotes from each source that was asked, as each returns"""
+        remaining = list(dict.fromkeys(mints))
+        for name, fetch in self.sources:
+            if not remaining:
+                return
+            breaker = self.breakers[name]
+            if not breaker.allow():
+                continue
+            try:
+                quotes = fetch(remaining)
+            except Exception as e:
+                breaker.record(ok=False)
+                logger.info("Price source {n} failed: {e}".format(n=name, e=e))
+                continue
+            breaker.record(ok=True)
+
+            answered_at = datetime.now(timezone.utc)
+            quotes = {
+                mint: dict(values, source=name, price_time=values.get("price_time") or answered_at)
+                for mint, values in quotes.items()
+                if mint in remaining
+            }
+            remaining = [x for x in remaining if x not in quotes]
+            yield quotes
+
+    def get_quotes(self, mints: List[str]) -> Dict[str, dict]:
+        quotes = dict()
+        for batch in self.iter_quotes(mints=mints):
+            quotes.update(batch)
+        return quotes
+
+    def __str__(self):
+        return "\n".join(str(x) for x in self.breakers.values())
+
+
+class JupiterPrices:
+    """USD prices from the Jupiter price API, converted to SOL with the SOL price from the same request"""
+
+    def __init__(self, url: str = "https://api.jup.ag/price/v2", batch_size: int = 100):
+        self.url = url
+        self.batch_size = batch_size
+        self.session = requests.Session()
+        self.Hedge = get_hedged_requester(name="jupiter")
+
+    def get_quotes(self, mints: List[str]) -> Dict[str, dict]:
+        results = dict()
+        for start in range(0, len(mints), self.batch_size):
+            chunk = mints[start : start + self.batch_size]
+            ids = list(dict.fromkeys(chunk + [SOL_MINT]))
+            try:
+                response = self.Hedge.request(
+                    lambda: self.session.get(self.url, params={"ids": ",".join(ids)}, timeout=10), timeout=10
+                )
+                response.raise_for_status()
+                data = response.json()["data"]
+            except (requests.exceptions.RequestException, TimeoutError, ValueError, KeyError) as e:
+                raise Exception(f"Jupiter price error: {e}")
+
+            prices = {mint: float(x["price"]) for mint, x in data.items() if x and x.get("price")}
+            sol_usd = prices.get(SOL_MINT)
+            if not sol_usd:
+                raise Exception("Jupiter price response has no SOL price")
+            for mint in chunk:
+                if mint in prices:
+                    results[mint] = {
+                        "current_price_per_token_usd": prices[mint],
+                        "current_price_per_token_sol": prices[mint] / sol_usd,
+                    }
+        return results
+
+
+class HeliusAssetPrices:
+    """USD prices from the price_info Helius DAS returns in getAssetBatch, converted to SOL like JupiterPrices
+
+    DAS only prices the top tokens by volume, so this is the last resort.
+    """
+
+    def __init__(self, RPC_ENDPOINT: str, RPC_POOL: Optional[RpcEndpointPool] = None, batch_size: int = 1000):
+        self.RPC_ENDPOINT = RPC_ENDPOINT
+        self.RPC_POOL = RPC_POOL
+        self.batch_size = batch_size
+        self.session = requests.Session()
+
+    def _post(self, payload) -> dict:
+        if self.RPC_POOL is not None:
+            return self.RPC_POOL.post(payload, timeout=10)
+        try:
+            response = self.session.post(self.RPC_ENDPOINT, json=payload, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error: {e}")
+
+    def get_quotes(self, mints: List[str]) -> Dict[str, dict]:
+        results = dict()
+        for start in range(0, len(mints), self.batch_size):
+            chunk = mints[start : start + self.batch_size]
+            ids = list(dict.fromkeys(chunk + [SOL_MINT]))
+            response = self._post({"jsonrpc": "2.0", "id": 1, "method": "getAssetBatch", "params": {"ids": ids}})
+            if "result" not in response:
+                raise Exception(f"getAssetBatch failed: {response.get('error')}")
+
+            prices = dict()
+            for asset in response["result"]:
+                price_info = ((asset or {}).get("token_info") or {}).get("price_info") or {}
+                if price_info.get("currency") in ["USDC", "USDT"] and price_info.get("price_per_token"):
+                    prices[asset["id"]] = float(price_info["price_per_token"])
+            sol_usd = prices.get(SOL_MINT)
+            if not sol_usd:
+                raise Exception("getAssetBatch response has no SOL price")
+            for mint in chunk:
+                if mint in prices:
+                    results[mint] = {
+                        "current_price_per_token_usd": prices[mint],
+                        "current_price_per_token_sol": prices[mint] / sol_usd,
+                    }
+        return results
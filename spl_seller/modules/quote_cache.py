@@ -0,0 +1,56 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class QuoteCache:
+    """Recent Jupiter quotes keyed by (input mint, output mint, amount bucket, slippage)
+
+    Amounts are bucketed geometrically by bucket_ratio. Price per unit for an amount with no cached
+    quote in its bucket is interpolated, in log amount, between the nearest cached buckets on either
+    side, or taken from the nearest bucket within max_bucket_distance when only one side is cached.
+    """
+
+    def __init__(self, ttl_seconds: float = 10.0, bucket_ratio: float = 1.25, max_bucket_distance: int = 4):
+        self.ttl = ttl_seconds
+        self.bucket_ratio = bucket_ratio
+        self.max_bucket_distance = max_bucket_distance
+        self.quotes: Dict[Tuple[str, str, int, int], Tuple[float, dict]] = dict()
+        self.lock = threading.Lock()
+
+    def _bucket(self, amount: int) -> int:
+        return int(math.floor(math.log(max(amount, 1)) / math.log(self.bucket_ratio)))
+
+    def put(self, quote: dict, slippage_bps: int):
+        key = (quote["inputMint"], quote["outputMint"], self._bucket(int(quote["inAmount"])), slippage_bps)
+        with self.lock:
+            self.quotes[key] = (time.monotonic(), quote)
+
+    def get_price_per_unit(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int) -> Optional[float]:
+        """Estimated output per raw input unit for amount, or None if nothing usable is cached"""
+        now = time.monotonic()
+        prices = dict()
+        with self.lock:
+            for key in [x for x in self.quotes if now - self.quotes[x][0] > self.ttl]:
+                del self.quotes[key]
+            for (cached_input, cached_output, bucket, cached_slippage), (_, quote) in self.quotes.items():
+                if (cached_input, cached_output, cached_slippage) != (input_mint, output_mint, slippage_bps):
+                    continue
+                prices[bucket] = (int(quote["inAmount"]), int(quote["outAmount"]) / int(quote["inAmount"]))
+
+        bucket = self._bucket(amount)
+        if bucket in prices:
+            return prices[bucket][1]
+
+        lower = max([x for x in prices if x < bucket], default=None)
+        higher = min([x for x in prices if x > bucket], default=None)
+        if lower is not None and higher is not None:
+            (low_amount, low_price), (high_amount, high_price) = prices[lower], prices[higher]
+            weight = (math.log(amount) - math.log(low_amount)) / (math.log(high_amount) - math.log(low_amount))
+            return low_price + (high_price - low_price) * weight
+
+        nearest = lower if higher is None else higher
+        if nearest is not None and abs(nearest - bucket) <= self.max_bucket_distance:
+            return prices[nearest][1]
+        return None
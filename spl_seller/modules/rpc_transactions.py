@@ -0,0 +1,218 @@
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import requests
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from spl_seller.modules.swap_parser import SOL_MINT
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import RpcEndpointPool
+
+logger = get_logger()
+
+
+class RpcTransactionSource:
+    """Parsed transaction history from standard JSON-RPC instead of the Helius enhanced API
+
+    Signatures come from getSignaturesForAddress and transactions from batched getTransaction
+    requests. Transfers are derived locally from pre/post token and lamport balances and returned in
+    the enhanced-API shape (tokenTransfers, nativeTransfers, accountData), so the output can be used
+    anywhere Helius.get_parsed_transactions is.
+    """
+
+    def __init__(
+        self,
+        RPC_ENDPOINT: str,
+        batch_size: int = 50,
+        COMMITMENT: str = "confirmed",
+        RPC_POOL: Optional[RpcEndpointPool] = None,
+    ):
+        self.RPC_ENDPOINT = RPC_ENDPOINT
+        self.RPC_POOL = RPC_POOL
+        self.batch_size = batch_size
+        self.COMMITMENT = COMMITMENT
+        self.session = requests.Session()
+
+    @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
+    def _post(self, payload):
+        if self.RPC_POOL is not None:
+            return self.RPC_POOL.post(payload, timeout=30)
+        try:
+            response = self.session.post(self.RPC_ENDPOINT, json=payload, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error: {e}")
+
+    def get_signatures(
+        self, address: str, before: Optional[str] = None, until: Optional[str] = None, limit: int = 100
+    ) -> List[dict]:
+        config = {"limit": limit, "commitment": self.COMMITMENT}
+        if before:
+            config["before"] = before
+        if until:
+            config["until"] = until
+        response = self._post(
+            {"jsonrpc": "2.0", "id": 1, "method": "getSignaturesForAddress", "params": [address, config]}
+        )
+        if "result" not in response:
+            raise Exception(f"getSignaturesForAddress failed: {response.get('error')}")
+        return response["result"]
+
+    def get_transactions(self, signatures: List[str]) -> Dict[str, dict]:
+        """getTransaction for every signature, batch_size requests per HTTP call
+
+        Raises:
+            Exception: a signature got no transaction, from an error in the batch or not being indexed yet,
+                so a history is never returned with a swap missing
+        """
+        config = {"encoding": "json", "maxSupportedTransactionVersion": 0, "commitment": self.COMMITMENT}
+        transactions = dict()
+        for start in range(0, len(signatures), self.batch_size):
+            chunk = signatures[start : start + self.batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": i, "method": "getTransaction", "params": [signature, config]}
+                for i, signature in enumerate(chunk)
+            ]
+            responses = self._post(payload)
+            if not isinstance(responses, list):
+                raise Exception(f"getTransaction batch failed: {responses}")
+            for response in responses:
+                if response.get("result") is None:
+                    raise Exception(f"getTransaction {chunk[response['id']]} failed: {response.get('error')}")
+                transactions[chunk[response["id"]]] = response["result"]
+            missing = [x for x in chunk if x not in transactions]
+            if missing:
+                raise Exception(f"getTransaction batch returned no response for {missing[0]}")
+        return transactions
+
+    def get_parsed_transactions(self, address: str, **params) -> list:
+        """Same arguments and result shape as HeliusAPI.get_parsed_transactions (before, until, limit)
+
+        Raises:
+            Exception: an RPC request failed, like HeliusAPI does, so a failure is never read as no history
+        """
+        try:
+            signatures = self.get_signatures(
+                address=address,
+                before=params.get("before"),
+                until=params.get("until"),
+                limit=params.get("limit", 100),
+            )
+            transactions = self.get_transactions(signatures=[x["signature"] for x in signatures])
+        except Exception as e:
+            logger.error("Error getting transactions for {a}: {e}".format(a=address, e=e))
+            raise
+
+        return [
+            self.to_enhanced(signature=each["signature"], transaction=transactions[each["signature"]])
+            for each in signatures
+        ]
+
+    @staticmethod
+    def to_enhanced(signature: str, transaction: dict) -> dict:
+        """Derive enhanced-API transfers from a getTransaction result's balance changes"""
+        meta = transaction["meta"]
+        message = transaction["transaction"]["message"]
+        loaded = meta.get("loadedAddresses") or {}
+        account_keys = message["accountKeys"] + loaded.get("writable", []) + loaded.get("readonly", [])
+        fee_payer = account_keys[0]
+        fee = meta.get("fee", 0)
+
+        native_changes = dict()
+        for i, (pre, post) in enumerate(zip(meta["preBalances"], meta["postBalances"])):
+            change = post - pre
+            if i == 0:
+                change += fee
+            if change != 0:
+                native_changes[account_keys[i]] = change
+
+        token_balances = dict()
+        for key, sign in (("preTokenBalances", -1), ("postTokenBalances", 1)):
+            for balance in meta.get(key) or []:
+                index = balance["accountIndex"]
+                current = token_balances.setdefault(
+                    index,
+                    {
+                        "tokenAccount": account_keys[index],
+                        "userAccount": balance.get("owner", ""),
+                        "mint": balance["mint"],
+                        "decimals": balance["uiTokenAmount"]["decimals"],
+                        "change": 0,
+                    },
+                )
+                current["change"] += sign * int(balance["uiTokenAmount"]["amount"])
+        token_changes = [x for x in token_balances.values() if x["change"] != 0]
+
+        token_transfers = list()
+        changes_by_mint = defaultdict(list)
+        for each in token_changes:
+            changes_by_mint[each["mint"]].append(each)
+        for mint, changes in changes_by_mint.items():
+            senders = sorted([x for x in changes if x["change"] < 0], key=lambda x: x["change"])
+            receivers = sorted([x for x in changes if x["change"] > 0], key=lambda x: -x["change"])
+            # SOL wrapped or unwrapped inside the transaction moves to or from the signer's lamports
+            default_user = fee_payer if mint == SOL_MINT else ""
+            for receiver in receivers:
+                sender = senders[0] if senders else {"tokenAccount": "", "userAccount": default_user}
+                token_transfers.append(
+                    {
+                        "fromTokenAccount": sender["tokenAccount"],
+                        "fromUserAccount": sender["userAccount"],
+                        "toTokenAccount": receiver["tokenAccount"],
+                        "toUserAccount": receiver["userAccount"],
+                        "tokenAmount": receiver["change"] / (10 ** receiver["decimals"]),
+                        "mint": mint,
+                    }
+                )
+            if not receivers:
+                for sender in senders:
+                    token_transfers.append(
+                        {
+                            "fromTokenAccount": sender["tokenAccount"],
+                            "fromUserAccount": sender["userAccount"],
+                            "toTokenAccount": "",
+                            "toUserAccount": default_user,
+                            "tokenAmount": -sender["change"] / (10 ** sender["decimals"]),
+                            "mint": mint,
+                        }
+                    )
+
+        native_transfers = list()
+        native_senders = sorted([(v, k) for k, v in native_changes.items() if v < 0])
+        if native_senders:
+            source = fee_payer if native_changes.get(fee_payer, 0) < 0 else native_senders[0][1]
+            for account, change in native_changes.items():
+                if change > 0 and account != source:
+                    native_transfers.append({"fromUserAccount": source, "toUserAccount": account, "amount": change})
+
+        account_data = list()
+        for i, account in enumerate(account_keys[: len(meta["preBalances"])]):
+            account_data.append(
+                {
+                    "account": account,
+                    "nativeBalanceChange": meta["postBalances"][i] - meta["preBalances"][i],
+                    "tokenBalanceChanges": [
+                        {
+                            "userAccount": x["userAccount"],
+                            "tokenAccount": x["tokenAccount"],
+                            "mint": x["mint"],
+                            "rawTokenAmount": {"tokenAmount": str(x["change"]), "decimals": x["decimals"]},
+                        }
+                        for x in token_changes
+                        if x["tokenAccount"] == account
+                    ],
+                }
+            )
+
+        return {
+            "signature": signature,
+            "slot": transaction.get("slot"),
+            "timestamp": transaction.get("blockTime"),
+            "fee": fee,
+            "feePayer": fee_payer,
+            "transactionError": meta.get("err"),
+            "tokenTransfers": token_transfers,
+            "nativeTransfers": native_transfers,
+            "accountData": account_data,
+        }
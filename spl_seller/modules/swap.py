@@ -1,28 +1,100 @@
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
+from typing import Callable, List, Optional, Tuple
 
 import requests
-from solana.rpc.api import Client
+from solana.rpc.core import RPCException
+from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.transaction import VersionedTransaction
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from spl_seller.utils.log import get_logger
+from spl_seller.modules.broadcaster import COMMITMENT_LEVELS, BlockhashExpired, TransactionBroadcaster
+from spl_seller.modules.fee_estimator import URGENCY_PROFIT, URGENCY_STOP, PriorityFeeEstimator
+from spl_seller.modules.quote_cache import QuoteCache
+from spl_seller.utils.hedging import get_hedged_requester
+from spl_seller.utils.log import LOG_SWAP_RESPONSE, get_logger
+from spl_seller.utils.rpc_pool import get_rpc_pool
 
 logger = get_logger()
 
 
+# How a sent swap ended, see Swapper.wait_for_outcome
+OUTCOME_LANDED = "landed"
+OUTCOME_FAILED = "failed"
+OUTCOME_EXPIRED = "expired"
+OUTCOME_TIMEOUT = "timeout"
+
+
+class SimulationError(Exception):
+    """simulateTransaction reported the swap would fail, so it was not sent"""
+
+
+class SwapUnsettled(Exception):
+    """The exit deadline passed while a sent swap could still land"""
+
+    def __init__(self, message: str, signature: str):
+        super().__init__(message)
+        self.signature = signature
+
+
 class Swapper:
-    def __init__(self, HELIUS_API_KEY: str):
+    def __init__(
+        self,
+        HELIUS_API_KEY: str,
+        RPC_BATCH_WINDOW_MS: float = 5.0,
+        QUOTE_CACHE_SECONDS: float = 10.0,
+        BROADCAST_ENDPOINTS: Optional[List[str]] = None,
+        RPC_ENDPOINTS: Optional[List[str]] = None,
+        SIMULATE_SWAPS: bool = False,
+    ):
         # Configuration
         self.RPC_ENDPOINT = f"https://mainnet.helius-rpc.com/?api-key={HELIUS_API_KEY}"
+        self.JUPITER_API_URL = "https://quote-api.jup.ag/v6"
         self.sol_mint = "So11111111111111111111111111111111111111112"  # SOL
 
         self.COMMITMENT = "confirmed"  # Commitment level for RPC calls
         self.MAX_SOL_CHUNK = 10.0
+        self.SLIPPAGE_BPS = 200  # 2.0% slippage
+        # Retry policy: a sell keeps retrying until its exit deadline rather than for a number of attempts
+        self.EXIT_DEADLINE_SECONDS = {URGENCY_STOP: 60.0}
+        self.DEFAULT_EXIT_DEADLINE_SECONDS = 180.0
+        self.QUOTE_MAX_AGE_SECONDS = 5.0  # Older quotes are refreshed before the next attempt
+        self.FEE_ESCALATION = 1.5  # Compute unit price multiplier per attempt
+        self.MAX_COMPUTE_UNIT_PRICE = 10_000_000  # micro-lamports
+        # Escalated on retries when the FeeEstimator has no data, roughly Jupiter's veryHigh level
+        self.FALLBACK_COMPUTE_UNIT_PRICE = 1_000_000  # micro-lamports
+        self.REBROADCAST_SECONDS = 2.0  # Resend an unconfirmed swap this often until its blockhash expires
+        self.POLL_SECONDS = 0.5
+        self.BLOCKHASH_LIFETIME_SECONDS = 90.0  # Used when Jupiter returns no lastValidBlockHeight
+        self.RETRY_BACKOFF_SECONDS = 0.5  # Doubles per attempt after an error building a swap, up to 4s
+        self.MAX_REQUOTES = 3  # Failed simulations re-quoted at once, later ones back off like errors
+        # Jupiter deadlines, quotes are hedged against slow responses
+        self.QUOTE_TIMEOUT_SECONDS = 5.0
+        self.SWAP_TIMEOUT_SECONDS = 10.0
+        self.QuoteHedge = get_hedged_requester(name="jupiter_quote")
+        # Simulate every swap before sending, a failed simulation gets a fresh quote at once
+        self.SIMULATE_SWAPS = SIMULATE_SWAPS
+        self.SimulationExecutor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="simulate")
+        # Recent quotes used to size chunks without an extra round trip
+        self.QuoteCache = QuoteCache(ttl_seconds=QUOTE_CACHE_SECONDS)
+        self.RpcPool = get_rpc_pool(
+            endpoints=[self.RPC_ENDPOINT] + (RPC_ENDPOINTS or []), batch_window_ms=RPC_BATCH_WINDOW_MS
+        )
+        self.FeeEstimator = PriorityFeeEstimator(RPC_ENDPOINT=self.RPC_ENDPOINT, RPC_POOL=self.RpcPool)
+        # Send swaps to the Helius endpoint and every BROADCAST_ENDPOINTS endpoint at once
+        self.Broadcaster = None
+        if BROADCAST_ENDPOINTS:
+            self.Broadcaster = TransactionBroadcaster(
+                endpoints=[self.RPC_ENDPOINT] + BROADCAST_ENDPOINTS,
+                commitment=self.COMMITMENT,
+                rebroadcast_seconds=self.REBROADCAST_SECONDS,
+            )
         # Initialize Solana client
         try:
-            self.client = Client(self.RPC_ENDPOINT, commitment=self.COMMITMENT)
+            self.client = self.RpcPool.get_client(commitment=self.COMMITMENT)
             # version = self.client.get_version()
             # logger.info(f"Connected to Helius RPC, version: {version}")
         except Exception as e:
@@ -36,33 +108,80 @@ class Swapper:
         except Exception as e:
             raise Exception(f"RPC error during balance check: {e}")
 
-    def place_sell_order(self, INPUT_MINT: str, AMOUNT: int, KEY_PAIR: Keypair):
-        """Place a sell order for AMOUNT of INPUT_MINT"""
+    def place_sell_order(
+        self,
+        INPUT_MINT: str,
+        AMOUNT: int,
+        KEY_PAIR: Keypair,
+        on_fill: Optional[Callable[[str, int, int], None]] = None,
+        urgency: str = URGENCY_PROFIT,
+        on_unsettled: Optional[Callable[[str], None]] = None,
+        price_per_token_sol: Optional[float] = None,
+        decimals: Optional[int] = None,
+    ):
+        """Place a sell order for AMOUNT of INPUT_MINT
+
+        urgency picks the priority fee level, see PriorityFeeEstimator.
+
+        Chunks are sized from a cached quote for about AMOUNT, or else from price_per_token_sol, the
+        holding's last refreshed price, with decimals. Only when neither is there is the full amount
+        quoted first, so a sell makes one quote per chunk.
+
+        on_fill is called with the signature, amount and quoted lamports out of every chunk once it confirms.
+        on_unsettled is called with the signature of a swap given up on while it could still land.
+
+        Chunks are retried by sell_chunk until EXIT_DEADLINE_SECONDS for urgency, counted from here.
+        """
+        deadline = time.monotonic() + self.EXIT_DEADLINE_SECONDS.get(urgency, self.DEFAULT_EXIT_DEADLINE_SECONDS)
         try:
             logger.info("----Start Sell----")
             logger.info(KEY_PAIR.pubkey())
-            # Get quote
-            quote = self.get_quote(input_mint=INPUT_MINT, output_mint=self.sol_mint, amount=AMOUNT)
-            output_sol = float(quote["outAmount"]) / (10**9)
+            # Size chunks from a recent quote or the holding's price, otherwise from a quote for the full amount
+            quote = None
+            price_per_unit = self.QuoteCache.get_price_per_unit(
+                input_mint=INPUT_MINT, output_mint=self.sol_mint, amount=AMOUNT, slippage_bps=self.SLIPPAGE_BPS
+            )
+            if price_per_unit is None and price_per_token_sol and decimals is not None:
+                # Lamports per raw unit
+                price_per_unit = price_per_token_sol * (10**9) / (10**decimals)
+            if price_per_unit is None:
+                quote = self.get_quote(input_mint=INPUT_MINT, output_mint=self.sol_mint, amount=AMOUNT)
+                price_per_unit = int(quote["outAmount"]) / int(quote["inAmount"])
+            output_sol = price_per_unit * AMOUNT / (10**9)
 
             full_chunk = int((self.MAX_SOL_CHUNK / output_sol) * AMOUNT)
             chunk_amounts = self.get_chunk_amounts(total_amount=AMOUNT, chunk_amount=full_chunk)
 
-            for sell_amount in chunk_amounts:
+            for i, sell_amount in enumerate(chunk_amounts):
                 logger.info("Selling {x} of {t}".format(x=AMOUNT, t=INPUT_MINT))
-                if len(chunk_amounts) > 1:
+                if i > 0:
                     sleep(2)
-                    quote = self.get_quote(input_mint=INPUT_MINT, output_mint=self.sol_mint, amount=sell_amount)
-
-                # Execute swap
-                txid = self.execute_swap(quote=quote, key_pair=KEY_PAIR)
+                # Only the executed chunk needs a fresh quote
+                if quote is not None and int(quote["inAmount"]) != sell_amount:
+                    quote = None
+                txid, quote = self.sell_chunk(
+                    INPUT_MINT=INPUT_MINT,
+                    amount=sell_amount,
+                    key_pair=KEY_PAIR,
+                    urgency=urgency,
+                    deadline=deadline,
+                    quote=quote,
+                )
                 logger.info(f"Sell order successful: https://solscan.io/tx/{txid}")
+                quote_out, quote = quote["outAmount"], None
+                if on_fill is not None:
+                    try:
+                        on_fill(txid, sell_amount, int(quote_out))
+                    except Exception as e:
+                        logger.error(f"Error recording fill {txid}: {e}")
 
             logger.info("----End Sell----")
             return True
 
         except Exception as e:
             logger.error(f"Error in place_sell_order: {e}")
+            if isinstance(e, SwapUnsettled) and on_unsettled is not None:
+                on_unsettled(e.signature)
             return False
 
     def get_chunk_amounts(self, total_amount: int, chunk_amount: int):
@@ -83,84 +202,289 @@ class Swapper:
     def get_quote(self, input_mint: str, output_mint: str, amount: int) -> dict:
         """Get a swap quote from Jupiter API."""
         try:
-            url = "https://quote-api.jup.ag/v6/quote"
+            url = f"{self.JUPITER_API_URL}/quote"
             params = {
                 "inputMint": input_mint,
                 "outputMint": output_mint,
                 "amount": amount,
-                "slippageBps": 200,  # 2.0% slippage
+                "slippageBps": self.SLIPPAGE_BPS,
             }
-            response = requests.get(url, params=params)
+            response = self.QuoteHedge.request(
+                lambda: requests.get(url, params=params, timeout=self.QUOTE_TIMEOUT_SECONDS),
+                timeout=self.QUOTE_TIMEOUT_SECONDS,
+            )
             response.raise_for_status()
             quote_data = response.json()
             if not quote_data.get("inAmount") or not quote_data.get("outAmount"):
                 raise ValueError("Invalid quote: missing inAmount or outAmount")
+            self.QuoteCache.put(quote=quote_data, slippage_bps=self.SLIPPAGE_BPS)
             return quote_data
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, TimeoutError) as e:
             raise Exception(f"Failed to get quote: {e}")
 
-    def create_swap(self, quote: dict, user_public_key: str) -> str:
-        """Create a swap transaction using Jupiter API."""
+    def create_swap(
+        self, quote: dict, user_public_key: str, compute_unit_price: Optional[int] = None
+    ) -> Tuple[str, Optional[int]]:
+        """Create a swap transaction using Jupiter API.
+
+        compute_unit_price is in micro-lamports, without it Jupiter picks a veryHigh priority fee.
+
+        Returns the base64 transaction and the last block height its blockhash is valid for.
+        """
         try:
-            url = "https://quote-api.jup.ag/v6/swap"
+            url = f"{self.JUPITER_API_URL}/swap"
             payload = {
                 "quoteResponse": quote,
                 "userPublicKey": user_public_key,
                 "wrapAndUnwrapSol": True,
-                "prioritizationFeeLamports": {
+            }
+            if compute_unit_price is not None:
+                payload["computeUnitPriceMicroLamports"] = compute_unit_price
+                payload["dynamicComputeUnitLimit"] = True
+            else:
+                payload["prioritizationFeeLamports"] = {
                     "priorityLevelWithMaxLamports": {
                         "maxLamports": 100000000,
                         "global": False,
                         "priorityLevel": "veryHigh",
                     }
-                },
-            }
-            response = requests.post(url, json=payload)
+                }
+            response = requests.post(url, json=payload, timeout=self.SWAP_TIMEOUT_SECONDS)
             response.raise_for_status()
             swap_data = response.json()
             if not swap_data.get("swapTransaction"):
                 raise ValueError("Invalid swap response: missing swapTransaction")
-            logger.info(swap_data)
+            logger.info(swap_data, extra={"category": LOG_SWAP_RESPONSE})
             swap_transaction = swap_data["swapTransaction"]
             # Validate base64
             try:
                 base64.b64decode(swap_transaction)
             except Exception as e:
                 raise ValueError(f"Invalid base64 swapTransaction: {e}")
-            return swap_transaction
+            return swap_transaction, swap_data.get("lastValidBlockHeight")
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to create swap: {e}")
 
-    @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
-    def execute_swap(self, quote: dict, key_pair: Keypair) -> str:
-        """Sign and send the swap transaction with priority fee."""
+    def simulate_swap(self, transaction: VersionedTransaction):
+        """Raise SimulationError if simulateTransaction reports transaction failing
+
+        An RPC error during simulation is only logged, the send then goes ahead as without simulation.
+        """
         try:
-            # Create swap transaction
-            swap_transaction = self.create_swap(quote=quote, user_public_key=str(key_pair.pubkey()))
+            result = self.client.simulate_transaction(transaction, sig_verify=False).value
+        except Exception as e:
+            logger.info(f"Simulation unavailable: {e}")
+            return
+        if result.err is not None:
+            logs = (result.logs or [])[-3:]
+            raise SimulationError(f"{result.err} {logs}")
 
-            # Decode the base64 transaction
-            transaction_bytes = base64.b64decode(swap_transaction)
-            logger.info(f"Decoded transaction length: {len(transaction_bytes)}")
+    def sell_chunk(
+        self,
+        INPUT_MINT: str,
+        amount: int,
+        key_pair: Keypair,
+        urgency: str = URGENCY_PROFIT,
+        deadline: Optional[float] = None,
+        quote: Optional[dict] = None,
+    ) -> Tuple[str, dict]:
+        """Sell amount of INPUT_MINT, retrying until a swap lands or deadline (time.monotonic()) passes
 
-            # Deserialize as a VersionedTransaction
-            unsigned_tx = VersionedTransaction.from_bytes(transaction_bytes)
-            logger.info(f"Deserialized transaction instructions: {len(unsigned_tx.message.instructions)}")
+        Every attempt waits for its swap to land, fail or expire before the next one is built, so two
+        swaps for the same chunk can never both land. The next attempt then:
+        - re-quotes only if the swap failed on chain or in simulation, or the quote is older than
+          QUOTE_MAX_AGE_SECONDS. The first MAX_REQUOTES failed simulations in a row re-quote at once,
+          any after that wait RETRY_BACKOFF_SECONDS, doubling
+        - raises the priority fee by FEE_ESCALATION over the previous attempt
 
-            # Create and sign the transaction
-            signed_tx = VersionedTransaction(unsigned_tx.message, [key_pair])
-            logger.info(f"Final transaction instructions: {len(signed_tx.message.instructions)}")
+        Returns:
+            Tuple[str, dict]: signature of the swap that landed and the quote it was built from
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.EXIT_DEADLINE_SECONDS.get(urgency, self.DEFAULT_EXIT_DEADLINE_SECONDS)
+        quote_time = time.monotonic()
+        requote = quote is None
+        attempt = 0
+        simulation_failures = 0
+        while True:
+            if time.monotonic() >= deadline:
+                raise Exception(f"Exit deadline passed after {attempt} attempts selling {amount} of {INPUT_MINT}")
+            try:
+                if requote or time.monotonic() - quote_time > self.QUOTE_MAX_AGE_SECONDS:
+                    quote = self.get_quote(input_mint=INPUT_MINT, output_mint=self.sol_mint, amount=amount)
+                    quote_time = time.monotonic()
+                    requote = False
+                signature, outcome = self.execute_swap(
+                    quote=quote, key_pair=key_pair, urgency=urgency, attempt=attempt, deadline=deadline
+                )
+            except SimulationError as e:
+                logger.info(f"Simulation failed, re-quoting: {e}")
+                simulation_failures += 1
+                if simulation_failures > self.MAX_REQUOTES:
+                    sleep(min(self.RETRY_BACKOFF_SECONDS * 2 ** (simulation_failures - self.MAX_REQUOTES - 1), 4.0))
+                requote = True
+                attempt += 1
+                continue
+            except Exception as e:
+                logger.error(f"Error in sell attempt {attempt}: {e}")
+                sleep(min(self.RETRY_BACKOFF_SECONDS * 2**attempt, 4.0))
+                attempt += 1
+                continue
 
-            # Send the transaction
-            txid = self.client.send_transaction(signed_tx).value
-            logger.info(f"Transaction sent: https://solscan.io/tx/{txid}")
+            simulation_failures = 0
+            logger.info(f"Swap {signature} {outcome} on attempt {attempt}")
+            if outcome == OUTCOME_LANDED:
+                return signature, quote
+            if outcome == OUTCOME_TIMEOUT:
+                # Still valid, so it may yet land and nothing else can be sent for this chunk
+                raise SwapUnsettled(f"Exit deadline passed waiting for {signature}", signature=signature)
+            # A failed swap means the route or price moved, an expired one is rebuilt with the same quote if fresh
+            requote = outcome == OUTCOME_FAILED
+            attempt += 1
 
-            # Confirm the transaction
-            self.client.confirm_transaction(txid, commitment=self.COMMITMENT)
-            return txid
+    def execute_swap(
+        self,
+        quote: dict,
+        key_pair: Keypair,
+        urgency: str = URGENCY_PROFIT,
+        attempt: int = 0,
+        deadline: Optional[float] = None,
+    ) -> Tuple[str, str]:
+        """Sign and send the swap transaction with priority fee, then wait for its outcome
 
-        except Exception as e:
-            logger.error(f"Error in execute_swap: {e}")
-            raise
+        The priority fee is escalated by FEE_ESCALATION**attempt, up to MAX_COMPUTE_UNIT_PRICE. Without
+        FeeEstimator data the first attempt lets Jupiter pick a veryHigh fee, and retries escalate from
+        FALLBACK_COMPUTE_UNIT_PRICE instead.
+
+        Returns:
+            Tuple[str, str]: signature and one of the OUTCOME_ values
+        """
+        # Price priority from recent fees on the pools the route writes to
+        pools = [x["swapInfo"]["ammKey"] for x in quote.get("routePlan", []) if "swapInfo" in x]
+        compute_unit_price = self.FeeEstimator.get_compute_unit_price(urgency=urgency, accounts=pools)
+        if compute_unit_price is None and attempt > 0:
+            compute_unit_price = self.FALLBACK_COMPUTE_UNIT_PRICE
+        if compute_unit_price is not None and attempt > 0:
+            compute_unit_price = int(
+                min(compute_unit_price * self.FEE_ESCALATION**attempt, self.MAX_COMPUTE_UNIT_PRICE)
+            )
+        logger.info(f"Compute unit price for {urgency} attempt {attempt}: {compute_unit_price}")
+
+        # Create swap transaction
+        swap_transaction, last_valid_block_height = self.create_swap(
+            quote=quote, user_public_key=str(key_pair.pubkey()), compute_unit_price=compute_unit_price
+        )
+
+        # Decode the base64 transaction
+        transaction_bytes = base64.b64decode(swap_transaction)
+        logger.info(f"Decoded transaction length: {len(transaction_bytes)}")
+
+        # Deserialize as a VersionedTransaction
+        unsigned_tx = VersionedTransaction.from_bytes(transaction_bytes)
+        logger.info(f"Deserialized transaction instructions: {len(unsigned_tx.message.instructions)}")
+
+        # Simulation skips signature checks, so it runs on the unsigned transaction while signing
+        simulation = None
+        if self.SIMULATE_SWAPS:
+            simulation = self.SimulationExecutor.submit(self.simulate_swap, transaction=unsigned_tx)
+
+        # Create and sign the transaction
+        signed_tx = VersionedTransaction(unsigned_tx.message, [key_pair])
+        logger.info(f"Final transaction instructions: {len(signed_tx.message.instructions)}")
+
+        if simulation is not None:
+            simulation.result()
+
+        if deadline is None:
+            deadline = time.monotonic() + self.DEFAULT_EXIT_DEADLINE_SECONDS
+        signature = str(signed_tx.signatures[0])
+        sent_at = time.monotonic()
+        if self.Broadcaster is not None:
+            # Without lastValidBlockHeight the broadcast stops at the blockhash lifetime, so a requote can follow
+            timeout = deadline - sent_at
+            if last_valid_block_height is None:
+                timeout = min(timeout, self.BLOCKHASH_LIFETIME_SECONDS)
+            try:
+                self.Broadcaster.send_and_confirm(
+                    transaction=signed_tx,
+                    timeout_seconds=max(0.0, timeout),
+                    last_valid_block_height=last_valid_block_height,
+                )
+                return signature, OUTCOME_LANDED
+            except BlockhashExpired as e:
+                logger.info(str(e))
+                return signature, OUTCOME_EXPIRED
+            except Exception as e:
+                # The broadcast may have reached a node, so the outcome is still settled below
+                logger.info(f"Broadcast of {signature} unconfirmed: {e}")
+
+        outcome = self.wait_for_outcome(
+            transaction=signed_tx, last_valid_block_height=last_valid_block_height, deadline=deadline, sent_at=sent_at
+        )
+        return signature, outcome
+
+    def wait_for_outcome(
+        self,
+        transaction: VersionedTransaction,
+        last_valid_block_height: Optional[int],
+        deadline: float,
+        sent_at: Optional[float] = None,
+    ) -> str:
+        """Send transaction and resend it every REBROADCAST_SECONDS until its outcome is known
+
+        - OUTCOME_LANDED: confirmed at COMMITMENT
+        - OUTCOME_FAILED: landed with an error, or rejected by preflight so it never can
+        - OUTCOME_EXPIRED: block height passed last_valid_block_height without it landing, so it never will
+        - OUTCOME_TIMEOUT: deadline passed while it could still land
+
+        A send that errors in transport may still have reached the node, so it only ends in one of the
+        states above, never in an exception. Without last_valid_block_height the transaction expires
+        BLOCKHASH_LIFETIME_SECONDS after sent_at, when it was first sent, or now.
+        """
+        signature = transaction.signatures[0]
+        target = COMMITMENT_LEVELS.index(self.COMMITMENT)
+        expires_at = None
+        if last_valid_block_height is None:
+            expires_at = (sent_at or time.monotonic()) + self.BLOCKHASH_LIFETIME_SECONDS
+        last_send = None
+        while True:
+            if last_send is None or time.monotonic() - last_send >= self.REBROADCAST_SECONDS:
+                first_send = last_send is None
+                last_send = time.monotonic()
+                try:
+                    self.client.send_transaction(
+                        transaction, opts=TxOpts(skip_preflight=not first_send, preflight_commitment=self.COMMITMENT)
+                    )
+                    if first_send:
+                        logger.info(f"Transaction sent: https://solscan.io/tx/{signature}")
+                except RPCException as e:
+                    if first_send:
+                        logger.info(f"Transaction {signature} rejected: {e}")
+                        return OUTCOME_FAILED
+                except Exception as e:
+                    logger.info(f"Error sending {signature}: {e}")
+
+            # Block height is read before the status, so a swap landing in between is not taken as expired
+            expired = expires_at is not None and time.monotonic() > expires_at
+            try:
+                if last_valid_block_height is not None:
+                    block_height = self.client.get_block_height(commitment=self.COMMITMENT).value
+                    expired = block_height > last_valid_block_height
+                status = self.client.get_signature_statuses([signature]).value[0]
+                if status is not None:
+                    if status.err is not None:
+                        logger.info(f"Transaction {signature} failed: {status.err}")
+                        return OUTCOME_FAILED
+                    if status.confirmation_status is not None and int(status.confirmation_status) >= target:
+                        return OUTCOME_LANDED
+                elif expired:
+                    return OUTCOME_EXPIRED
+            except Exception as e:
+                logger.info(f"Error polling {signature}: {e}")
+
+            if time.monotonic() >= deadline:
+                return OUTCOME_TIMEOUT
+            sleep(self.POLL_SECONDS)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,301 @@
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from spl_seller.modules.swap_parser import SOL_MINT
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+SWAP_COLUMNS = ["address", "position", "timestamp", "token_transfers", "buy_transfers"]
+TRANSFER_COLUMNS = [
+    "address",
+    "position",
+    "mint",
+    "from_token_account",
+    "to_token_account",
+    "from_user",
+    "amount",
+    "native",
+]
+BALANCE_COLUMNS = ["address", "position", "account", "native_change", "token_account", "token_change"]
+
+
+class SwapFrames:
+    """Parsed transactions of many token accounts flattened into columnar frames
+
+    swaps: one row per transaction, in the order returned for its account (position)
+    transfers: one row per token transfer, plus native transfers where parse_buy_swap counts them
+    balances: one row per native balance change and per token balance change in accountData
+    """
+
+    def __init__(self, swaps: pd.DataFrame, transfers: pd.DataFrame, balances: pd.DataFrame):
+        self.swaps = swaps
+        self.transfers = transfers
+        self.balances = balances
+
+
+class SwapAnalytics:
+    """Buy and sell aggregates for many holdings at once, from their parsed transactions
+
+    The rules of parse_buy_swap and parse_sell_swap, the first-buy window and the sold amount cutoff
+    are applied to SwapFrames as group-by operations over every account, and SOL prices for all buys
+    come from a single get_sol_prices call instead of one request per buy.
+    """
+
+    def __init__(self, get_sol_prices: Callable[[List[datetime]], Dict[int, float]], buy_window_minutes: float = 15):
+        self.get_sol_prices = get_sol_prices
+        self.buy_window_seconds = buy_window_minutes * 60
+
+    @staticmethod
+    def flatten(tokens: List[HoldingData], transactions: Dict[str, list]) -> SwapFrames:
+        """Flatten transactions (token account -> parsed transactions) for tokens into SwapFrames"""
+        swap_rows, transfer_rows, balance_rows = list(), list(), list()
+        for token in tokens:
+            address = token.address
+            for position, swap in enumerate(transactions.get(address) or []):
+                token_transfers = swap.get("tokenTransfers") or []
+                native_transfers = swap.get("nativeTransfers")
+                # parse_buy_swap counts native transfers as SOL transfers next to a single token transfer
+                with_native = native_transfers is not None and len(token_transfers) == 1
+                buy_transfers = len(token_transfers) + (len(native_transfers) if with_native else 0)
+                swap_rows.append((address, position, swap["timestamp"], len(token_transfers), buy_transfers))
+
+                for each in token_transfers:
+                    transfer_rows.append(
+                        (
+                            address,
+                            position,
+                            each["mint"],
+                            each.get("fromTokenAccount"),
+                            each.get("toTokenAccount"),
+                            each.get("fromUserAccount"),
+                            each["tokenAmount"],
+                            False,
+                        )
+                    )
+                if with_native:
+                    for each in native_transfers:
+                        transfer_rows.append(
+                            (
+                                address,
+                                position,
+                                SOL_MINT,
+                                None,
+                                None,
+                                each["fromUserAccount"],
+                                each["amount"] / (10**9),
+                                True,
+                            )
+                        )
+
+                for account in swap.get("accountData") or []:
+                    if "nativeBalanceChange" in account:
+                        balance_rows.append(
+                            (
+                                address,
+                                position,
+                                account["account"],
+                                account["nativeBalanceChange"] / (10**9),
+                                None,
+                                0.0,
+                            )
+                        )
+                    for change in account.get("tokenBalanceChanges") or []:
+                        raw = change["rawTokenAmount"]
+                        balance_rows.append(
+                            (
+                                address,
+                                position,
+                                account["account"],
+                                0.0,
+                                change["tokenAccount"],
+                                -int(raw["tokenAmount"]) / (10 ** raw["decimals"]),
+                            )
+                        )
+
+        # Explicit dtypes so empty frames still support numeric group-bys
+        return SwapFrames(
+            swaps=pd.DataFrame.from_records(swap_rows, columns=SWAP_COLUMNS).astype(
+                {"position": int, "timestamp": float, "token_transfers": int, "buy_transfers": int}
+            ),
+            transfers=pd.DataFrame.from_records(transfer_rows, columns=TRANSFER_COLUMNS).astype(
+                {"position": int, "amount": float, "native": bool}
+            ),
+            balances=pd.DataFrame.from_records(balance_rows, columns=BALANCE_COLUMNS).astype(
+                {"position": int, "native_change": float, "token_change": float}
+            ),
+        )
+
+    @staticmethod
+    def _token_frame(tokens: List[HoldingData]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "token_mint": [x.mint for x in tokens],
+                "public_key": [x.public_key for x in tokens],
+                "buy_ts": [x.buy_time.timestamp() if x.buy_time else float("nan") for x in tokens],
+                "unsold_target": [(x.buy_amount or 0) - (x.current_amount or 0) for x in tokens],
+            },
+            index=[x.address for x in tokens],
+        )
+
+    def get_buys(self, tokens: List[HoldingData], frames: SwapFrames) -> pd.DataFrame:
+        """One row per buy counted for tokens, with its SOL price
+
+        A buy is a transaction with a transfer of the token into its account and at least two
+        transfers. Buys are counted from the first one found, in the order transactions were returned,
+        until a transaction is more than buy_window_minutes from the earliest buy counted so far.
+        """
+        swaps, transfers = frames.swaps, frames.transfers
+        swaps = swaps[swaps["address"].isin([x.address for x in tokens])]
+        if swaps.empty:
+            return pd.DataFrame(columns=["address", "position", "timestamp", "buy_amount", "sol_spent", "sol_price"])
+
+        transfers = transfers.join(self._token_frame(tokens=tokens), on="address", how="inner")
+        token_in = (transfers["mint"] == transfers["token_mint"]) & (
+            transfers["to_token_account"] == transfers["address"]
+        )
+        sol_out = (transfers["mint"] == SOL_MINT) & (transfers["from_user"] == transfers["public_key"])
+        per_swap = (
+            transfers.assign(
+                token_in=token_in,
+                buy_amount=transfers["amount"].where(token_in, 0.0),
+                sol_spent=transfers["amount"].where(sol_out, 0.0),
+            )
+            .groupby(["address", "position"])
+            .agg(token_in=("token_in", "any"), buy_amount=("buy_amount", "sum"), sol_spent=("sol_spent", "sum"))
+        )
+
+        swaps = swaps.join(per_swap, on=["address", "position"]).sort_values(["address", "position"])
+        is_buy = swaps["token_in"].fillna(False).astype(bool) & (swaps["buy_transfers"] >= 2)
+
+        # Earliest buy before each transaction, and whether any transaction so far fell outside its window
+        by_address = swaps["address"]
+        earliest = swaps["timestamp"].where(is_buy).groupby(by_address).cummin().groupby(by_address).ffill()
+        earliest_before = earliest.groupby(by_address).shift(1)
+        outside = (swaps["timestamp"] - earliest_before).abs() > self.buy_window_seconds
+        stopped = outside.groupby(by_address).cummax()
+
+        buys = swaps.loc[is_buy & ~stopped, ["address", "position", "timestamp", "buy_amount", "sol_spent"]].copy()
+        minutes = (buys["timestamp"] // 60 * 60).astype(int)
+        sol_prices = self.get_sol_prices(
+            [datetime.fromtimestamp(x, tz=timezone.utc) for x in minutes.unique().tolist()]
+        )
+        buys["sol_price"] = minutes.map(sol_prices)
+        return buys
+
+    def get_sells(self, tokens: List[HoldingData], frames: SwapFrames) -> pd.DataFrame:
+        """One row per sell counted for tokens
+
+        A sell is a transaction with a transfer of the token out of its account and at least two token
+        transfers. Sells before the buy time are skipped, and sells are counted in the order
+        transactions were returned until they cover buy_amount - current_amount.
+        """
+        tokens = [x for x in tokens if x.sell_percent != 0 and x.buy_time is not None]
+        swaps, transfers, balances = frames.swaps, frames.transfers, frames.balances
+        swaps = swaps[swaps["address"].isin([x.address for x in tokens])]
+        if swaps.empty:
+            return pd.DataFrame(columns=["address", "position", "timestamp", "sell_amount", "sol_received"])
+
+        info = self._token_frame(tokens=tokens)
+        transfers = transfers[~transfers["native"]].join(info, on="address", how="inner")
+        token_out = (transfers["mint"] == transfers["token_mint"]) & (
+            transfers["from_token_account"] == transfers["address"]
+        )
+        per_swap = token_out.groupby([transfers["address"], transfers["position"]]).any().rename("token_out")
+
+        balances = balances.join(info, on="address", how="inner")
+        sol_received = balances["native_change"].where(balances["account"] == balances["public_key"], 0.0)
+        sell_amount = balances["token_change"].where(
+            (balances["account"] == balances["address"]) & (balances["token_account"] == balances["address"]), 0.0
+        )
+        changes = (
+            balances.assign(sol_received=sol_received, sell_amount=sell_amount)
+            .groupby(["address", "position"])[["sell_amount", "sol_received"]]
+            .sum()
+        )
+
+        swaps = swaps.join(per_swap, on=["address", "position"]).sort_values(["address", "position"])
+        is_sell = swaps["token_out"].fillna(False).astype(bool) & (swaps["token_transfers"] >= 2)
+        sells = swaps.loc[is_sell, ["address", "position", "timestamp"]].join(changes, on=["address", "position"])
+        sells[["sell_amount", "sol_received"]] = sells[["sell_amount", "sol_received"]].fillna(0.0)
+        sells = sells.join(info[["buy_ts", "unsold_target"]], on="address")
+
+        sells = sells[sells["timestamp"] >= sells["buy_ts"]]
+        sold_before = sells.groupby("address")["sell_amount"].cumsum() - sells["sell_amount"]
+        sells = sells[sold_before < sells["unsold_target"]]
+        return sells[["address", "position", "timestamp", "sell_amount", "sol_received"]]
+
+    def populate_buys(self, tokens: List[HoldingData], frames: SwapFrames) -> List[HoldingData]:
+        """Set buy_time, buy_amount, buy totals, buy prices and sell percents of tokens from their buys"""
+        buys = self.get_buys(tokens=tokens, frames=frames)
+        counted = buys["sol_spent"].ne(0) & buys["sol_price"].notna() & buys["sol_price"].ne(0)
+        buys["usd_spent"] = (buys["sol_price"].astype(float) * buys["sol_spent"]).where(counted, 0.0)
+        totals = (
+            buys.groupby("address")
+            .agg(
+                count=("position", "size"),
+                buy_ts=("timestamp", "min"),
+                buy_amount=("buy_amount", "sum"),
+                sol_total=("sol_spent", "sum"),
+                usd_total=("usd_spent", "sum"),
+            )
+            .to_dict("index")
+        )
+
+        for token in tokens:
+            row = totals.get(token.address)
+            logger.info(
+                "{p} - {l} Buys for {s} {a}".format(
+                    p=token.public_key, l=row["count"] if row else 0, s=token.symbol, a=token.mint[-6:]
+                )
+            )
+            if row is None:
+                continue
+
+            token.buy_time = datetime.fromtimestamp(row["buy_ts"], tz=timezone.utc)
+            token.buy_amount = row["buy_amount"]
+            token.buy_price_sol_total = row["sol_total"]
+            token.buy_price_usd_total = row["usd_total"]
+            if token.buy_amount != 0:
+                token.buy_price_per_token_sol = token.buy_price_sol_total / token.buy_amount
+                token.buy_price_per_token_usd = token.buy_price_usd_total / token.buy_amount
+                token.sell_percent = (token.buy_amount - token.current_amount) / token.buy_amount
+                token.sell_percent_remaining = 1.0 - token.sell_percent
+        if not buys.empty:
+            logger.info(buys)
+        return tokens
+
+    def populate_sells(self, tokens: List[HoldingData], frames: SwapFrames) -> List[HoldingData]:
+        """Set sell_count, sell_amount_mint and sell_amount_sol of tokens from their sells"""
+        sells = self.get_sells(tokens=tokens, frames=frames)
+        totals = (
+            sells.groupby("address")
+            .agg(
+                count=("position", "size"),
+                sell_amount=("sell_amount", "sum"),
+                sol_received=("sol_received", "sum"),
+            )
+            .to_dict("index")
+        )
+
+        for token in tokens:
+            row = totals.get(token.address)
+            if token.sell_percent == 0:
+                continue
+            logger.info(
+                "{p} - {l} Sells for {s} {a}".format(
+                    p=token.public_key, l=row["count"] if row else 0, s=token.symbol, a=token.mint[-6:]
+                )
+            )
+            if row is None:
+                continue
+
+            token.sell_count = int(row["count"])
+            token.sell_amount_mint = row["sell_amount"]
+            token.sell_amount_sol = row["sol_received"]
+        if not sells.empty:
+            logger.info(sells)
+        return tokens
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from spl_seller.types.holdings_data import HoldingData
+from spl_seller.types.swap_data import BuyData, SellData
+
+SOL_MINT = "So11111111111111111111111111111111111111112"
+
+
+def contains_mint_address(
+    mint_address: str, transfers: List[dict], address: str, is_buy: bool = None, is_sell: bool = None
+) -> bool:
+    for transfer in transfers:
+        if transfer["mint"] == mint_address:
+            if not is_buy and not is_sell:
+                return True
+            if is_buy and transfer["toTokenAccount"] == address and len(transfers) >= 2:
+                return True
+            if is_sell and transfer["fromTokenAccount"] == address and len(transfers) >= 2:
+                return True
+    return False
+
+
+def parse_buy_swap(swap: dict, token: HoldingData) -> Optional[BuyData]:
+    """BuyData for a parsed transaction that bought token into its account, else None
+
+    sol_price is left for the caller to fill in.
+    """
+    native_transfers = swap.get("nativeTransfers")
+    transfers = list(swap.get("tokenTransfers") or [])
+
+    if native_transfers is not None and len(transfers) == 1:
+        for each in native_transfers:
+            transfers.append(
+                {
+                    "fromUserAccount": each["fromUserAccount"],
+                    "toUserAccount": each["toUserAccount"],
+                    "tokenAmount": each["amount"] / (10**9),
+                    "mint": SOL_MINT,
+                }
+            )
+
+    if not contains_mint_address(mint_address=token.mint, transfers=transfers, address=token.address, is_buy=True):
+        return None
+
+    buy_data = BuyData(buy_time=datetime.fromtimestamp(swap["timestamp"], tz=timezone.utc))
+    for transfer in transfers:
+        if transfer["mint"] == token.mint and transfer.get("toTokenAccount") == token.address:
+            buy_data.buy_amount += transfer["tokenAmount"]
+        if transfer["mint"] == SOL_MINT and transfer["fromUserAccount"] == token.public_key:
+            buy_data.sol_spent += transfer["tokenAmount"]
+    return buy_data
+
+
+def parse_sell_swap(swap: dict, token: HoldingData) -> Optional[SellData]:
+    """SellData for a parsed transaction that sold token out of its account, else None"""
+    if not contains_mint_address(
+        mint_address=token.mint, transfers=swap.get("tokenTransfers") or [], address=token.address, is_sell=True
+    ):
+        return None
+
+    sell_data = SellData(sell_time=datetime.fromtimestamp(swap["timestamp"], tz=timezone.utc))
+    for account in swap["accountData"]:
+        if account["account"] not in [token.address, token.public_key]:
+            continue
+        if account["account"] == token.public_key and "nativeBalanceChange" in account:
+            sell_data.sol_received += account["nativeBalanceChange"] / (10**9)
+        if account["account"] == token.address and "tokenBalanceChanges" in account:
+            for balance_change in account["tokenBalanceChanges"]:
+                if balance_change["tokenAccount"] == token.address:
+                    sell_data.sell_amount += (int(balance_change["rawTokenAmount"]["tokenAmount"]) * -1) / (
+                        10 ** balance_change["rawTokenAmount"]["decimals"]
+                    )
+    return sell_data
@@ -0,0 +1,119 @@
+import base64
+from typing import List, Optional, Tuple
+
+import numpy as np
+import requests
+from solders.pubkey import Pubkey
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import RpcEndpointPool
+
+logger = get_logger()
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGqPXTR8ZGhpQAoo8n2jSgfC6Yx"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAxSmhuWrqPi1GsKGzSRFvrt"
+
+# Leading fields of the 165-byte SPL token account layout, shared by Token-2022 accounts
+TOKEN_ACCOUNT_DTYPE = np.dtype([("mint", "V32"), ("owner", "V32"), ("amount", "<u8")])
+
+
+def decode_token_accounts(encoded: List[str], min_amount: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode base64 token account data into a TOKEN_ACCOUNT_DTYPE array
+
+    Every account's data is decoded into one contiguous buffer and viewed as a structured array,
+    so no per-field objects are created.
+
+    Args:
+        encoded (List[str]): base64 account data, at least TOKEN_ACCOUNT_DTYPE.itemsize bytes each
+        min_amount (int): accounts with a raw amount at or below this are left out
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: indexes into encoded of the accounts kept, and the decoded accounts
+    """
+    size = TOKEN_ACCOUNT_DTYPE.itemsize
+    buffer = bytearray(size * len(encoded))
+    view = memoryview(buffer)
+    for i, data in enumerate(encoded):
+        view[i * size : (i + 1) * size] = base64.b64decode(data)[:size]
+
+    accounts = np.frombuffer(buffer, dtype=TOKEN_ACCOUNT_DTYPE)
+    keep = np.flatnonzero(accounts["amount"] > min_amount)
+    return keep, accounts[keep]
+
+
+class RpcTokenAccountSource:
+    """Token holdings from getTokenAccountsByOwner instead of the Helius DAS getTokenAccounts
+
+    Accounts are requested base64 encoded with a dataSlice over mint, owner and amount, so each
+    account is 72 bytes on the wire, and decoded straight from the raw layout. Both token programs
+    are queried in one JSON-RPC batch.
+    """
+
+    def __init__(self, RPC_ENDPOINT: str, COMMITMENT: str = "confirmed", RPC_POOL: Optional[RpcEndpointPool] = None):
+        self.RPC_ENDPOINT = RPC_ENDPOINT
+        self.RPC_POOL = RPC_POOL
+        self.COMMITMENT = COMMITMENT
+        self.PROGRAM_IDS = [TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID]
+        self.session = requests.Session()
+
+    @retry(stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10))
+    def _post(self, payload):
+        if self.RPC_POOL is not None:
+            return self.RPC_POOL.post(payload, timeout=30)
+        try:
+            response = self.session.post(self.RPC_ENDPOINT, json=payload, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"RPC error: {e}")
+
+    def get_token_accounts(self, owner: str, min_amount: int = 0) -> List[dict]:
+        """Token accounts for owner with the same fields used from getTokenAccounts (address, mint, amount)
+
+        Args:
+            owner (str): wallet public key
+            min_amount (int): accounts with a raw amount at or below this are left out
+
+        Raises:
+            Exception: RPC error
+
+        Returns:
+            List[dict]: one dict per account holding more than min_amount
+        """
+        config = {
+            "encoding": "base64",
+            "commitment": self.COMMITMENT,
+            "dataSlice": {"offset": 0, "length": TOKEN_ACCOUNT_DTYPE.itemsize},
+        }
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "getTokenAccountsByOwner",
+                "params": [owner, {"programId": program_id}, config],
+            }
+            for i, program_id in enumerate(self.PROGRAM_IDS)
+        ]
+        responses = self._post(payload)
+        if not isinstance(responses, list):
+            raise Exception(f"getTokenAccountsByOwner batch failed: {responses}")
+
+        results = list()
+        for response in sorted(responses, key=lambda x: x.get("id", 0)):
+            if "result" not in response:
+                raise Exception(f"getTokenAccountsByOwner failed: {response.get('error')}")
+            values = response["result"]["value"]
+            keep, accounts = decode_token_accounts(
+                encoded=[x["account"]["data"][0] for x in values], min_amount=min_amount
+            )
+            for index, account in zip(keep, accounts):
+                results.append(
+                    {
+                        "address": values[index]["pubkey"],
+                        "mint": str(Pubkey(account["mint"].tobytes())),
+                        "owner": str(Pubkey(account["owner"].tobytes())),
+                        "amount": int(account["amount"]),
+                    }
+                )
+        return results
@@ -1,18 +1,45 @@
 import json
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
 
 import requests
 
+from spl_seller.modules.price_sources import SOL_MINT, HeliusAssetPrices, JupiterPrices, PriceSourceChain
+from spl_seller.utils.hedging import get_hedged_requester
 from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_pool import RpcEndpointPool
 
 logger = get_logger()
 
 
 class TokenCharts:
-    def __init__(self, BIRDEYE_API_TOKEN: str):
+    def __init__(
+        self, BIRDEYE_API_TOKEN: str, RPC_ENDPOINT: Optional[str] = None, RPC_POOL: Optional[RpcEndpointPool] = None
+    ):
         self.BIRDEYE_API_TOKEN = BIRDEYE_API_TOKEN
         self.headers = {"accept": "application/json", "x-chain": "solana", "X-API-KEY": self.BIRDEYE_API_TOKEN}
+        # Birdeye reads are hedged against slow responses and never wait longer than this
+        self.REQUEST_TIMEOUT_SECONDS = 10.0
+        self.Hedge = get_hedged_requester(name="birdeye")
+
+        # Current prices: Birdeye at 100k then 40k liquidity, then Jupiter, then Helius DAS price_info
+        sources = [
+            ("birdeye", lambda mints: self.get_quotes(mints=mints, liquidity=100000)),
+            ("birdeye", lambda mints: self.get_quotes(mints=mints, liquidity=40000)),
+            ("jupiter", JupiterPrices().get_quotes),
+        ]
+        if RPC_ENDPOINT:
+            sources.append(("helius", HeliusAssetPrices(RPC_ENDPOINT=RPC_ENDPOINT, RPC_POOL=RPC_POOL).get_quotes))
+        self.PriceSources = PriceSourceChain(sources=sources)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Birdeye read, hedged, raising TimeoutError after REQUEST_TIMEOUT_SECONDS"""
+        return self.Hedge.request(
+            lambda: requests.request(
+                method, url, headers=self.headers, timeout=self.REQUEST_TIMEOUT_SECONDS, **kwargs
+            ),
+            timeout=self.REQUEST_TIMEOUT_SECONDS,
+        )
 
     def get_token_price_at_time(self, mint: str, start_time: datetime) -> float:
         """_summary_
@@ -37,44 +64,134 @@ class TokenCharts:
             "time_to": time_from,
         }
         url = "https://public-api.birdeye.so/defi/ohlcv"
-        response = requests.get(url, headers=self.headers, params=params)
+        try:
+            response = self._request("GET", url, params=params)
+        except (requests.exceptions.RequestException, TimeoutError) as e:
+            logger.error("Request failed for {t}: {e}".format(t=mint, e=e))
+            return self._default_price(mint=mint)
 
         # Check if the request was successful
         if response.status_code != 200:
             logger.error("Response failed for {t}: {e}".format(t=mint, e=response.text))
-            if mint == "So11111111111111111111111111111111111111112":
-                logger.error("Returning 160 as default")
-                return 160.0
-            else:
-                return None
+            return self._default_price(mint=mint)
 
         # Parse the JSON response
         response_json = json.loads(response.text)
 
         if "data" not in response_json or "items" not in response_json["data"]:
             logger.error("No OCLHV data for {t}: {e}".format(t=mint, e=response_json))
-            if mint == "So11111111111111111111111111111111111111112":
-                logger.error("Returning 160 as default")
-                return 160.0
-            else:
-                return None
+            return self._default_price(mint=mint)
 
         for each in response_json["data"]["items"]:
             return (each["o"] + each["c"]) / 2.0
 
         logger.error("No Price found")
-        if mint == "So11111111111111111111111111111111111111112":
-            logger.error("Returning 160 as default")
-            return 160.0
+        return self._default_price(mint=mint)
+
+    def _default_price(self, mint: str) -> Optional[float]:
+        """The current SOL price when no candle is found for SOL, since SOL prices are needed for every swap"""
+        if mint != SOL_MINT:
+            return None
+        quote = self.get_prices(mints=[SOL_MINT]).get(SOL_MINT)
+        if quote is None:
+            logger.error("No current SOL price to default to")
+            return None
+        logger.error("Returning current SOL price from {s} as default".format(s=quote["source"]))
+        return quote["current_price_per_token_usd"]
+
+    def get_ohlcv(self, mint: str, start_time: datetime, end_time: datetime, interval: str = "1m") -> List[dict]:
+        """Get the candle series for a mint, e.g. to store for backtesting
+
+        Args:
+            mint (str): token mint
+            start_time (datetime): first candle time
+            end_time (datetime): last candle time
+            interval (str): Birdeye candle type, e.g. 1m, 5m, 1H
+
+        Returns:
+            List[dict]: Birdeye OHLCV items with unixTime, o, h, l, c, v
+        """
+        params = {
+            "address": mint,
+            "type": interval,
+            "currency": "usd",
+            "time_from": int(start_time.timestamp()),
+            "time_to": int(end_time.timestamp()),
+        }
+        url = "https://public-api.birdeye.so/defi/ohlcv"
+        try:
+            response = self._request("GET", url, params=params)
+        except (requests.exceptions.RequestException, TimeoutError) as e:
+            logger.error("Request failed for {t}: {e}".format(t=mint, e=e))
+            return list()
+
+        if response.status_code != 200:
+            logger.error("Response failed for {t}: {e}".format(t=mint, e=response.text))
+            return list()
+
+        response_json = json.loads(response.text)
+
+        if "data" not in response_json or "items" not in response_json["data"]:
+            logger.error("No OCLHV data for {t}: {e}".format(t=mint, e=response_json))
+            return list()
+
+        return response_json["data"]["items"]
+
+    def get_token_prices_at_times(self, mint: str, times: List[datetime], max_candles: int = 1000) -> Dict[int, float]:
+        """Price of mint at the minute of each time, like get_token_price_at_time but from ranged candle requests
+
+        Minutes are grouped into spans of at most max_candles so each span is one get_ohlcv call. Minutes
+        with no candle fall back to get_token_price_at_time.
+
+        Args:
+            mint (str): token mint
+            times (List[datetime]): times to price
+
+        Returns:
+            Dict[int, float]: unix timestamp of the minute -> price
+        """
+        minutes = sorted(set(int(x.replace(second=0, microsecond=0).timestamp()) for x in times))
+        prices = dict()
+        start = 0
+        while start < len(minutes):
+            end = start
+            while end + 1 < len(minutes) and minutes[end + 1] - minutes[start] < max_candles * 60:
+                end += 1
+            items = self.get_ohlcv(
+                mint=mint,
+                start_time=datetime.fromtimestamp(minutes[start], tz=timezone.utc),
+                end_time=datetime.fromtimestamp(minutes[end], tz=timezone.utc),
+            )
+            for each in items:
+                prices[int(each["unixTime"])] = (each["o"] + each["c"]) / 2.0
+            start = end + 1
+
+        for minute in minutes:
+            if minute not in prices:
+                prices[minute] = self.get_token_price_at_time(
+                    mint=mint, start_time=datetime.fromtimestamp(minute, tz=timezone.utc)
+                )
+        return {x: prices[x] for x in minutes}
+
+    def get_prices(self, mints: List[str]) -> Dict[str, dict]:
+        """Current quotes for mints from the first price source that has them, see PriceSourceChain"""
+        return self.PriceSources.get_quotes(mints=mints)
+
+    def iter_prices(self, mints: List[str]) -> Iterator[Dict[str, dict]]:
+        """get_prices as each price source returns"""
+        return self.PriceSources.iter_quotes(mints=mints)
 
     def get_quotes(self, mints: List[str], liquidity: int = 100000) -> dict:
-        """_summary_
+        """Birdeye multi_price quotes for mints with at least liquidity USD of liquidity
 
         Args:
-            mints (List[str]): _description_
+            mints (List[str]): token mints
 
         Returns:
-            dict: _description_
+            dict: mint -> current_price_per_token_usd, current_price_per_token_sol and price_time
+
+        Raises:
+            Exception: Birdeye request failed
         """
         if not mints or len(mints) == 0:
             return dict()
@@ -84,19 +201,20 @@ class TokenCharts:
 
         payload = {"list_address": comma_separated}
 
-        response = requests.post(url, json=payload, headers=self.headers)
+        try:
+            response = self._request("POST", url, json=payload)
+        except (requests.exceptions.RequestException, TimeoutError) as e:
+            raise Exception(f"Birdeye multi_price error: {e}")
 
         # Check if the request was successful
         if response.status_code != 200:
-            logger.info("Response failed for {t}: {e}".format(t=mints, e=response.text))
-            return dict()
+            raise Exception(f"Birdeye multi_price failed with {response.status_code}: {response.text}")
 
         # Parse the JSON response
         response_json = json.loads(response.text)
 
         if "data" not in response_json:
-            logger.info("No quotes data for {t}: {e}".format(t=mints, e=response_json))
-            return dict()
+            raise Exception(f"No quotes data from Birdeye multi_price: {response_json}")
 
         result_dict = dict()
         for key in response_json["data"]:
@@ -111,6 +229,10 @@ class TokenCharts:
                     "current_price_per_token_usd": response_json["data"][key]["value"],
                     "current_price_per_token_sol": response_json["data"][key]["priceInNative"],
                 }
+                if response_json["data"][key].get("updateUnixTime"):
+                    result_dict[key]["price_time"] = datetime.fromtimestamp(
+                        response_json["data"][key]["updateUnixTime"], tz=timezone.utc
+                    )
 
         return result_dict
 
@@ -127,7 +249,7 @@ if __name__ == "__main__":
 
     # S.set_token_list(token_list=token_list)
     # S.run()
-    prices = S.get_quotes(
+    prices = S.get_prices(
         mints=["Dz9mQ9NzkBcCsuGPFJ3r1bS4wgqKMHBPiVuniW8Mbonk", "DtR4D9FtVoTX2569gaL837ZgrB6wNjj6tkmnX9Rdk9B2"]
     )
     print(prices)
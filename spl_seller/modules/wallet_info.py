@@ -1,40 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from time import sleep
-from typing import List
-
-from heliuspy import HeliusAPI
-from solana.rpc.api import Client
-
+from typing import Callable, Dict, List, Optional
+
+from spl_seller.modules.cost_basis_ledger import CostBasisLedger
+from spl_seller.modules.fill_journal import FillJournal
+from spl_seller.modules.helius_transactions import HeliusTransactionSource
+from spl_seller.modules.metadata_cache import TokenMetadataCache
+from spl_seller.modules.price_cache import SharedPriceCache
+from spl_seller.modules.price_history import PriceHistory
+from spl_seller.modules.rpc_transactions import RpcTransactionSource
+from spl_seller.modules.swap_analytics import SwapAnalytics
+from spl_seller.modules.token_accounts import RpcTokenAccountSource
 from spl_seller.modules.token_charts import TokenCharts
 from spl_seller.types.exit_strategy import ExitStrategy
+from spl_seller.types.fill_data import FillData
 from spl_seller.types.holdings_data import HoldingData
-from spl_seller.types.swap_data import BuyData, SellData
+from spl_seller.types.price_history_data import PriceStats
 from spl_seller.types.wallet_data import WalletInfo
-from spl_seller.utils.log import get_logger
+from spl_seller.utils.log import LOG_HOLDING, get_logger
+from spl_seller.utils.rpc_pool import get_rpc_pool
 
 logger = get_logger()
 
 
 class Wallet:
-    def __init__(self, wallets: List[WalletInfo], HELIUS_API_KEY: str, BIRDEYE_API_TOKEN: str):
+    def __init__(
+        self,
+        wallets: List[WalletInfo],
+        HELIUS_API_KEY: str,
+        BIRDEYE_API_TOKEN: str,
+        price_cache: Optional[SharedPriceCache] = None,
+        LEDGER_DIR: Optional[str] = None,
+        TRANSACTION_BACKEND: str = "helius",
+        RPC_BATCH_WINDOW_MS: float = 5.0,
+        HOLDINGS_BACKEND: str = "helius",
+        METADATA_CACHE_DIR: Optional[str] = None,
+        FILL_JOURNAL_PATH: Optional[str] = None,
+        RPC_ENDPOINTS: Optional[List[str]] = None,
+    ):
         self.wallets = wallets
+        self.price_cache = price_cache
         # Configuration
         self.RPC_ENDPOINT = f"https://mainnet.helius-rpc.com/?api-key={HELIUS_API_KEY}"
         self.BIRDEYE_API_TOKEN = BIRDEYE_API_TOKEN
-        self.Helius = HeliusAPI(api_key=HELIUS_API_KEY)
+        self.HELIUS_API_KEY = HELIUS_API_KEY
+        self.HELIUS_TIMEOUT_SECONDS = 30.0
         self.COMMITMENT = "confirmed"  # Commitment level for RPC calls
         self.holdings = list()
         self.sol_mint = "So11111111111111111111111111111111111111112"  # SOL
         self.usdc_mint = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
 
-        # Initialize Solana client
+        # Initialize Solana client, routed across Helius and RPC_ENDPOINTS by endpoint health
         try:
-            self.client = Client(self.RPC_ENDPOINT, commitment=self.COMMITMENT)
+            self.RpcPool = get_rpc_pool(
+                endpoints=[self.RPC_ENDPOINT] + (RPC_ENDPOINTS or []), batch_window_ms=RPC_BATCH_WINDOW_MS
+            )
+            self.client = self.RpcPool.get_client(commitment=self.COMMITMENT)
         except Exception as e:
             raise Exception(f"Failed to connect to Helius RPC: {e}")
 
+        # Parsed transaction history: Helius enhanced API, or standard RPC parsed locally
+        if TRANSACTION_BACKEND == "rpc":
+            self.get_parsed_transactions = RpcTransactionSource(
+                RPC_ENDPOINT=self.RPC_ENDPOINT, COMMITMENT=self.COMMITMENT, RPC_POOL=self.RpcPool
+            ).get_parsed_transactions
+        else:
+            self.get_parsed_transactions = HeliusTransactionSource(
+                HELIUS_API_KEY=self.HELIUS_API_KEY, timeout_seconds=self.HELIUS_TIMEOUT_SECONDS
+            ).get_parsed_transactions
+
+        # Token account discovery: Helius DAS, or getTokenAccountsByOwner decoded locally
+        self.TokenAccounts = None
+        if HOLDINGS_BACKEND == "rpc":
+            self.TokenAccounts = RpcTokenAccountSource(
+                RPC_ENDPOINT=self.RPC_ENDPOINT, COMMITMENT=self.COMMITMENT, RPC_POOL=self.RpcPool
+            )
+
+        self.Metadata = TokenMetadataCache(
+            RPC_ENDPOINT=self.RPC_ENDPOINT, cache_dir=METADATA_CACHE_DIR, RPC_POOL=self.RpcPool
+        )
+
+        # Our own confirmed sells, applied to holdings without a refresh
+        self.FillJournal = FillJournal(journal_path=FILL_JOURNAL_PATH)
+        # token account -> balances before and after our fills, until the RPC reports the new balance
+        self.pending_fills: Dict[str, dict] = dict()
+        # Fills arrive from concurrent sells, held for pending_fills and every change to self.holdings
+        self.fill_lock = threading.Lock()
+
+        # token account -> recent price ticks, 720 ticks is an hour at a 5s refresh
+        self.PRICE_HISTORY_TICKS = 720
+        self.price_histories: Dict[str, PriceHistory] = dict()
+
         self.exclusion_list = list()
-        self.TokenChart = TokenCharts(BIRDEYE_API_TOKEN=self.BIRDEYE_API_TOKEN)
+        self.TokenChart = TokenCharts(
+            BIRDEYE_API_TOKEN=self.BIRDEYE_API_TOKEN, RPC_ENDPOINT=self.RPC_ENDPOINT, RPC_POOL=self.RpcPool
+        )
+        self.SwapAnalytics = SwapAnalytics(get_sol_prices=self._get_sol_prices_at_times)
+
+        self.Ledger = None
+        if LEDGER_DIR:
+            self.Ledger = CostBasisLedger(
+                ledger_dir=LEDGER_DIR,
+                get_parsed_transactions=self.get_parsed_transactions,
+                get_sol_price=self._get_sol_price_at_time,
+            )
 
     @property
     def wallets(self) -> List[WalletInfo]:
@@ -75,12 +146,30 @@ class Wallet:
         ignore_mints = [
             "BfSbstVpvUPaqEm57ZiPBN7fmkQ41NxdGCmARBNFpump",
         ]
+        if self.TokenAccounts:
+            try:
+                accounts = self.TokenAccounts.get_token_accounts(owner=pub_key, min_amount=1000)
+            except Exception as e:
+                logger.info("Error getting token accounts: {e}".format(e=e))
+                sleep(2)
+                return list()
+            return self._to_holdings(pub_key=pub_key, accounts=accounts, ignore_mints=ignore_mints)
+
         try:
-            token_accounts = self.Helius.get_token_accounts(
-                owner=pub_key,
-                displayOptions={"showZeroBalance": False},
-                page=1,
-                limit=100,  # Adjust limit as needed
+            # DAS getTokenAccounts, which the pool sends to the Helius endpoint
+            token_accounts = self.RpcPool.post(
+                {
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "getTokenAccounts",
+                    "params": {
+                        "owner": pub_key,
+                        "displayOptions": {"showZeroBalance": False},
+                        "page": 1,
+                        "limit": 100,  # Adjust limit as needed
+                    },
+                },
+                timeout=self.HELIUS_TIMEOUT_SECONDS,
             )
         except Exception as e:
             logger.info("Error getting token accounts: {e}".format(e=e))
@@ -104,8 +193,13 @@ class Wallet:
         ):
             return list()
 
+        return self._to_holdings(
+            pub_key=pub_key, accounts=token_accounts["result"]["token_accounts"], ignore_mints=ignore_mints
+        )
+
+    def _to_holdings(self, pub_key: str, accounts: List[dict], ignore_mints: List[str]) -> List[HoldingData]:
         token_list = list()
-        for each in token_accounts["result"]["token_accounts"]:
+        for each in accounts:
             if each["mint"] in ignore_mints:
                 continue
 
@@ -120,45 +214,126 @@ class Wallet:
                 )
         return token_list
 
-    def update_holdings(self):
-        """Update self.holdings"""
+    def update_holdings(
+        self, update_prices: bool = True, on_quoted: Optional[Callable[[List[HoldingData]], None]] = None
+    ):
+        """Update self.holdings, and their prices unless update_prices is False"""
         current_tokens = self.get_token_accounts_all()
+        tokens_to_update = self._get_tokens_to_update(current_tokens=current_tokens)
+
+        if len(tokens_to_update) > 0:
+            logger.info("Tokens to updates, sleeping for 120")
+            sleep(120)
+            current_tokens = self.get_token_accounts_all()
+            tokens_to_update = self._get_tokens_to_update(current_tokens=current_tokens)
+
+        with self.fill_lock:
+            # Remove tokens from self.holdings that have amounts updated so they get re-added
+            tokens_to_update_accounts = [x.address for x in tokens_to_update]
+            self.holdings = [x for x in self.holdings if x.address not in tokens_to_update_accounts]
+
+            # Remove tokens from list that aren't in current holdings
+            current_tokens_address = [x.address for x in current_tokens]
+            self.holdings = [x for x in self.holdings if x.address in current_tokens_address]
+
+        if len(tokens_to_update) > 0:
+            logger.info("Updating {a} tokens".format(a=len(tokens_to_update)))
+            # One metadata request for every new token, get_token_info then reads from the cache
+            self.Metadata.get_many(mints=[x.mint for x in tokens_to_update])
+        self.populate_holding_tokens(tokens=tokens_to_update)
+
+        # Keep price history only for accounts still held
+        with self.fill_lock:
+            holding_addresses = set(x.address for x in self.holdings)
+        self.price_histories = {k: v for k, v in self.price_histories.items() if k in holding_addresses}
+
+        if update_prices:
+            self.update_prices(on_quoted=on_quoted)
+
+    def _get_tokens_to_update(self, current_tokens: List[HoldingData]) -> List[HoldingData]:
+        """Tokens that are new or whose balance changed for a reason other than our own fills"""
+        with self.fill_lock:
+            return self._reconcile_fills(current_tokens=current_tokens)
+
+    def _reconcile_fills(self, current_tokens: List[HoldingData]) -> List[HoldingData]:
+        current_addresses = [x.address for x in current_tokens]
+        for address in [x for x in self.pending_fills if x not in current_addresses]:
+            del self.pending_fills[address]
+
         tokens_to_update = list()
         for each in current_tokens:
+            pending = self.pending_fills.get(each.address)
+            if pending is not None:
+                if each.current_amount_raw == pending["before"]:
+                    # RPC has not caught up with our fills yet
+                    continue
+                del self.pending_fills[each.address]
+                if each.current_amount_raw == pending["after"]:
+                    continue
+
             existing_token = self.get_holdings_token_from_list(mint=each.mint, pub_key=each.public_key)
             if not existing_token:
                 tokens_to_update.append(each)
             elif each.current_amount_raw != existing_token.current_amount_raw:
                 tokens_to_update.append(each)
+        return tokens_to_update
 
-        if len(tokens_to_update) > 0:
-            logger.info("Tokens to updates, sleeping for 120")
-            sleep(120)
-            current_tokens = self.get_token_accounts_all()
-            tokens_to_update = list()
-            for each in current_tokens:
-                existing_token = self.get_holdings_token_from_list(mint=each.mint, pub_key=each.public_key)
-                if not existing_token:
-                    tokens_to_update.append(each)
-                elif each.current_amount_raw != existing_token.current_amount_raw:
-                    tokens_to_update.append(each)
-
-        # Remove tokens from self.holdings that have amounts updated so they get re-added
-        tokens_to_update_accounts = [x.address for x in tokens_to_update]
-        self.holdings = [x for x in self.holdings if x.address not in tokens_to_update_accounts]
-
-        # Remove tokens from list that aren't in current holdings
-        current_tokens_address = [x.address for x in current_tokens]
-        self.holdings = [x for x in self.holdings if x.address in current_tokens_address]
+    def record_fill(
+        self, token: HoldingData, signature: str, amount_raw: int, lamports: int, reason: Optional[str] = None
+    ) -> HoldingData:
+        """Journal a confirmed sell of our own and apply it to the holding
 
-        if len(tokens_to_update) > 0:
-            logger.info("Updating {a} tokens".format(a=len(tokens_to_update)))
-        for token in tokens_to_update:
-            self.populate_holding_token(token=token)
+        Updates the amount, sell and cost basis fields and moves the holding to the exit tier for
+        what remains, so the next trigger check uses the new tier without a refresh.
+        """
+        fill = FillData(
+            signature=signature,
+            address=token.address,
+            mint=token.mint,
+            public_key=token.public_key,
+            amount_raw=amount_raw,
+            sol_received=lamports / (10**9),
+            fill_time=datetime.now(timezone.utc),
+            reason=reason,
+        )
+        self.FillJournal.append(fill)
+        with self.fill_lock:
+            token = self._apply_fill(token=token, fill=fill)
+        logger.info("Applied fill to holding: {f}".format(f=fill))
+        return token
+
+    def _apply_fill(self, token: HoldingData, fill: FillData) -> HoldingData:
+        amount_raw = fill.amount_raw
+        pending = self.pending_fills.setdefault(
+            token.address, {"before": token.current_amount_raw, "after": token.current_amount_raw}
+        )
+        pending["after"] = max(pending["after"] - amount_raw, 0)
 
-        self.update_prices()
+        token.current_amount_raw = max(token.current_amount_raw - amount_raw, 0)
+        token.sell_count += 1
+        token.sell_amount_sol += fill.sol_received
+        if token.decimals is None:
+            return token
 
-    def update_prices(self):
+        token.current_amount = token.current_amount_raw / ((10**token.decimals) * 1.0)
+        token.sell_amount_mint += amount_raw / (10**token.decimals)
+        if token.current_price_per_token_sol:
+            token.current_value_sol = token.current_price_per_token_sol * token.current_amount
+
+        if token.current_amount_raw <= 1000:
+            self.holdings = [x for x in self.holdings if x.address != token.address]
+            return token
+
+        if token.buy_amount:
+            token.sell_percent = (token.buy_amount - token.current_amount) / token.buy_amount
+            token.sell_percent_remaining = 1.0 - token.sell_percent
+            if 0.0 < token.sell_percent_remaining <= 1.0:
+                token = self._apply_exit_strategy(token=token)
+                token = self._populate_exit_data(token=token)
+        return token
+
+    def update_prices(self, on_quoted: Optional[Callable[[List[HoldingData]], None]] = None):
+        """Quote holdings that are due, calling on_quoted with each batch of holdings as soon as it is priced"""
         quote_time = datetime.now(timezone.utc)
         mints_to_quote = list()
         quotes_to_get_symbols = list()
@@ -191,33 +366,60 @@ class Wallet:
 
         mints_to_quote = list(set(mints_to_quote))
         logger.info("Quotes to get: {s}".format(s=quotes_to_get_symbols))
-        quotes = self.TokenChart.get_quotes(mints=mints_to_quote, liquidity=100000)
-        if len(quotes) < len(mints_to_quote):
-            new_mints = [x for x in mints_to_quote if x not in quotes]
-            quotes_less_liquidity = self.TokenChart.get_quotes(mints=new_mints, liquidity=40000)
-            quotes.update(quotes_less_liquidity)
+        if self.price_cache is not None:
+            quote_batches = [self.price_cache.get_quotes(mints=mints_to_quote, fetch=self._fetch_quotes)]
+        else:
+            quote_batches = self.TokenChart.iter_prices(mints=mints_to_quote)
+
+        # Apply each batch as it arrives so on_quoted can act on it before the next request
+        quoted_mints = set()
+        for quotes in quote_batches:
+            quoted_mints.update(quotes)
+            updated = [
+                self._apply_quote(token=token, quote_values=quotes[token.mint], quote_time=quote_time)
+                for token in self.holdings
+                if token.mint in quotes and token.mint in mints_to_quote
+            ]
+            if on_quoted is not None and updated:
+                try:
+                    on_quoted(updated)
+                except Exception as e:
+                    logger.error("Error in on_quoted: {e}".format(e=e))
 
         for token in self.holdings:
-            if token.mint not in mints_to_quote:
-                continue
-
-            quote_values = quotes.get(token.mint)
-            if quote_values is None:
+            if token.mint in mints_to_quote and token.mint not in quoted_mints:
                 logger.info("Quote is None")
-                logger.info(token)
-                logger.info(quote_values)
-                continue
+                logger.info(token, extra={"category": LOG_HOLDING})
 
-            token.buy_duration_hours = int((quote_time - token.buy_time).total_seconds() / 60.0 / 60.0)
-            token.current_price_per_token_sol = quote_values["current_price_per_token_sol"]
-            token.current_price_per_token_usd = quote_values["current_price_per_token_usd"]
+    def _apply_quote(self, token: HoldingData, quote_values: dict, quote_time: datetime) -> HoldingData:
+        token.buy_duration_hours = int((quote_time - token.buy_time).total_seconds() / 60.0 / 60.0)
+        token.current_price_per_token_sol = quote_values["current_price_per_token_sol"]
+        token.current_price_per_token_usd = quote_values["current_price_per_token_usd"]
 
-            if not token.current_price_per_token_usd or not token.current_price_per_token_sol:
-                continue
+        if not token.current_price_per_token_usd or not token.current_price_per_token_sol:
+            return token
 
-            token.current_value_sol = token.current_price_per_token_sol * token.current_amount
-            token.current_price_time = quote_time
-            token = self._populate_exit_data(token=token)
+        token.current_value_sol = token.current_price_per_token_sol * token.current_amount
+        token.current_price_time = quote_values.get("quote_time", quote_time)
+        token.current_price_source = quote_values.get("source")
+        token.current_price_source_time = quote_values.get("price_time")
+        self.price_histories.setdefault(token.address, PriceHistory(capacity=self.PRICE_HISTORY_TICKS)).append(
+            price_time=token.current_price_time,
+            usd=token.current_price_per_token_usd,
+            sol=token.current_price_per_token_sol,
+        )
+        return self._populate_exit_data(token=token)
+
+    def get_price_stats(self, token: HoldingData, window_seconds: Optional[float] = None) -> PriceStats:
+        """Rolling price statistics for token over the last window_seconds of its price history"""
+        history = self.price_histories.get(token.address)
+        if history is None:
+            return PriceStats()
+        return history.get_stats(window_seconds=window_seconds)
+
+    def _fetch_quotes(self, mints: List[str]) -> Dict[str, dict]:
+        """Quote mints from the first price source that has them, see TokenCharts.get_prices"""
+        return self.TokenChart.get_prices(mints=mints)
 
     def _populate_exit_data(self, token: HoldingData) -> HoldingData:
         """ """
@@ -256,25 +458,44 @@ class Wallet:
         Returns:
             HoldingData: _description_
         """
-        token = self.get_token_info(token=token)
-
-        token = self.get_buy_swaps(token=token)
-
-        if token.buy_price_sol_total == 0:
-            self.exclusion_list.append(token.mint)
-            return token
+        return self.populate_holding_tokens(tokens=[token])[0]
+
+    def populate_holding_tokens(self, tokens: List[HoldingData]) -> List[HoldingData]:
+        """populate_holding_token for many tokens, with buys and sells computed for all of them at once"""
+        tokens = [self.get_token_info(token=x) for x in tokens]
+
+        if self.Ledger is not None:
+            tokens = [self.Ledger.update(token=x) for x in tokens]
+        else:
+            # Each account's history is fetched once and shared by the buy and sell analytics
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                histories = executor.map(lambda x: self.get_parsed_transactions(address=x.address), tokens)
+                transactions = {token.address: history for token, history in zip(tokens, histories)}
+            frames = self.SwapAnalytics.flatten(tokens=tokens, transactions=transactions)
+            self.SwapAnalytics.populate_buys(tokens=tokens, frames=frames)
+            self.SwapAnalytics.populate_sells(tokens=[x for x in tokens if x.buy_price_sol_total != 0], frames=frames)
+
+        for token in tokens:
+            if token.buy_price_sol_total == 0:
+                self.exclusion_list.append(token.mint)
+                continue
 
-        token = self.get_sell_swaps(token=token)
+            if (
+                token.sell_percent_remaining is None
+                or token.sell_percent is None
+                or token.sell_percent_remaining > 1.0
+                or token.sell_percent < 0.0
+            ):
+                logger.info("Sell percents are off for token: {t}".format(t=token))
+                continue
 
-        if (
-            token.sell_percent_remaining is None
-            or token.sell_percent is None
-            or token.sell_percent_remaining > 1.0
-            or token.sell_percent < 0.0
-        ):
-            logger.info("Sell percents are off for token: {t}".format(t=token))
-            return token
+            token = self._apply_exit_strategy(token=token)
+            with self.fill_lock:
+                self.holdings.append(token)
+        return tokens
 
+    def _apply_exit_strategy(self, token: HoldingData) -> HoldingData:
+        """Set the exit tier and its stop, profit price and profit amount from sell_percent_remaining"""
         exit_strategies = [x.exit_strategy for x in self.wallets if x.public_key == token.public_key][0]
         token.exit_strategy = self._get_exit_strategy(
             wallet_exit_strategies=exit_strategies, percent_remaining=token.sell_percent_remaining
@@ -292,8 +513,6 @@ class Wallet:
         token.profit_price_per_token = (
             1 + token.exit_strategy.profit_price_per_token_percent_change
         ) * token.buy_price_per_token_usd
-
-        self.holdings.append(token)
         return token
 
     def get_token_info(self, token: HoldingData) -> HoldingData:
@@ -309,30 +528,23 @@ class Wallet:
         Returns:
             dict: _description_
         """
-        asset_info = self.Helius.get_asset(id=token.mint)
-        expected_keys = sorted(["jsonrpc", "result", "id"])
-        response_keys = sorted(asset_info.keys())
-
-        if expected_keys != response_keys or "token_info" not in asset_info["result"]:
+        metadata = self.Metadata.get(mint=token.mint)
+        if metadata is None:
             return token
 
-        try:
-            token.symbol = asset_info["result"]["content"]["metadata"]["symbol"]
-            token.name = asset_info["result"]["content"]["metadata"]["name"]
-            token.decimals = asset_info["result"]["token_info"]["decimals"]
-            token.current_amount = token.current_amount_raw / ((10**token.decimals) * 1.0)
-            """
-            quote_currency = asset_info["result"]["token_info"]["price_info"]["currency"]
-            if quote_currency in ["USDC", "USDT"]:
-                token.current_price_per_token_usd = asset_info["result"]["token_info"]["price_info"]["price_per_token"]
-            if quote_currency in ["SOL", "WSOL"]:
-                token.current_price_per_token_sol = asset_info["result"]["token_info"]["price_info"]["price_per_token"]
-            """
-        except KeyError as e:
-            logger.info("Error getting token info: {e}".format(e=e))
+        token.symbol = metadata.symbol
+        token.name = metadata.name
+        token.decimals = metadata.decimals
+        token.current_amount = token.current_amount_raw / ((10**token.decimals) * 1.0)
 
         return token
 
+    def _get_sol_price_at_time(self, start_time: datetime) -> float:
+        return self.TokenChart.get_token_price_at_time(mint=self.sol_mint, start_time=start_time)
+
+    def _get_sol_prices_at_times(self, times: List[datetime]) -> Dict[int, float]:
+        return self.TokenChart.get_token_prices_at_times(mint=self.sol_mint, times=times)
+
     def get_buy_swaps(self, token: HoldingData) -> HoldingData:
         """Populate the buy fields of HoldingData and return the object
 
@@ -347,76 +559,10 @@ class Wallet:
         Returns:
             HoldingData: _description_
         """
-        results = self.Helius.get_parsed_transactions(address=token.address)
-        token_buys = list()
-
-        for swap in results:
-            native_transfers = swap.get("nativeTransfers")
-            transfers = swap.get("tokenTransfers")
-
-            if native_transfers is not None and transfers and len(transfers) == 1:
-                for each in native_transfers:
-                    swap["tokenTransfers"].append(
-                        {
-                            "fromUserAccount": each["fromUserAccount"],
-                            "toUserAccount": each["toUserAccount"],
-                            "tokenAmount": each["amount"] / (10**9),
-                            "mint": self.sol_mint,
-                        }
-                    )
-
-            # if buy is more than 15 min from first buy found, exit
-            if len(token_buys) > 0:
-                this_buy = datetime.fromtimestamp(swap["timestamp"], tz=timezone.utc)
-                min_buy_time = min([x.buy_time for x in token_buys if x.buy_time])
-                time_diff = abs(min_buy_time - this_buy)
-                if time_diff > timedelta(minutes=15):
-                    break
-
-            if not self.contains_mint_address(
-                mint_address=token.mint, transfers=swap.get("tokenTransfers"), address=token.address, is_buy=True
-            ):
-                continue
-
-            buy_data = BuyData(
-                buy_time=datetime.fromtimestamp(swap["timestamp"], tz=timezone.utc),
-            )
-
-            buy_data.sol_price = self.TokenChart.get_token_price_at_time(
-                mint=self.sol_mint, start_time=buy_data.buy_time
-            )
-
-            for transfer in swap["tokenTransfers"]:
-                if transfer["mint"] == token.mint and transfer["toTokenAccount"] == token.address:
-                    buy_data.buy_amount += transfer["tokenAmount"]
-                if transfer["mint"] == self.sol_mint and transfer["fromUserAccount"] == token.public_key:
-                    buy_data.sol_spent += transfer["tokenAmount"]
-
-            token_buys.append(buy_data)
-
-        logger.info(
-            "{p} - {l} Buys for {s} {a}".format(
-                p=token.public_key, l=len(token_buys), s=token.symbol, a=token.mint[-6:]
-            )
+        frames = self.SwapAnalytics.flatten(
+            tokens=[token], transactions={token.address: self.get_parsed_transactions(address=token.address)}
         )
-
-        if len(token_buys) > 0:
-            to_print = "\n".join([x.__str__() for x in token_buys])
-            logger.info(to_print)
-
-            token.buy_time = min([x.buy_time for x in token_buys if x.buy_time])
-            token.buy_amount = sum([x.buy_amount for x in token_buys if x.buy_amount])
-            token.buy_price_sol_total = sum([x.sol_spent for x in token_buys if x.sol_spent])
-            token.buy_price_usd_total = sum(
-                [x.sol_price * x.sol_spent for x in token_buys if x.sol_spent and x.sol_price]
-            )
-            if token.buy_amount != 0:
-                token.buy_price_per_token_sol = token.buy_price_sol_total / token.buy_amount
-                token.buy_price_per_token_usd = token.buy_price_usd_total / token.buy_amount
-                token.sell_percent = (token.buy_amount - token.current_amount) / token.buy_amount
-                token.sell_percent_remaining = 1.0 - token.sell_percent
-
-        return token
+        return self.SwapAnalytics.populate_buys(tokens=[token], frames=frames)[0]
 
     def get_sell_swaps(self, token: HoldingData) -> HoldingData:
         """Populate the sell fields of HoldingData and return the object
@@ -432,78 +578,24 @@ class Wallet:
         if token.sell_percent == 0:
             return token
 
-        results = self.Helius.get_parsed_transactions(address=token.address)
-        token_sells = list()
-
-        for swap in results:
-            if token.buy_amount - token.current_amount <= sum(
-                [x.sell_amount for x in token_sells if x.sell_amount], start=0
-            ):
-                break
-            if not self.contains_mint_address(
-                mint_address=token.mint, transfers=swap.get("tokenTransfers"), address=token.address, is_sell=True
-            ):
-                continue
-            sell_data = SellData(sell_time=datetime.fromtimestamp(swap["timestamp"], tz=timezone.utc))
-            if sell_data.sell_time < token.buy_time:
-                continue
-
-            for account in swap["accountData"]:
-                if account["account"] not in [token.address, token.public_key]:
-                    continue
-                if account["account"] == token.public_key and "nativeBalanceChange" in account:
-                    sell_data.sol_received += account["nativeBalanceChange"] / (10**9)
-                if account["account"] == token.address and "tokenBalanceChanges" in account:
-                    for balance_change in account["tokenBalanceChanges"]:
-                        if balance_change["tokenAccount"] == token.address:
-                            sell_data.sell_amount += (int(balance_change["rawTokenAmount"]["tokenAmount"]) * -1) / (
-                                10 ** balance_change["rawTokenAmount"]["decimals"]
-                            )
-            token_sells.append(sell_data)
-
-        logger.info(
-            "{p} - {l} Sells for {s} {a}".format(
-                p=token.public_key, l=len(token_sells), s=token.symbol, a=token.mint[-6:]
-            )
+        frames = self.SwapAnalytics.flatten(
+            tokens=[token], transactions={token.address: self.get_parsed_transactions(address=token.address)}
         )
-
-        if len(token_sells) > 0:
-            to_print = "\n".join([x.__str__() for x in token_sells])
-            logger.info(to_print)
-
-            token.sell_count = len(token_sells)
-            token.sell_amount_mint = sum([x.sell_amount for x in token_sells if x.sell_amount])
-            token.sell_amount_sol = sum([x.sol_received for x in token_sells if x.sol_received])
-
-        return token
-
-    @staticmethod
-    def contains_mint_address(
-        mint_address: str, transfers: str, address: str, is_buy: bool = None, is_sell: bool = None
-    ):
-        for transfer in transfers:
-            if transfer["mint"] == mint_address:
-                if not is_buy and not is_sell:
-                    return True
-                if is_buy and transfer["toTokenAccount"] == address and len(transfers) >= 2:
-                    return True
-                if is_sell and transfer["fromTokenAccount"] == address and len(transfers) >= 2:
-                    return True
-        return False
+        return self.SwapAnalytics.populate_sells(tokens=[token], frames=frames)[0]
 
     def _print_holdings(self):
         current_time = datetime.now(timezone.utc)
         for token in self.holdings:
             if not token.last_print_time:
-                logger.info(token)
+                logger.info(token, extra={"category": LOG_HOLDING})
                 token.last_print_time = current_time
                 continue
             time_diff = current_time - token.last_print_time
             if time_diff > timedelta(seconds=60):
                 if current_time.minute < 5:
-                    logger.info(token)
+                    logger.info(token, extra={"category": LOG_HOLDING})
                 else:
-                    logger.info(token.__str_medium__())
+                    logger.info(token.__str_medium__(), extra={"category": LOG_HOLDING})
                 token.last_print_time = current_time
 
 
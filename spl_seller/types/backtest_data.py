@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class BacktestEntry:
+    mint: str
+    entry_time: datetime
+    entry_price: Optional[float] = None
+    sol_spent: Optional[float] = 1.0
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\tmint: {self.mint}")
+        parts.append(f"\tentry_time: {self.entry_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.entry_price is not None:
+            parts.append(f"\tentry_price: {self.entry_price:.15f}")
+        if self.sol_spent is not None:
+            parts.append(f"\tsol_spent: {self.sol_spent:.4f}")
+        return "\n".join(parts) or "BacktestEntry (empty)"
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FaultProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+    def __str__(self):
+        return (
+            f"latency: {self.latency_ms:.0f}ms (+{self.jitter_ms:.0f}ms jitter) - "
+            f"failures: {self.failure_rate*100:.1f}% - 429s: {self.rate_limit_rate*100:.1f}%"
+        )
+
+
+@dataclass
+class SellLatencySample:
+    scenario: str
+    chunks: int
+    success: bool
+    trigger_to_send_ms: Optional[float] = None
+    trigger_to_confirm_ms: Optional[float] = None
+    swap_attempts: int = 0
+    send_attempts: int = 0
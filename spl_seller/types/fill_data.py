@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class FillData:
+    signature: str
+    address: str
+    mint: str
+    public_key: str
+    amount_raw: int
+    sol_received: float
+    fill_time: datetime
+    reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        values = dict(self.__dict__)
+        values["fill_time"] = self.fill_time.isoformat()
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "FillData":
+        values = dict(values)
+        values["fill_time"] = datetime.fromisoformat(values["fill_time"])
+        return cls(**values)
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\tsignature: {self.signature}")
+        parts.append(f"\taddress: {self.address} - mint: {self.mint}")
+        parts.append(f"\tamount_raw: {self.amount_raw} - sol_received: {self.sol_received:.8f}")
+        parts.append(f"\tfill_time: {self.fill_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        return "\n".join(parts) or "FillData (empty)"
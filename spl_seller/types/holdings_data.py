@@ -18,6 +18,8 @@ class HoldingData:
     current_price_per_token_usd: Optional[float] = None
     current_price_per_token_sol: Optional[float] = None
     current_price_time: Optional[datetime] = None
+    current_price_source: Optional[str] = None
+    current_price_source_time: Optional[datetime] = None
     current_value_sol: Optional[float] = None
     buy_time: Optional[datetime] = None
     buy_duration_hours: Optional[int] = None
@@ -38,6 +40,13 @@ class HoldingData:
     percent_from_sell: Optional[float] = None
     last_print_time: Optional[datetime] = None
 
+    @property
+    def price_age_seconds(self) -> Optional[float]:
+        """Seconds between the price source updating the price and the price being quoted"""
+        if self.current_price_time is None or self.current_price_source_time is None:
+            return None
+        return max(0.0, (self.current_price_time - self.current_price_source_time).total_seconds())
+
     def __str__(self):
         parts = []
         parts.append(f"\nPubKey: {self.public_key}")
@@ -48,6 +57,8 @@ class HoldingData:
             parts.append(f"\tcurrent_price_per_token_usd: ${self.current_price_per_token_usd:.15f}")
             parts.append(f"\tcurrent_price_per_token_sol: {self.current_price_per_token_sol:.15f}")
             parts.append(f"\tcurrent_price_time: {self.current_price_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.current_price_source is not None and self.price_age_seconds is not None:
+            parts.append(f"\tcurrent_price_source: {self.current_price_source} - age: {self.price_age_seconds:.0f}s")
         if self.current_value_sol is not None:
             parts.append(f"\tcurrent_value_sol: {self.current_value_sol:.2f}")
         if self.buy_time:
@@ -96,6 +107,8 @@ class HoldingData:
         if self.current_price_per_token_usd is not None:
             parts.append(f"\tcurrent_price_per_token_usd: ${self.current_price_per_token_usd:.15f}")
             parts.append(f"\tcurrent_price_time: {self.current_price_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.current_price_source is not None and self.price_age_seconds is not None:
+            parts.append(f"\tcurrent_price_source: {self.current_price_source} - age: {self.price_age_seconds:.0f}s")
         if self.current_value_sol is not None:
             parts.append(f"\tcurrent_value_sol: {self.current_value_sol:.2f}")
         if self.buy_time:
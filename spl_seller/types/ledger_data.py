@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class LedgerEntry:
+    address: str
+    mint: str
+    public_key: str
+    last_signature: Optional[str] = None
+    buy_time: Optional[datetime] = None
+    buy_count: int = 0
+    buy_amount: float = 0
+    sol_spent: float = 0
+    usd_spent: float = 0
+    sell_count: int = 0
+    sell_amount: float = 0
+    sol_received: float = 0
+
+    @property
+    def amount(self) -> float:
+        return self.buy_amount - self.sell_amount
+
+    def to_dict(self) -> dict:
+        values = dict(self.__dict__)
+        values["buy_time"] = self.buy_time.isoformat() if self.buy_time else None
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "LedgerEntry":
+        values = dict(values)
+        values["buy_time"] = datetime.fromisoformat(values["buy_time"]) if values.get("buy_time") else None
+        return cls(**values)
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\taddress: {self.address} - mint: {self.mint}")
+        parts.append(f"\tlast_signature: {self.last_signature}")
+        if self.buy_time:
+            parts.append(f"\tbuy_time: {self.buy_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        parts.append(f"\tbuy_count: {self.buy_count} - buy_amount: {self.buy_amount}")
+        parts.append(f"\tsol_spent: {self.sol_spent:.8f} - usd_spent: ${self.usd_spent:.2f}")
+        parts.append(f"\tsell_count: {self.sell_count} - sell_amount: {self.sell_amount}")
+        parts.append(f"\tsol_received: {self.sol_received:.8f}")
+        return "\n".join(parts) or "LedgerEntry (empty)"
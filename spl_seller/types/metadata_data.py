@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class TokenMetadata:
+    mint: str
+    decimals: int
+    symbol: Optional[str] = None
+    name: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "TokenMetadata":
+        return cls(**values)
+
+    def __str__(self):
+        return f"\n\tmint: {self.mint} - symbol: {self.symbol} - name: {self.name} - decimals: {self.decimals}"
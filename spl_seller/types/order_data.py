@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+ORDER_PENDING = "pending"
+ORDER_SENT = "sent"
+ORDER_CONFIRMED = "confirmed"
+ORDER_FAILED = "failed"
+
+
+@dataclass
+class SellOrder:
+    address: str
+    mint: str
+    public_key: str
+    amount: int
+    start_amount_raw: int
+    reason: Optional[str] = None
+    status: str = ORDER_PENDING
+    created_time: Optional[datetime] = None
+    updated_time: Optional[datetime] = None
+    signatures: List[str] = field(default_factory=list)
+    filled_amount: int = 0
+    error: Optional[str] = None
+    # A sent swap given up on before its outcome was known, it can land until its blockhash expires
+    unsettled_signature: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in [ORDER_PENDING, ORDER_SENT]
+
+    @property
+    def expected_amount_raw(self) -> int:
+        """Token account balance once every confirmed fill is visible on chain"""
+        return self.start_amount_raw - self.filled_amount
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\taddress: {self.address} - mint: {self.mint}")
+        parts.append(f"\tstatus: {self.status} - reason: {self.reason}")
+        parts.append(f"\tamount: {self.amount} - filled_amount: {self.filled_amount}")
+        if self.updated_time:
+            parts.append(f"\tupdated_time: {self.updated_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.signatures:
+            parts.append(f"\tsignatures: {self.signatures}")
+        if self.error:
+            parts.append(f"\terror: {self.error}")
+        if self.unsettled_signature:
+            parts.append(f"\tunsettled_signature: {self.unsettled_signature}")
+        return "\n".join(parts) or "SellOrder (empty)"
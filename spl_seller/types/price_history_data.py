@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class PriceStats:
+    ticks: int = 0
+    last_usd: Optional[float] = None
+    high_usd: Optional[float] = None
+    low_usd: Optional[float] = None
+    drawdown: Optional[float] = None
+    volatility: Optional[float] = None
+    change: Optional[float] = None
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\tticks: {self.ticks}")
+        if self.last_usd is not None:
+            parts.append(f"\tlast_usd: {self.last_usd} - high_usd: {self.high_usd} - low_usd: {self.low_usd}")
+        if self.drawdown is not None:
+            parts.append(f"\tdrawdown: {self.drawdown*100:.2f}% - change: {self.change*100:.2f}%")
+        if self.volatility is not None:
+            parts.append(f"\tvolatility: {self.volatility*100:.2f}%")
+        return "\n".join(parts) or "PriceStats (empty)"
@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class WorkerHealth:
+    worker_id: int
+    pid: Optional[int] = None
+    wallets: List[str] = field(default_factory=list)
+    started_time: Optional[datetime] = None
+    heartbeat_time: Optional[datetime] = None
+    last_run_seconds: Optional[float] = None
+    holdings: int = 0
+    runs: int = 0
+    restarts: int = 0
+    last_error: Optional[str] = None
+
+    def __str__(self):
+        parts = []
+        parts.append(f"\n\tworker_id: {self.worker_id} - pid: {self.pid}")
+        parts.append(f"\twallets: {[x[-6:] for x in self.wallets]}")
+        if self.heartbeat_time:
+            parts.append(f"\theartbeat_time: {self.heartbeat_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        if self.last_run_seconds is not None:
+            parts.append(f"\tlast_run_seconds: {self.last_run_seconds:.2f}")
+        parts.append(f"\tholdings: {self.holdings} - runs: {self.runs} - restarts: {self.restarts}")
+        if self.last_error:
+            parts.append(f"\tlast_error: {self.last_error}")
+        return "\n".join(parts) or "WorkerHealth (empty)"
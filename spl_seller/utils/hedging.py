@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+
+class HedgedRequester:
+    """Sends an idempotent request a second time if it has not answered within the recent p95, first answer wins
+
+    The hedge delay is the percentile latency of the last window successful calls, or
+    default_hedge_seconds until min_samples are in. Hedges are capped at budget_ratio of requests:
+    every request adds budget_ratio to a bucket holding at most max_burst hedges, and every hedge
+    takes one from it. Each call has a deadline, after which TimeoutError is raised whether or not
+    a copy is still in flight.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget_ratio: float = 0.05,
+        max_burst: float = 5.0,
+        window: int = 200,
+        min_samples: int = 20,
+        default_hedge_seconds: float = 1.0,
+        percentile: float = 0.95,
+        max_workers: int = 16,
+    ):
+        self.name = name
+        self.budget_ratio = budget_ratio
+        self.max_burst = max_burst
+        self.min_samples = min_samples
+        self.default_hedge_seconds = default_hedge_seconds
+        self.percentile = percentile
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.tokens = max_burst
+        self.requests = 0
+        self.hedges = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{name}")
+
+    def hedge_delay(self) -> float:
+        with self.lock:
+            if len(self.latencies) < self.min_samples:
+                return self.default_hedge_seconds
+            latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile))]
+
+    def _take_hedge(self) -> bool:
+        with self.lock:
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            self.hedges += 1
+            return True
+
+    def _timed(self, func: Callable[[], T]) -> T:
+        start = time.monotonic()
+        result = func()
+        with self.lock:
+            self.latencies.append(time.monotonic() - start)
+        return result
+
+    def request(self, func: Callable[[], T], timeout: float, hedge: Optional[Callable[[], T]] = None) -> T:
+        """Result of func, or of hedge (func again by default) if that answers first
+
+        Args:
+            func (Callable[[], T]): idempotent request, it should apply its own timeout so no thread hangs
+            timeout (float): seconds to wait in total for an answer
+            hedge (Optional[Callable[[], T]]): request to hedge with, e.g. func against another endpoint
+
+        Raises:
+            TimeoutError: nothing answered within timeout
+            Exception: the first error, when every copy sent failed
+        """
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            self.requests += 1
+            self.tokens = min(self.max_burst, self.tokens + self.budget_ratio)
+
+        futures: List[Future] = [self.executor.submit(self._timed, func)]
+        done, _ = wait(futures, timeout=min(self.hedge_delay(), timeout))
+        if not done and time.monotonic() < deadline and self._take_hedge():
+            futures.append(self.executor.submit(self._timed, hedge or func))
+
+        errors: List[BaseException] = list()
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+        if errors and not pending:
+            raise errors[0]
+        raise TimeoutError(f"{self.name} request did not answer within {timeout}s")
+
+    def __str__(self):
+        return f"{self.name}: hedge after {self.hedge_delay() * 1000:.0f}ms - hedged {self.hedges}/{self.requests}"
+
+
+_requesters: Dict[str, HedgedRequester] = dict()
+_requesters_lock = threading.Lock()
+
+
+def get_hedged_requester(name: str) -> HedgedRequester:
+    """The HedgedRequester shared by every caller of the same API, so its latency and budget are tracked once
+
+    Args:
+        name (str): API name, e.g. birdeye or jupiter
+
+    Returns:
+        HedgedRequester: requester for name
+    """
+    with _requesters_lock:
+        requester = _requesters.get(name)
+        if requester is None:
+            requester = HedgedRequester(name=name)
+            _requesters[name] = requester
+    return requester
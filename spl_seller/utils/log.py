@@ -1,10 +1,95 @@
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+# Category for log calls that are sampled, e.g. logger.info(token, extra={"category": LOG_HOLDING})
+LOG_HOLDING = "holding"
+LOG_SWAP_RESPONSE = "swap_response"
+
+_listeners: Dict[str, logging.handlers.QueueListener] = dict()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread
+
+    The stock QueueHandler formats every record in the calling thread so it can be pickled. This
+    queue never leaves the process, so timestamps, level names and the formatter's output are left
+    to the listener thread. The message itself is rendered here when it is an object such as
+    HoldingData or has arguments, since those can change before the listener gets to them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not isinstance(record.msg, str) or record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every round(1 / rate) records per category, rate 0 drops the category"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.counters = {category: itertools.count() for category in rates}
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        rate = self.rates.get(category)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        with self.lock:
+            count = next(self.counters[category])
+        return count % max(1, round(1 / rate)) == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        values = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "module": record.module,
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        category = getattr(record, "category", None)
+        if category:
+            values["category"] = category
+        if record.exc_info:
+            values["exception"] = self.formatException(record.exc_info)
+        return json.dumps(values, default=str)
+
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, float]:
+    """'holding=0.1,swap_response=0' -> {'holding': 0.1, 'swap_response': 0.0}"""
+    rates = dict()
+    for part in (value or "").split(","):
+        if "=" not in part:
+            continue
+        category, rate = part.split("=", 1)
+        rates[category.strip()] = float(rate)
+    return rates
 
 
 def get_logger(name: str = "spl-seller") -> logging.Logger:
     """
     Creates and configures a custom logger with the specified name.
 
+    Records go through a queue to a listener thread that formats and writes them, so logging never
+    blocks the caller on I/O. LOG_FORMAT=json switches to one JSON object per line, and
+    LOG_SAMPLE_RATES (e.g. "holding=0.1,swap_response=0") samples categorised records.
+
     Args:
         name (str): Name of the logger (default: 'spl-seller').
 
@@ -22,18 +107,31 @@ def get_logger(name: str = "spl-seller") -> logging.Logger:
     logger.setLevel(logging.INFO)
 
     # Formatter for console
-    console_formatter = logging.Formatter(
-        fmt="%(module)s - %(funcName)s - %(message)s",
-        # datefmt="%Y-%m-%d %H:%M:%S.%f",  # Use decimal for milliseconds
-    )
+    if os.environ.get("LOG_FORMAT", "text").lower() == "json":
+        console_formatter = JsonFormatter()
+    else:
+        console_formatter = logging.Formatter(
+            fmt="%(module)s - %(funcName)s - %(message)s",
+            # datefmt="%Y-%m-%d %H:%M:%S.%f",  # Use decimal for milliseconds
+        )
 
-    # Console handler
+    # Console handler, run by the listener thread
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(console_formatter)
 
+    # Sampling happens before records are queued
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(rates=parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES"))))
+    listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is queued on exit
+    atexit.register(listener.stop)
+    _listeners[name] = listener
+
     # Add handlers to logger
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
 
     # Prevent propagation to root logger to avoid duplicate logs
     logger.propagate = False
@@ -0,0 +1,128 @@
+import itertools
+import json
+import threading
+import time
+from typing import Dict, List, Type
+
+import httpx
+from solana.exceptions import SolanaRpcException, handle_exceptions
+from solana.rpc.api import Client
+from solana.rpc.providers.core import T, _after_request_unparsed, _parse_raw
+from solana.rpc.providers.http import HTTPProvider
+from solders.rpc.requests import Body
+
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+# Latency-critical methods are always sent on their own
+UNBATCHED_METHODS = ["sendTransaction"]
+
+
+class _PendingRequest:
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.raw = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchingHTTPProvider(HTTPProvider):
+    """HTTPProvider that merges requests made within batch_window_ms into one JSON-RPC batch
+
+    The first caller in a window waits for the window to close, sends everything queued as a single
+    HTTP request and hands each response back to its caller by request id. A window holding a
+    single request is sent as a plain request.
+    """
+
+    def __init__(self, endpoint: str, batch_window_ms: float = 5.0, max_batch_size: int = 100, **kwargs):
+        super().__init__(endpoint, **kwargs)
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.lock = threading.Lock()
+        self.pending: List[_PendingRequest] = list()
+        self.request_ids = itertools.count(1)
+        self.http_requests = 0
+
+    @handle_exceptions(SolanaRpcException, httpx.HTTPError)
+    def make_request(self, body: Body, parser: Type[T]) -> T:
+        payload = json.loads(body.to_json())
+        if payload.get("method") in UNBATCHED_METHODS:
+            return _parse_raw(self.make_request_unparsed(body), parser=parser)
+
+        request = _PendingRequest(payload=payload)
+        with self.lock:
+            payload["id"] = next(self.request_ids)
+            self.pending.append(request)
+            is_leader = len(self.pending) == 1
+
+        if is_leader:
+            time.sleep(self.batch_window)
+            with self.lock:
+                batch, self.pending = self.pending, list()
+            for start in range(0, len(batch), self.max_batch_size):
+                self._send(batch[start : start + self.max_batch_size])
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return _parse_raw(request.raw, parser=parser)
+
+    def _send(self, batch: List[_PendingRequest]):
+        try:
+            self.http_requests += 1
+            headers = self._build_common_request_kwargs()
+            if len(batch) == 1:
+                raw_response = self.session.post(**headers, content=json.dumps(batch[0].payload))
+                batch[0].raw = _after_request_unparsed(raw_response)
+            else:
+                raw_response = self.session.post(**headers, content=json.dumps([x.payload for x in batch]))
+                responses: Dict[int, dict] = {
+                    x.get("id"): x for x in json.loads(_after_request_unparsed(raw_response))
+                }
+                for request in batch:
+                    response = responses.get(request.payload["id"])
+                    if response is None:
+                        request.error = SolanaRpcException(f"No response in batch for {request.payload['method']}")
+                    else:
+                        request.raw = json.dumps(response)
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.done.set()
+
+
+_providers: Dict[str, BatchingHTTPProvider] = dict()
+_providers_lock = threading.Lock()
+
+
+def get_provider(endpoint: str, batch_window_ms: float = 5.0) -> HTTPProvider:
+    """The BatchingHTTPProvider shared by every client on endpoint, or a plain HTTPProvider with batching off"""
+    if batch_window_ms <= 0:
+        return HTTPProvider(endpoint)
+
+    with _providers_lock:
+        provider = _providers.get(endpoint)
+        if provider is None:
+            provider = BatchingHTTPProvider(endpoint, batch_window_ms=batch_window_ms)
+            _providers[endpoint] = provider
+    return provider
+
+
+def get_rpc_client(endpoint: str, commitment: str, batch_window_ms: float = 5.0) -> Client:
+    """Solana Client whose requests are batched with every other client on the same endpoint
+
+    Args:
+        endpoint (str): RPC URL
+        commitment (str): default commitment for the client
+        batch_window_ms (float): how long the first request in a batch waits for others, 0 disables batching
+
+    Returns:
+        Client: solana-py client
+    """
+    client = Client(endpoint, commitment=commitment)
+    if batch_window_ms > 0:
+        client._provider = get_provider(endpoint, batch_window_ms=batch_window_ms)
+    return client
@@ -0,0 +1,302 @@
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional, Tuple, Type
+from urllib.parse import urlparse
+
+import requests
+from solana.exceptions import SolanaRpcException
+from solana.rpc.api import Client
+from solana.rpc.providers.core import T
+from solana.rpc.providers.http import HTTPProvider
+from solders.rpc.requests import Body
+
+from spl_seller.utils.hedging import HedgedRequester
+from spl_seller.utils.log import get_logger
+from spl_seller.utils.rpc_client import get_provider
+
+logger = get_logger()
+
+# Sent to the healthiest endpoint only, a failed send is retried by the caller with a fresh transaction
+UNRETRIED_METHODS = ["sendTransaction"]
+# Helius DAS methods, which only the pool's first endpoint serves
+DAS_METHODS = [
+    "getAsset",
+    "getAssetBatch",
+    "getAssetProof",
+    "getAssetProofBatch",
+    "getAssetsByAuthority",
+    "getAssetsByCreator",
+    "getAssetsByGroup",
+    "getAssetsByOwner",
+    "getSignaturesForAsset",
+    "getTokenAccounts",
+    "searchAssets",
+]
+# JSON-RPC errors caused by the request rather than the endpoint: invalid request and invalid params
+CLIENT_ERROR_CODES = [-32600, -32602]
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class EndpointHealth:
+    """Rolling latency and error rate of one endpoint, with its circuit breaker state"""
+
+    def __init__(self, endpoint: str, window: int = 50, latency_alpha: float = 0.2):
+        self.endpoint = endpoint
+        self.label = urlparse(endpoint).netloc or endpoint
+        self.latency_alpha = latency_alpha
+        self.latency: Optional[float] = None
+        self.results: Deque[bool] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = CIRCUIT_CLOSED
+        self.open_until = 0.0
+        self.trial_in_flight = False
+
+    @property
+    def error_rate(self) -> float:
+        if not self.results:
+            return 0.0
+        return self.results.count(False) / len(self.results)
+
+    @property
+    def score(self) -> float:
+        """Lower is healthier, an endpoint without samples scores 0 so it gets tried"""
+        return (self.latency or 0.0) * (1.0 + 4.0 * self.error_rate)
+
+    def __str__(self):
+        latency = "-" if self.latency is None else f"{self.latency * 1000:.0f}ms"
+        return f"{self.label}: {self.state} - latency: {latency} - error_rate: {self.error_rate:.2f}"
+
+
+class RpcEndpointPool:
+    """Routes JSON-RPC requests across endpoints by health, with failover and circuit breaking
+
+    Each endpoint keeps an EWMA of its latency and its error rate over the last window requests.
+    Requests go to the endpoint with the lowest score, and a request that fails in transport (timeout,
+    connection error, 429 or 5xx) is retried on the next one. A post that has not answered within the
+    pool's recent p95 is hedged on the next endpoint, see HedgedRequester. An endpoint with failure_threshold
+    consecutive failures, or an error rate of max_error_rate over min_requests, is ejected for
+    cooldown_seconds, after which a single trial request decides whether it rejoins. When every
+    endpoint is ejected they are all tried anyway, soonest to recover first. A JSON-RPC error in
+    the response body counts as a failure like a transport error, unless the request was invalid.
+
+    DAS_METHODS only go to the first endpoint, the Helius one, whatever its health.
+
+    get_client returns a solana-py Client routed through the pool, with each endpoint's requests
+    batched as by get_rpc_client. post is the same routing for modules that post JSON-RPC payloads
+    themselves.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        batch_window_ms: float = 5.0,
+        failure_threshold: int = 3,
+        max_error_rate: float = 0.5,
+        min_requests: int = 10,
+        cooldown_seconds: float = 30.0,
+    ):
+        if not endpoints:
+            raise ValueError("RpcEndpointPool needs at least one endpoint")
+        self.endpoints = list(dict.fromkeys(endpoints))
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.min_requests = min_requests
+        self.cooldown_seconds = cooldown_seconds
+        self.health: Dict[str, EndpointHealth] = {x: EndpointHealth(endpoint=x) for x in self.endpoints}
+        self.providers: Dict[str, HTTPProvider] = {
+            x: get_provider(x, batch_window_ms=batch_window_ms) for x in self.endpoints
+        }
+        self.sessions: Dict[str, requests.Session] = {x: requests.Session() for x in self.endpoints}
+        self.lock = threading.Lock()
+        self.Hedge = HedgedRequester(name="rpc")
+
+    def ranked(self) -> List[str]:
+        """Endpoints to try in order, healthiest first"""
+        now = time.monotonic()
+        with self.lock:
+            available = list()
+            for health in self.health.values():
+                if health.state == CIRCUIT_OPEN and now >= health.open_until:
+                    health.state = CIRCUIT_HALF_OPEN
+                    health.trial_in_flight = False
+                if health.state == CIRCUIT_CLOSED or (
+                    health.state == CIRCUIT_HALF_OPEN and not health.trial_in_flight
+                ):
+                    available.append(health)
+            if not available:
+                return [x.endpoint for x in sorted(self.health.values(), key=lambda x: x.open_until)]
+        return [x.endpoint for x in sorted(available, key=lambda x: x.score)]
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        """Update endpoint's health with the outcome of one request"""
+        with self.lock:
+            health = self.health[endpoint]
+            health.results.append(ok)
+            health.trial_in_flight = False
+            if ok:
+                health.consecutive_failures = 0
+                if health.latency is None:
+                    health.latency = seconds
+                else:
+                    health.latency += health.latency_alpha * (seconds - health.latency)
+                if health.state != CIRCUIT_CLOSED:
+                    logger.info("RPC endpoint recovered: {h}".format(h=health))
+                    health.state = CIRCUIT_CLOSED
+                    health.results.clear()
+                return
+
+            health.consecutive_failures += 1
+            too_many_errors = len(health.results) >= self.min_requests and health.error_rate >= self.max_error_rate
+            if (
+                health.state == CIRCUIT_HALF_OPEN
+                or health.consecutive_failures >= self.failure_threshold
+                or too_many_errors
+            ):
+                health.state = CIRCUIT_OPEN
+                health.open_until = time.monotonic() + self.cooldown_seconds
+                logger.info("RPC endpoint ejected: {h}".format(h=health))
+
+    def _attempts(self, method: Optional[str], last: Optional[str] = None) -> Iterator[str]:
+        """Endpoints to send one request to, in order, until the caller stops on success
+
+        last moves that endpoint to the end, so a hedged request starts on a different endpoint.
+        """
+        if method in DAS_METHODS:
+            yield self.endpoints[0]
+            return
+        endpoints = self.ranked()
+        if last in endpoints:
+            endpoints = [x for x in endpoints if x != last] + [last]
+        for endpoint in endpoints:
+            with self.lock:
+                health = self.health[endpoint]
+                if health.state == CIRCUIT_HALF_OPEN:
+                    # Only one request probes a recovering endpoint
+                    if health.trial_in_flight:
+                        continue
+                    health.trial_in_flight = True
+            yield endpoint
+            if method in UNRETRIED_METHODS:
+                return
+
+    def make_request(self, body: Body, parser: Type[T], method: Optional[str] = None) -> T:
+        """Send a solana-py request through the pool"""
+        errors: List[Tuple[str, Exception]] = list()
+        for endpoint in self._attempts(method=method):
+            start = time.monotonic()
+            try:
+                result = self.providers[endpoint].make_request(body, parser)
+            except SolanaRpcException as e:
+                self.record(endpoint=endpoint, seconds=time.monotonic() - start, ok=False)
+                errors.append((self.health[endpoint].label, e))
+                continue
+            self.record(endpoint=endpoint, seconds=time.monotonic() - start, ok=True)
+            return result
+        raise SolanaRpcException(f"{method} failed on every RPC endpoint: {errors}")
+
+    def post(self, payload, timeout: float = 30) -> dict:
+        """POST a JSON-RPC payload, or batch of payloads, through the pool
+
+        Reads are hedged on the next endpoint when slow, and answered within timeout or not at all.
+
+        Raises:
+            Exception: transport error on every endpoint tried
+            TimeoutError: no answer within timeout
+        """
+        method = self._method(payload)
+        if method in UNRETRIED_METHODS:
+            return self._post(payload, timeout=timeout, method=method)
+        first = self.ranked()[0]
+        return self.Hedge.request(
+            lambda: self._post(payload, timeout=timeout, method=method),
+            timeout=timeout,
+            hedge=lambda: self._post(payload, timeout=timeout, method=method, last=first),
+        )
+
+    @staticmethod
+    def _method(payload) -> Optional[str]:
+        """The payload's method, a DAS method for a batch with any, otherwise the batch's first"""
+        calls = payload if isinstance(payload, list) else [payload]
+        methods = [x.get("method") for x in calls if isinstance(x, dict)]
+        return next((x for x in methods if x in DAS_METHODS), methods[0] if methods else None)
+
+    @staticmethod
+    def _is_endpoint_error(result) -> bool:
+        """Whether a JSON-RPC response, or every response in a batch, is an error the endpoint caused"""
+        responses = result if isinstance(result, list) else [result]
+        for response in responses:
+            error = response.get("error") if isinstance(response, dict) else None
+            if not isinstance(error, dict) or error.get("code") in CLIENT_ERROR_CODES:
+                return False
+        return bool(responses)
+
+    def _post(self, payload, timeout: float, method: Optional[str], last: Optional[str] = None) -> dict:
+        errors: List[str] = list()
+        result = None
+        for endpoint in self._attempts(method=method, last=last):
+            start = time.monotonic()
+            try:
+                response = self.sessions[endpoint].post(endpoint, json=payload, timeout=timeout)
+                response.raise_for_status()
+                result = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.record(endpoint=endpoint, seconds=time.monotonic() - start, ok=False)
+                errors.append(f"{self.health[endpoint].label}: {e}")
+                continue
+            if self._is_endpoint_error(result):
+                # Tried on the next endpoint, and returned as is when none does better
+                self.record(endpoint=endpoint, seconds=time.monotonic() - start, ok=False)
+                continue
+            self.record(endpoint=endpoint, seconds=time.monotonic() - start, ok=True)
+            return result
+        if result is not None:
+            return result
+        raise Exception(f"RPC error on every endpoint: {errors}")
+
+    def get_client(self, commitment: str) -> Client:
+        """solana-py Client whose requests are routed through the pool"""
+        client = Client(self.endpoints[0], commitment=commitment)
+        client._provider = PooledHTTPProvider(pool=self)
+        return client
+
+    def __str__(self):
+        return "\n".join(str(x) for x in self.health.values())
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """HTTPProvider that hands every request to a RpcEndpointPool"""
+
+    def __init__(self, pool: RpcEndpointPool):
+        super().__init__(pool.endpoints[0])
+        self.pool = pool
+
+    def make_request(self, body: Body, parser: Type[T]) -> T:
+        return self.pool.make_request(body, parser, method=json.loads(body.to_json()).get("method"))
+
+
+_pools: Dict[Tuple[str, ...], RpcEndpointPool] = dict()
+_pools_lock = threading.Lock()
+
+
+def get_rpc_pool(endpoints: List[str], batch_window_ms: float = 5.0) -> RpcEndpointPool:
+    """The RpcEndpointPool shared by every module using the same endpoints, so health is tracked once
+
+    Args:
+        endpoints (List[str]): RPC URLs, the first is preferred until others prove healthier and serves DAS_METHODS
+        batch_window_ms (float): batching window for each endpoint, 0 disables batching
+
+    Returns:
+        RpcEndpointPool: pool over endpoints
+    """
+    key = tuple(dict.fromkeys(endpoints))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = RpcEndpointPool(endpoints=list(key), batch_window_ms=batch_window_ms)
+            _pools[key] = pool
+    return pool
@@ -1,4 +1,5 @@
 import os
+import re
 from typing import List
 
 import dotenv
@@ -11,21 +12,13 @@ dotenv.load_dotenv()
 
 
 def get_wallet_list() -> List[WalletInfo]:
-    # test line
-    private_key_1 = os.environ.get("SOLANA_PRIVATE_KEY1")
-    private_key_2 = os.environ.get("SOLANA_PRIVATE_KEY2")
-    private_key_3 = os.environ.get("SOLANA_PRIVATE_KEY3")
-    private_key_4 = os.environ.get("SOLANA_PRIVATE_KEY4")
-    pv_exit_index1 = os.environ.get("PV_EXIT_INDEX1")
-    pv_exit_index2 = os.environ.get("PV_EXIT_INDEX2")
-    pv_exit_index3 = os.environ.get("PV_EXIT_INDEX3")
-    pv_exit_index4 = os.environ.get("PV_EXIT_INDEX4")
+    """Load every SOLANA_PRIVATE_KEYn / PV_EXIT_INDEXn pair set in the environment"""
+    key_indexes = sorted(
+        int(match.group(1)) for match in (re.fullmatch(r"SOLANA_PRIVATE_KEY(\d+)", x) for x in os.environ) if match
+    )
 
     private_key_list = [
-        (private_key_1, pv_exit_index1),
-        (private_key_2, pv_exit_index2),
-        (private_key_3, pv_exit_index3),
-        (private_key_4, pv_exit_index4),
+        (os.environ.get(f"SOLANA_PRIVATE_KEY{n}"), os.environ.get(f"PV_EXIT_INDEX{n}")) for n in key_indexes
     ]
 
     wallets = list()
@@ -96,5 +89,33 @@ settings_key_values["wallets"] = get_wallet_list()
 try:
     settings_key_values["HELIUS_API_KEY"] = os.environ.get("HELIUS_API_KEY")
     settings_key_values["BIRDEYE_API_TOKEN"] = os.environ.get("BIRDEYE_API_TOKEN")
+    settings_key_values["WALLETS_PER_WORKER"] = int(os.environ.get("WALLETS_PER_WORKER", 1))
+    settings_key_values["SELL_WORKERS"] = int(os.environ.get("SELL_WORKERS", 4))
+    settings_key_values["SELLS_PER_WALLET"] = int(os.environ.get("SELLS_PER_WALLET", 2))
+    settings_key_values["ACCOUNT_REFRESH_SECONDS"] = float(os.environ.get("ACCOUNT_REFRESH_SECONDS", 30))
+    settings_key_values["PRICE_REFRESH_SECONDS"] = float(os.environ.get("PRICE_REFRESH_SECONDS", 5))
+    settings_key_values["TRIGGER_INTERVAL_SECONDS"] = float(os.environ.get("TRIGGER_INTERVAL_SECONDS", 1))
+    settings_key_values["PRICE_CACHE_SECONDS"] = float(os.environ.get("PRICE_CACHE_SECONDS", 5))
+    settings_key_values["QUOTE_CACHE_SECONDS"] = float(os.environ.get("QUOTE_CACHE_SECONDS", 10))
+    settings_key_values["RPC_BATCH_WINDOW_MS"] = float(os.environ.get("RPC_BATCH_WINDOW_MS", 5))
+    settings_key_values["LEDGER_DIR"] = os.environ.get("LEDGER_DIR")
+    settings_key_values["TRANSACTION_BACKEND"] = os.environ.get("TRANSACTION_BACKEND", "helius")
+    settings_key_values["HOLDINGS_BACKEND"] = os.environ.get("HOLDINGS_BACKEND", "helius")
+    settings_key_values["METADATA_CACHE_DIR"] = os.environ.get("METADATA_CACHE_DIR")
+    settings_key_values["FILL_JOURNAL_PATH"] = os.environ.get("FILL_JOURNAL_PATH")
+    # Extra RPC endpoints that requests fail over to and are routed to when healthier, comma separated
+    settings_key_values["RPC_ENDPOINTS"] = [
+        x.strip() for x in os.environ.get("RPC_ENDPOINTS", "").split(",") if x.strip()
+    ]
+    # Extra RPC endpoints that every transaction is also sent to, comma separated
+    settings_key_values["BROADCAST_ENDPOINTS"] = [
+        x.strip() for x in os.environ.get("BROADCAST_ENDPOINTS", "").split(",") if x.strip()
+    ]
+    settings_key_values["SIMULATE_SWAPS"] = os.environ.get("SIMULATE_SWAPS", "false").lower() == "true"
+    settings_key_values["WORKER_HANG_SECONDS"] = float(os.environ.get("WORKER_HANG_SECONDS", 900))
+    # Record every HTTP exchange to an archive, or replay one instead of using the network, see transport_archive
+    settings_key_values["TRANSPORT_RECORD_PATH"] = os.environ.get("TRANSPORT_RECORD_PATH")
+    settings_key_values["TRANSPORT_REPLAY_PATH"] = os.environ.get("TRANSPORT_REPLAY_PATH")
+    settings_key_values["TRANSPORT_REPLAY_LATENCY_SCALE"] = float(os.environ.get("TRANSPORT_REPLAY_LATENCY_SCALE", 1))
 except KeyError:
     raise ValueError("Environment variable is required but not set")
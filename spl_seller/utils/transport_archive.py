@@ -0,0 +1,386 @@
+import atexit
+import base64
+import gzip
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from spl_seller.utils.log import get_logger
+
+logger = get_logger()
+
+# Query parameters dropped from every archived URL, e.g. Helius' api-key
+SECRET_PARAMS = ["api-key", "api_key", "apikey", "key", "token"]
+# Host suffix -> path segments before the key, for providers that put the key in the path:
+# QuickNode https://x.quiknode.pro/<key>/ and Alchemy https://x.g.alchemy.com/v2/<key>
+SECRET_PATH_HOSTS = {"quiknode.pro": 0, "alchemy.com": 1}
+REDACTED = "redacted"
+
+# Endpoints whose whole path is treated as secret, see install_transport
+_secret_endpoints: List[Tuple[str, str]] = list()
+
+_original_requests_send = requests.Session.send
+_original_httpx_send = httpx.Client.send
+
+
+def set_secret_endpoints(endpoints: List[str]):
+    """Redact the path of every URL under one of endpoints, for RPC providers that put the key in the path"""
+    _secret_endpoints[:] = [
+        (urlsplit(x).netloc, urlsplit(x).path.rstrip("/")) for x in endpoints if urlsplit(x).path.strip("/")
+    ]
+
+
+def _sanitize_path(netloc: str, path: str) -> str:
+    for secret_netloc, secret_path in _secret_endpoints:
+        if netloc == secret_netloc and (path == secret_path or path.startswith(secret_path + "/")):
+            return "/" + REDACTED + path[len(secret_path) :]
+    host = netloc.rsplit("@", 1)[-1].split(":")[0]
+    for suffix, position in SECRET_PATH_HOSTS.items():
+        if host == suffix or host.endswith("." + suffix):
+            segments = path.split("/")
+            # segments[0] is the empty string before the leading slash
+            if len(segments) > position + 1 and segments[position + 1]:
+                segments[position + 1] = REDACTED
+            return "/".join(segments)
+    return path
+
+
+def sanitize_url(url: str) -> str:
+    """url without secret query parameters or path keys and with its query sorted, so recordings match"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    path = _sanitize_path(netloc=parts.netloc, path=parts.path)
+    return urlunsplit((parts.scheme, parts.netloc, path, urlencode(query), ""))
+
+
+def _decode(body) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+    return str(body)
+
+
+def _rpc_calls(body: Optional[str]) -> Tuple[Optional[List[dict]], bool]:
+    """The JSON-RPC calls in body and whether they are a batch, None if body is not JSON-RPC"""
+    try:
+        payload = json.loads(body) if body else None
+    except ValueError:
+        return None, False
+    calls = payload if isinstance(payload, list) else [payload]
+    if not calls or not all(isinstance(x, dict) and "method" in x for x in calls):
+        return None, False
+    return calls, isinstance(payload, list)
+
+
+def _rpc_key(call: dict) -> str:
+    """A JSON-RPC call without its id, which changes from run to run"""
+    return json.dumps({k: v for k, v in call.items() if k != "id"}, sort_keys=True)
+
+
+class TransportRecorder:
+    """Records every HTTP exchange made through requests or httpx to a gzip JSON lines archive
+
+    That covers the Jupiter, Birdeye and Helius APIs and solana-py. Each line holds the method, the
+    URL without secret query parameters or path keys, the request body, the response status,
+    content type and body, and the elapsed seconds. Request headers, where the API keys are, are
+    never written. JSON-RPC batches are split into one line per call, so a replay can serve them however
+    the calls happen to be batched. Requests that fail in transport are archived as errors.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+        self.count = 0
+
+    def install(self):
+        recorder = self
+
+        def requests_send(session, request, **kwargs):
+            start = time.monotonic()
+            try:
+                response = _original_requests_send(session, request, **kwargs)
+            except requests.exceptions.RequestException as e:
+                recorder.record_error(request.method, request.url, _decode(request.body), e, start)
+                raise
+            recorder.record(
+                method=request.method,
+                url=request.url,
+                body=_decode(request.body),
+                status=response.status_code,
+                content_type=response.headers.get("content-type"),
+                content=response.content,
+                start=start,
+            )
+            return response
+
+        def httpx_send(client, request, **kwargs):
+            start = time.monotonic()
+            try:
+                response = _original_httpx_send(client, request, **kwargs)
+            except httpx.HTTPError as e:
+                recorder.record_error(request.method, str(request.url), _decode(request.content), e, start)
+                raise
+            recorder.record(
+                method=request.method,
+                url=str(request.url),
+                body=_decode(request.content),
+                status=response.status_code,
+                content_type=response.headers.get("content-type"),
+                content=response.read(),
+                start=start,
+            )
+            return response
+
+        requests.Session.send = requests_send
+        httpx.Client.send = httpx_send
+        atexit.register(self.close)
+        logger.info("Recording HTTP traffic to {p}".format(p=self.path))
+
+    def _write(self, entries: List[dict]):
+        with self.lock:
+            if self.file.closed:
+                return
+            for entry in entries:
+                self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.count += len(entries)
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        body: Optional[str],
+        status: int,
+        content_type: Optional[str],
+        content: bytes,
+        start: float,
+    ):
+        entry = {
+            "time": round(start - self.start, 4),
+            "elapsed": round(time.monotonic() - start, 4),
+            "method": method,
+            "url": sanitize_url(url),
+            "status": status,
+            "content_type": content_type,
+        }
+        calls, batch = _rpc_calls(body)
+        try:
+            results = json.loads(content) if batch else None
+        except ValueError:
+            results = None
+        if batch and isinstance(results, list):
+            by_id = {x.get("id"): x for x in results if isinstance(x, dict)}
+            self._write(
+                [dict(entry, body=_rpc_key(call), content=json.dumps(by_id.get(call.get("id")))) for call in calls]
+            )
+            return
+        if calls is not None and not batch:
+            body = _rpc_key(calls[0])
+        try:
+            entry["content"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["content_base64"] = base64.b64encode(content).decode("ascii")
+        self._write([dict(entry, body=body)])
+
+    def record_error(self, method: str, url: str, body: Optional[str], error: Exception, start: float):
+        calls, _ = _rpc_calls(body)
+        timeout = isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException))
+        entry = {
+            "time": round(start - self.start, 4),
+            "elapsed": round(time.monotonic() - start, 4),
+            "method": method,
+            "url": sanitize_url(url),
+            "error": "timeout" if timeout else "connection",
+        }
+        bodies = [_rpc_key(x) for x in calls] if calls is not None else [body]
+        self._write([dict(entry, body=x) for x in bodies])
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+                logger.info("Recorded {c} HTTP exchanges to {p}".format(c=self.count, p=self.path))
+
+
+class TransportReplayer:
+    """Serves the exchanges in a TransportRecorder archive in place of the network
+
+    A request is answered by the next unused recording with the same method, URL and body. When
+    there is none, the next one with the same method and URL path is used, matching on the JSON-RPC
+    method for RPC calls, since timestamps and blockhashes differ between runs. Once a request's
+    recordings are used up the last one is served again. A request with no recording at all fails
+    like a refused connection, nothing ever reaches the network. Responses wait for their recorded
+    elapsed time times latency_scale, 0 serving them at once.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.path = path
+        self.latency_scale = latency_scale
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.entries = [json.loads(line) for line in f if line.strip()]
+        self.exact: Dict[Tuple, List[int]] = dict()
+        self.loose: Dict[Tuple, List[int]] = dict()
+        for index, entry in enumerate(self.entries):
+            self.exact.setdefault(self._exact_key(entry["method"], entry["url"], entry["body"]), list()).append(index)
+            self.loose.setdefault(self._loose_key(entry["method"], entry["url"], entry["body"]), list()).append(index)
+        self.used = set()
+        # Position of the next possibly unused recording in each list of self.exact and self.loose
+        self.cursors: Dict[int, int] = dict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _exact_key(method: str, url: str, body: Optional[str]) -> Tuple:
+        return method, url, body
+
+    @staticmethod
+    def _loose_key(method: str, url: str, body: Optional[str]) -> Tuple:
+        calls, _ = _rpc_calls(body)
+        return method, urlsplit(url).netloc, urlsplit(url).path, calls[0]["method"] if calls else None
+
+    def _take(self, indices: Optional[List[int]]) -> Optional[dict]:
+        if not indices:
+            return None
+        cursor = self.cursors.get(id(indices), 0)
+        while cursor < len(indices) and indices[cursor] in self.used:
+            cursor += 1
+        self.cursors[id(indices)] = cursor
+        if cursor == len(indices):
+            return self.entries[indices[-1]]
+        self.used.add(indices[cursor])
+        return self.entries[indices[cursor]]
+
+    def find(self, method: str, url: str, body: Optional[str]) -> Optional[dict]:
+        url = sanitize_url(url)
+        with self.lock:
+            entry = self._take(self.exact.get(self._exact_key(method, url, body)))
+            if entry is None:
+                entry = self._take(self.loose.get(self._loose_key(method, url, body)))
+            return entry
+
+    def respond(self, method: str, url: str, body: Optional[str]) -> Tuple[int, Optional[str], bytes]:
+        """Recorded status, content type and content for a request, after its recorded latency
+
+        Raises:
+            TimeoutError: the recording timed out
+            ConnectionError: the recording failed to connect, or there is no recording
+        """
+        calls, batch = _rpc_calls(body)
+        bodies = [_rpc_key(x) for x in calls] if calls is not None else [body]
+        entries = [self.find(method=method, url=url, body=x) for x in bodies]
+        missing = [x for x, entry in zip(bodies, entries) if entry is None]
+        if missing:
+            raise ConnectionError(f"No recorded response for {method} {sanitize_url(url)} {missing[0]}")
+        if self.latency_scale > 0:
+            time.sleep(max(x["elapsed"] for x in entries) * self.latency_scale)
+        for entry in entries:
+            if entry.get("error") == "timeout":
+                raise TimeoutError(f"Recorded timeout for {method} {entry['url']}")
+            if "error" in entry:
+                raise ConnectionError(f"Recorded connection error for {method} {entry['url']}")
+
+        if not batch:
+            entry = entries[0]
+            if "content_base64" in entry:
+                content = base64.b64decode(entry["content_base64"])
+            else:
+                content = entry["content"].encode("utf-8")
+            if calls is not None:
+                content = self._with_ids(content, calls)
+            return entry["status"], entry.get("content_type"), content
+
+        # A batch, answered call by call with the ids of this run
+        results = list()
+        for call, entry in zip(calls, entries):
+            result = json.loads(entry["content"]) or {"jsonrpc": "2.0", "error": {"code": -32603, "message": "lost"}}
+            results.append(dict(result, id=call.get("id")))
+        return 200, "application/json", json.dumps(results).encode("utf-8")
+
+    @staticmethod
+    def _with_ids(content: bytes, calls: List[dict]) -> bytes:
+        try:
+            result = json.loads(content)
+        except ValueError:
+            return content
+        if isinstance(result, dict) and "id" in calls[0]:
+            result["id"] = calls[0]["id"]
+        return json.dumps(result).encode("utf-8")
+
+    def install(self):
+        replayer = self
+
+        def requests_send(session, request, **kwargs):
+            try:
+                status, content_type, content = replayer.respond(request.method, request.url, _decode(request.body))
+            except TimeoutError as e:
+                raise requests.exceptions.Timeout(str(e), request=request)
+            except ConnectionError as e:
+                raise requests.exceptions.ConnectionError(str(e), request=request)
+            response = requests.models.Response()
+            response.status_code = status
+            response._content = content
+            response.headers = CaseInsensitiveDict({"content-type": content_type or "application/json"})
+            response.encoding = "utf-8"
+            response.url = request.url
+            response.request = request
+            return response
+
+        def httpx_send(client, request, **kwargs):
+            try:
+                status, content_type, content = replayer.respond(
+                    request.method, str(request.url), _decode(request.content)
+                )
+            except TimeoutError as e:
+                raise httpx.ReadTimeout(str(e), request=request)
+            except ConnectionError as e:
+                raise httpx.ConnectError(str(e), request=request)
+            return httpx.Response(
+                status, content=content, headers={"content-type": content_type or "application/json"}, request=request
+            )
+
+        requests.Session.send = requests_send
+        httpx.Client.send = httpx_send
+        logger.info("Replaying HTTP traffic from {p}: {n} exchanges".format(p=self.path, n=len(self.entries)))
+
+
+def uninstall_transport():
+    """Send requests over the network again"""
+    requests.Session.send = _original_requests_send
+    httpx.Client.send = _original_httpx_send
+
+
+def install_transport(
+    record_path: Optional[str] = None,
+    replay_path: Optional[str] = None,
+    latency_scale: float = 1.0,
+    secret_endpoints: Optional[List[str]] = None,
+) -> Optional[object]:
+    """Record to record_path or replay from replay_path every HTTP request this process makes
+
+    Args:
+        record_path (Optional[str]): archive to write, see TransportRecorder
+        replay_path (Optional[str]): archive to serve responses from, see TransportReplayer
+        latency_scale (float): replayed latency as a multiple of the recorded latency
+        secret_endpoints (Optional[List[str]]): endpoints archived without their path, e.g. RPC_ENDPOINTS
+
+    Returns:
+        Optional[object]: the installed TransportRecorder or TransportReplayer, None when neither path is set
+    """
+    if record_path and replay_path:
+        raise ValueError("Set only one of the record and replay archives")
+    set_secret_endpoints(secret_endpoints or [])
+    if replay_path:
+        transport = TransportReplayer(path=replay_path, latency_scale=latency_scale)
+    elif record_path:
+        transport = TransportRecorder(path=record_path)
+    else:
+        return None
+    transport.install()
+    return transport